@@ -2,28 +2,139 @@
 from pymongo import MongoClient
 from pymongo.database import Database
 from pymongo.collection import Collection
+from pymongo.monitoring import ConnectionPoolListener
 import os
+import threading
 from contextlib import contextmanager
 from util.logger_config import logger
 
-# Singleton client
+# Singleton client, only valid in the process that created it
 _mongo_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+class PoolStatistics(ConnectionPoolListener):
+    """
+    Counts the connection pool events of the shared client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {
+                "connections_created": 0,
+                "connections_closed": 0,
+                "checkouts": 0,
+                "checkins": 0,
+                "checkout_failures": 0,
+                "pool_clears": 0,
+            }
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count("pool_clears")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count("connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count("connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._count("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._count("checkouts")
+
+    def connection_checked_in(self, event):
+        self._count("checkins")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+        stats["open_connections"] = (
+            stats["connections_created"] - stats["connections_closed"]
+        )
+        stats["in_use"] = stats["checkouts"] - stats["checkins"]
+        return stats
+
+
+_pool_statistics = PoolStatistics()
+
+
+def _pool_options() -> dict:
+    """
+    Connection pool settings, configurable through the environment.
+    """
+    return {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", 50)),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 300000)),
+    }
 
 
 def get_client() -> MongoClient:
     """
-    Returns a MongoDB client instance (singleton pattern).
+    Returns the process-wide MongoDB client (singleton pattern).
+
+    The client and its connection pool are shared by every module. A process forked
+    from the one that created the client (e.g. the scheduler's process pool) gets its
+    own client, as pooled sockets must not be shared across processes.
     """
-    global _mongo_client
-    if _mongo_client is None:
-        mongo_uri = os.getenv("MONGO_URI")
-        if not mongo_uri:
-            raise ValueError("MONGO_URI environment variable is not set")
-        _mongo_client = MongoClient(mongo_uri)
-        logger.debug("MongoDB client initialized")
+    global _mongo_client, _client_pid
+    if _mongo_client is not None and _client_pid == os.getpid():
+        return _mongo_client
+
+    with _client_lock:
+        if _mongo_client is not None and _client_pid != os.getpid():
+            # Inherited from the parent process, drop it without closing the parent's sockets
+            _mongo_client = None
+            _pool_statistics.reset()
+        if _mongo_client is None:
+            mongo_uri = os.getenv("MONGO_URI")
+            if not mongo_uri:
+                raise ValueError("MONGO_URI environment variable is not set")
+            options = _pool_options()
+            _mongo_client = MongoClient(
+                mongo_uri, event_listeners=[_pool_statistics], **options
+            )
+            _client_pid = os.getpid()
+            logger.debug(f"MongoDB client initialized with {options}")
     return _mongo_client
 
 
+def _forget_client_after_fork():
+    global _mongo_client, _client_pid
+    _mongo_client = None
+    _client_pid = None
+    _pool_statistics.reset()
+
+
+os.register_at_fork(after_in_child=_forget_client_after_fork)
+
+
 def get_db(db_name="anime") -> Database:
     """
     Returns a specific database from the MongoDB client.
@@ -40,6 +151,17 @@ def get_collection(collection_name, db_name="anime") -> Collection:
     return db[collection_name]
 
 
+def pool_stats() -> dict:
+    """
+    Returns the connection pool statistics of the shared client for this process.
+    """
+    stats = _pool_statistics.snapshot()
+    stats["pid"] = os.getpid()
+    stats["initialized"] = _mongo_client is not None and _client_pid == os.getpid()
+    stats.update(_pool_options())
+    return stats
+
+
 @contextmanager
 def mongo_session():
     """
@@ -65,8 +187,10 @@ def close_connection():
     Explicitly close the MongoDB connection.
     Call this when your application is shutting down.
     """
-    global _mongo_client
-    if _mongo_client:
-        _mongo_client.close()
+    global _mongo_client, _client_pid
+    with _client_lock:
+        if _mongo_client and _client_pid == os.getpid():
+            _mongo_client.close()
+            logger.debug("MongoDB connection closed")
         _mongo_client = None
-        logger.debug("MongoDB connection closed")
+        _client_pid = None
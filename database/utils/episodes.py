@@ -0,0 +1,502 @@
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import MongoClient, UpdateOne
+from pymongo.client_session import ClientSession
+from pymongo.database import Database
+
+from database.utils.client import get_db
+from database.utils.indexes import ensure_indexes
+from exceptions import DatabaseError
+from util.logger_config import logger
+
+# Marker written once every show document has been copied to `episodes`
+MIGRATION_ID = "episodes"
+
+# Show fields joined to the episodes of a week, as the templates consume them
+SHOW_FIELDS = {
+    "title": "$show.title",
+    "title_english": "$show.title_english",
+    "images": "$show.images",
+    "banner": "$show.banner",
+    "studio": "$show.studios.name",
+    "score": "$show.score",
+    "streams": "$show.streams",
+    "num_episodes": "$show.num_episodes",
+}
+
+_episodes_ready = False
+
+# Whether each client's server supports transactions, see `supports_transactions`
+_transactions: Dict[int, bool] = {}
+
+
+def show_week_key(year: int, season: str, week_id: int, mal_id: int) -> Dict:
+    """Returns the filter of every post of a show in a week of the `episodes` collection."""
+    return {"year": int(year), "season": season, "week_id": week_id, "mal_id": mal_id}
+
+
+def episode_key(
+    year: int, season: str, week_id: int, mal_id: int, reddit_id: str
+) -> Dict:
+    """
+    Returns the filter that identifies one discussion post in the `episodes` collection.
+
+    A show can have several posts in a week (e.g. two episodes, or a repost), so the
+    Reddit ID of the post is part of the key.
+    """
+    return {**show_week_key(year, season, week_id, mal_id), "reddit_id": reddit_id}
+
+
+def legacy_reddit_id(
+    year: int, season: str, mal_id: int, position: int, episode_data: Dict
+) -> str:
+    """
+    Returns the Reddit ID of a `reddit_karma` entry, backfilled for entries recorded
+    before the ID was stored.
+
+    The ID is taken from the entry's `post_id` or URL when it has one, otherwise it is
+    derived from the entry's position in its append-only `reddit_karma.<year>.<season>`
+    array, which is stable across migration runs.
+    """
+    if episode_data.get("reddit_id"):
+        return episode_data["reddit_id"]
+    if episode_data.get("post_id"):
+        return episode_data["post_id"]
+    match = re.search(r"/comments/(\w+)", episode_data.get("url") or "")
+    if match:
+        return match.group(1)
+    return f"legacy-{year}-{season}-{mal_id}-{position}"
+
+
+def episode_upsert(year: int, season: str, mal_id: int, episode_data: Dict) -> UpdateOne:
+    """
+    Builds the upsert that records a closed post in the `episodes` collection.
+
+    Args:
+        year (int): Year of the season
+        season (str): Season name (winter, spring, summer, fall)
+        mal_id (int): MAL ID of the show
+        episode_data (dict): The post, as stored in `reddit_karma.<year>.<season>`
+
+    Returns:
+        UpdateOne: An upsert keyed by (year, season, week_id, mal_id, reddit_id), a no-op
+            when the post was already recorded.
+    """
+    key = episode_key(
+        year, season, episode_data["week_id"], mal_id, episode_data["reddit_id"]
+    )
+    return UpdateOne(
+        key,
+        {"$setOnInsert": {k: v for k, v in episode_data.items() if k not in key}},
+        upsert=True,
+    )
+
+
+def season_stats_update(
+    year: int, season: str, mal_id: int, episode_data: Dict
+) -> UpdateOne:
+    """
+    Builds the update that folds a post into the running aggregates of its show's season.
+
+    The `season_stats` document of (year, season, mal_id) keeps the number of posts, the
+    karma and comment sums and the karma extremes, so averages never scan the posts.
+    """
+    karma = episode_data["karma"]
+    return UpdateOne(
+        {"year": int(year), "season": season, "mal_id": mal_id},
+        {
+            "$inc": {
+                "total_episodes": 1,
+                "karma_sum": karma,
+                "comments_sum": episode_data["comments"],
+            },
+            "$min": {"min_karma": karma},
+            "$max": {"max_karma": karma},
+        },
+        upsert=True,
+    )
+
+
+def record_episodes(
+    posts: List[Tuple[int, str, int, Dict]], db: Optional[Database] = None
+) -> int:
+    """
+    Records closed posts in the `episodes` collection and in the `season_stats` aggregates.
+
+    Both writes run in one transaction, so the aggregates never miss a recorded post.
+    Only the posts that were not recorded yet are added to the aggregates, so retried
+    jobs don't count a post twice. A standalone server has no transactions, there the
+    aggregates of the posts' shows are recomputed from `episodes` after the write
+    instead, which also repairs them if an earlier write was interrupted.
+
+    Args:
+        posts (list[tuple[int, str, int, dict]]): The (year, season, mal_id, episode_data)
+            of each post, see `episode_upsert`
+        db (Database, optional): Database to write. Defaults to the shared `anime` database.
+
+    Returns:
+        int: Number of posts that were new.
+    """
+    if not posts:
+        return 0
+    if db is None:
+        db = get_db()
+
+    def write(session: Optional[ClientSession]) -> int:
+        result = db.episodes.bulk_write(
+            [episode_upsert(*post) for post in posts], ordered=False, session=session
+        )
+        new_posts = [posts[i] for i in result.upserted_ids]
+        if new_posts and session is not None:
+            db.season_stats.bulk_write(
+                [season_stats_update(*post) for post in new_posts],
+                ordered=False,
+                session=session,
+            )
+        return len(new_posts)
+
+    if not supports_transactions(db.client):
+        new_posts = write(None)
+        shows = {(int(year), season, mal_id) for year, season, mal_id, _ in posts}
+        rebuild_season_stats(db, shows=shows)
+        return new_posts
+
+    with db.client.start_session() as session:
+        return session.with_transaction(write)
+
+
+def supports_transactions(client: MongoClient) -> bool:
+    """Tells whether the server is a replica set or a sharded cluster, cached per client."""
+    if id(client) not in _transactions:
+        hello = client.admin.command("hello")
+        _transactions[id(client)] = "setName" in hello or hello.get("msg") == "isdbgrid"
+        if not _transactions[id(client)]:
+            logger.warning("Standalone MongoDB, season_stats are recomputed after writes")
+    return _transactions[id(client)]
+
+
+def rebuild_season_stats(
+    db: Optional[Database] = None,
+    shows: Optional[Iterable[Tuple[int, str, int]]] = None,
+) -> None:
+    """
+    Recomputes `season_stats` documents from the `episodes` collection.
+
+    Args:
+        db (Database, optional): Database to write. Defaults to the shared `anime` database.
+        shows (Iterable[tuple[int, str, int]], optional): The (year, season, mal_id) to
+            recompute. Defaults to every show of every season.
+    """
+    if db is None:
+        db = get_db()
+
+    pipeline = []
+    if shows is not None:
+        pipeline.append(
+            {
+                "$match": {
+                    "$or": [
+                        {"year": year, "season": season, "mal_id": mal_id}
+                        for year, season, mal_id in shows
+                    ]
+                }
+            }
+        )
+    db.episodes.aggregate(
+        [
+            *pipeline,
+            {
+                "$group": {
+                    "_id": {"year": "$year", "season": "$season", "mal_id": "$mal_id"},
+                    "total_episodes": {"$sum": 1},
+                    "karma_sum": {"$sum": "$karma"},
+                    "comments_sum": {"$sum": "$comments"},
+                    "min_karma": {"$min": "$karma"},
+                    "max_karma": {"$max": "$karma"},
+                }
+            },
+            {"$replaceWith": {"$mergeObjects": ["$_id", "$$ROOT"]}},
+            {"$unset": "_id"},
+            {
+                "$merge": {
+                    "into": "season_stats",
+                    "on": ["year", "season", "mal_id"],
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+    )
+    if shows is None:
+        logger.info("Rebuilt the season_stats aggregates")
+
+
+def migrate_seasonals(db: Optional[Database] = None, batch_size: int = 500) -> int:
+    """
+    Copies every `reddit_karma.<year>.<season>` entry of `seasonals` to the `episodes` collection.
+
+    Show documents are streamed from a cursor and the posts are written in unordered
+    batches of `batch_size` upserts, so the migration can be interrupted and rerun.
+    Entries recorded without a Reddit ID get one from `legacy_reddit_id`. The
+    `season_stats` aggregates are then rebuilt from `episodes`. Once the number of
+    documents in `episodes` matches the number of entries, the migration is marked
+    complete and reads switch over to `episodes` (see `episodes_ready`).
+
+    Args:
+        db (Database, optional): Database to migrate. Defaults to the shared `anime` database.
+        batch_size (int): Number of upserts per `bulk_write`
+
+    Returns:
+        int: Number of posts written.
+
+    Raises:
+        DatabaseError: If `episodes` doesn't hold exactly one document per entry.
+    """
+    if db is None:
+        db = get_db()
+    # The upserts and the $merge of rebuild_season_stats rely on the unique indexes
+    ensure_indexes(db)
+
+    written = 0
+    entries = 0
+    operations = []
+
+    def flush():
+        nonlocal written
+        if operations:
+            result = db.episodes.bulk_write(operations, ordered=False)
+            written += result.upserted_count + result.matched_count
+            operations.clear()
+
+    cursor = db.seasonals.find(
+        {"id": {"$ne": None}, "reddit_karma": {"$type": "object"}},
+        {"_id": 0, "id": 1, "reddit_karma": 1},
+        batch_size=batch_size,
+    )
+    for show in cursor:
+        for year, seasons in show["reddit_karma"].items():
+            if not isinstance(seasons, dict):
+                continue
+            for season, posts in seasons.items():
+                for position, episode_data in enumerate(posts or []):
+                    if episode_data.get("week_id") is None:
+                        continue
+                    reddit_id = legacy_reddit_id(
+                        year, season, show["id"], position, episode_data
+                    )
+                    operations.append(
+                        episode_upsert(
+                            year,
+                            season,
+                            show["id"],
+                            {**episode_data, "reddit_id": reddit_id},
+                        )
+                    )
+                    entries += 1
+                    if len(operations) >= batch_size:
+                        flush()
+    flush()
+
+    migrated = db.episodes.count_documents({})
+    if migrated != entries:
+        raise DatabaseError(
+            f"The episodes collection has {migrated} documents for {entries} entries"
+        )
+    rebuild_season_stats(db)
+
+    db.migrations.update_one(
+        {"_id": MIGRATION_ID},
+        {"$set": {"completed_at": datetime.now(timezone.utc), "episodes": written}},
+        upsert=True,
+    )
+    logger.success(f"Migrated {written} posts to the episodes collection")
+    return written
+
+
+def episodes_ready(db: Optional[Database] = None) -> bool:
+    """
+    Tells whether reads can be served by the `episodes` collection.
+
+    Until `migrate_seasonals` has completed, readers fall back to unwinding the
+    `reddit_karma` arrays of `seasonals`, which are still written alongside.
+    """
+    global _episodes_ready
+    if not _episodes_ready:
+        if db is None:
+            db = get_db()
+        _episodes_ready = db.migrations.find_one({"_id": MIGRATION_ID}) is not None
+    return _episodes_ready
+
+
+def week_entries(
+    year: int,
+    season: str,
+    week_id: int,
+    db: Optional[Database] = None,
+    details: bool = True,
+) -> List[Dict]:
+    """
+    Returns the posts of a week joined with their show.
+
+    Args:
+        year (int): Year of the season
+        season (str): Season name (winter, spring, summer, fall)
+        week_id (int): Week of the season
+        db (Database, optional): Database to read. Defaults to the shared `anime` database.
+        details (bool): Whether to include the show fields used by the templates, or only
+            the titles, episode, karma and comments
+
+    Returns:
+        list[dict]: One row per post, with the show's MAL ID as `mal_id`.
+    """
+    if db is None:
+        db = get_db()
+
+    collection, pipeline = week_pipeline(year, season, week_id, db=db, details=details)
+    return list(db[collection].aggregate(pipeline))
+
+
+def season_entries(
+    year: int,
+    season: str,
+    db: Optional[Database] = None,
+    details: bool = True,
+) -> List[Dict]:
+    """
+    Returns every post of a season joined with its show, like `week_entries`.
+
+    Each row also carries the `year` and `season` it belongs to.
+    """
+    if db is None:
+        db = get_db()
+
+    collection, pipeline = week_pipeline(year, season, None, db=db, details=details)
+    pipeline.append({"$set": {"year": int(year), "season": season}})
+    return list(db[collection].aggregate(pipeline))
+
+
+def week_pipeline(
+    year: int,
+    season: str,
+    week_id: Optional[int],
+    db: Optional[Database] = None,
+    details: bool = True,
+) -> Tuple[str, List[Dict]]:
+    """
+    Builds the aggregation that lists the posts of a week, see `week_entries`.
+
+    The pipeline reads `episodes` once the migration is complete and unwinds the
+    `reddit_karma` arrays of `seasonals` before that, so it can be embedded in a
+    larger aggregation (e.g. in a `$unionWith`). A `week_id` of None lists the
+    whole season.
+
+    Returns:
+        tuple[str, list[dict]]: The collection to aggregate and the pipeline.
+    """
+    if not episodes_ready(db):
+        return "seasonals", _legacy_week_pipeline(year, season, week_id, details)
+
+    fields = {
+        "_id": 0,
+        "title": "$show.title",
+        "title_english": "$show.title_english",
+        "episode": 1,
+        "karma": 1,
+        "comments": 1,
+        "week_id": 1,
+        "mal_id": 1,
+    }
+    if details:
+        fields.update(SHOW_FIELDS, url=1)
+
+    match = {"year": int(year), "season": season}
+    if week_id is not None:
+        match["week_id"] = week_id
+
+    return "episodes", [
+        {"$match": match},
+        {
+            "$lookup": {
+                "from": "seasonals",
+                "localField": "mal_id",
+                "foreignField": "id",
+                "as": "show",
+            }
+        },
+        {"$unwind": "$show"},
+        {"$project": fields},
+    ]
+
+
+def _legacy_week_pipeline(
+    year: int, season: str, week_id: Optional[int], details: bool
+) -> List[Dict]:
+    reddit_karma = f"reddit_karma.{year}.{season}"
+    fields = {
+        "_id": 0,
+        "title": 1,
+        "title_english": 1,
+        "episode": f"${reddit_karma}.episode",
+        "karma": f"${reddit_karma}.karma",
+        "comments": f"${reddit_karma}.comments",
+        "week_id": f"${reddit_karma}.week_id",
+        "mal_id": "$id",
+    }
+    if details:
+        fields.update(
+            images=1,
+            banner=1,
+            studio="$studios.name",
+            score=1,
+            streams=1,
+            url=f"${reddit_karma}.url",
+            num_episodes=1,
+        )
+
+    pipeline = [{"$unwind": f"${reddit_karma}"}]
+    if week_id is not None:
+        pipeline.append({"$match": {f"{reddit_karma}.week_id": week_id}})
+    pipeline.append({"$project": fields})
+    return pipeline
+
+
+def available_weeks(db: Optional[Database] = None) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Returns the weeks that have posts in the `episodes` collection.
+
+    Returns:
+        dict: Week IDs by season by year, e.g. {"2025": {"winter": [1, 2]}}
+    """
+    if db is None:
+        db = get_db()
+
+    weeks = {}
+    for group in db.episodes.aggregate(available_weeks_pipeline()):
+        year = str(group["_id"]["year"])
+        weeks.setdefault(year, {})[group["_id"]["season"]] = sorted(group["weeks"])
+    return weeks
+
+
+def available_weeks_pipeline() -> List[Dict]:
+    """
+    Builds the aggregation behind `available_weeks`.
+
+    The sort and projection on the prefix of the (year, season, week_id) index let the
+    server read the index alone instead of every post.
+    """
+    return [
+        {"$sort": {"year": 1, "season": 1, "week_id": 1}},
+        {"$project": {"_id": 0, "year": 1, "season": 1, "week_id": 1}},
+        {
+            "$group": {
+                "_id": {"year": "$year", "season": "$season"},
+                "weeks": {"$addToSet": "$week_id"},
+            }
+        },
+    ]
+
+
+if __name__ == "__main__":
+    migrate_seasonals()
@@ -0,0 +1,281 @@
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Union
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
+
+from database.utils.client import get_db
+from util.logger_config import logger
+
+# Indexes backing the hot queries, by collection
+REQUIRED_INDEXES: Dict[str, List[IndexModel]] = {
+    "seasonals": [
+        # find_one({"id": ...}) everywhere a show is looked up or updated
+        IndexModel([("id", ASCENDING)], name="id_1", unique=True),
+        # The $or on the titles in close_post, for posts without a MAL link
+        IndexModel([("title", ASCENDING)], name="title_1"),
+        IndexModel([("title_english", ASCENDING)], name="title_english_1"),
+    ],
+    "karma_watch": [
+        # Hourly upserts in record_hourly_karma
+        IndexModel(
+            [("mal_id", ASCENDING), ("reddit_id", ASCENDING)],
+            name="mal_id_1_reddit_id_1",
+        ),
+    ],
+    "committees": [
+        # committees.distinct("year") and the COMMITTEE_SORT of get_committee_data
+        IndexModel(
+            [("year", DESCENDING), ("season", ASCENDING)], name="year_-1_season_1"
+        ),
+    ],
+    "producers": [
+        IndexModel([("mal_id", ASCENDING)], name="mal_id_1"),
+    ],
+    "episodes": [
+        # One document per discussion post (see `episode_key`); week lookups are range
+        # scans on the prefix
+        IndexModel(
+            [
+                ("year", ASCENDING),
+                ("season", ASCENDING),
+                ("week_id", ASCENDING),
+                ("mal_id", ASCENDING),
+                ("reddit_id", ASCENDING),
+            ],
+            name="year_1_season_1_week_id_1_mal_id_1_reddit_id_1",
+            unique=True,
+        ),
+        # Per-show history, e.g. the season averages of one show
+        IndexModel(
+            [("mal_id", ASCENDING), ("year", ASCENDING), ("season", ASCENDING)],
+            name="mal_id_1_year_1_season_1",
+        ),
+    ],
+    "season_stats": [
+        # Running aggregates per show and season, read by get_season_averages. Unique
+        # so the $merge of rebuild_season_stats can match on it
+        IndexModel(
+            [("year", ASCENDING), ("season", ASCENDING), ("mal_id", ASCENDING)],
+            name="year_1_season_1_mal_id_1",
+            unique=True,
+        ),
+    ],
+    "result_cache": [
+        # Drops the shared results of ResultCache once they expire
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_1", expireAfterSeconds=0),
+    ],
+    "weekly_rankings": [
+        # One materialized ranking per week, read on every chart render
+        IndexModel(
+            [("year", ASCENDING), ("season", ASCENDING), ("week_id", ASCENDING)],
+            name="year_1_season_1_week_id_1",
+            unique=True,
+        ),
+    ],
+    "reddit_snapshot": [
+        IndexModel(
+            [("username", ASCENDING), ("created_utc", ASCENDING)],
+            name="username_1_created_utc_1",
+        ),
+    ],
+}
+
+# Indexes replaced by one of REQUIRED_INDEXES, dropped by ensure_indexes
+OBSOLETE_INDEXES: Dict[str, List[str]] = {
+    # Unique without the Reddit ID, rejected a show's second post in a week
+    "episodes": ["year_1_season_1_week_id_1_mal_id_1"],
+}
+
+# Collections with fewer documents are not reported by check_query_plans
+QUERY_PLAN_MIN_DOCS = int(os.getenv("QUERY_PLAN_MIN_DOCS", 1000))
+
+
+def hot_queries(
+    db: Optional[Database] = None,
+    year: Optional[int] = None,
+    season: Optional[str] = None,
+    week_id: Optional[int] = None,
+) -> List[tuple]:
+    """
+    Returns the queries that must be served by an index, built by the same helpers as
+    the production code so the check follows them.
+
+    Args:
+        db (Database, optional): Database the pipelines are built for. Defaults to the
+            shared `anime` database.
+        year (int, optional): Year of the week the queries are built for. Defaults to
+            the current episodes week.
+        season (str, optional): Season name of that week
+        week_id (int, optional): Week of the season
+
+    Returns:
+        list[tuple]: Triples of (collection name, filter or pipeline, sort or None).
+    """
+    # Imported here, the production modules import this one
+    from database.utils.episodes import available_weeks_pipeline, week_pipeline
+    from src.post_processing import karma_watch_key, show_query, snapshot_query
+    from src.rank_processing import (
+        ranking_key,
+        season_averages_pipeline,
+        weekly_change_pipeline,
+    )
+    from util.committees import COMMITTEE_SORT
+    from util.seasonal_schedule import SEASON_NAMES, SeasonScheduler
+
+    if db is None:
+        db = get_db()
+    if year is None or season is None or week_id is None:
+        schedule = SeasonScheduler()
+        year = schedule.year or datetime.now(timezone.utc).year
+        season = schedule.season_name or SEASON_NAMES[0]
+        week_id = schedule.week_id or 1
+
+    title_details = {"romaji": "", "english": ""}
+    queries = [
+        # Show lookups of insert_mongo, get_active_posts and close_post
+        ("seasonals", show_query(1, title_details), None),
+        ("seasonals", show_query(None, title_details), None),
+        ("seasonals", {"id": {"$in": [1]}}, None),
+        ("karma_watch", karma_watch_key(1, ""), None),
+        ("reddit_snapshot", snapshot_query("AutoLovepon", 0), None),
+        # Charts, averages and the JSON backups of data_backup
+        (*week_pipeline(year, season, week_id, db=db), None),
+        (*week_pipeline(year, season, None, db=db), None),
+        (*weekly_change_pipeline(year, season, week_id), None),
+        (*season_averages_pipeline(year, season, db=db), None),
+        ("weekly_rankings", ranking_key(year, season, week_id), None),
+        ("committees", {}, COMMITTEE_SORT),
+        ("producers", {"mal_id": {"$in": [1]}}, None),
+    ]
+    if week_pipeline(year, season, None, db=db)[0] == "episodes":
+        queries.append(("episodes", available_weeks_pipeline(), None))
+    return queries
+
+
+def ensure_indexes(db: Optional[Database] = None) -> List[str]:
+    """
+    Creates every index in `REQUIRED_INDEXES` that does not exist yet, and drops the
+    `OBSOLETE_INDEXES`.
+
+    Creating an index that already exists with the same specification is a no-op, so
+    this is safe to call on every startup. Indexes that can't be built (e.g. a unique
+    index over duplicated data) are logged and skipped.
+
+    Args:
+        db (Database, optional): Database to index. Defaults to the shared `anime` database.
+
+    Returns:
+        list[str]: Names of the indexes that are in place.
+    """
+    if db is None:
+        db = get_db()
+
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        existing = db[collection_name].index_information()
+        for name in names:
+            if name in existing:
+                db[collection_name].drop_index(name)
+                logger.info(f"Dropped the obsolete index {name} on {collection_name}")
+
+    created = []
+    for collection_name, indexes in REQUIRED_INDEXES.items():
+        for index in indexes:
+            try:
+                created.extend(db[collection_name].create_indexes([index]))
+            except OperationFailure as e:
+                logger.error(
+                    f"Could not create index {index.document['name']} on {collection_name}: {e}"
+                )
+    logger.info(f"Ensured {len(created)} indexes")
+    return created
+
+
+def _winning_plans(explain: Union[Dict, List]) -> Iterator[Dict]:
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan" and isinstance(value, dict):
+                yield value
+            else:
+                yield from _winning_plans(value)
+    elif isinstance(explain, list):
+        for value in explain:
+            yield from _winning_plans(value)
+
+
+def _has_stage(plan: Union[Dict, List], stage: str) -> bool:
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage:
+            return True
+        return any(_has_stage(value, stage) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_has_stage(value, stage) for value in plan)
+    return False
+
+
+def is_collection_scan(
+    collection: Collection,
+    query: Union[Dict, List[Dict]],
+    min_docs: int = 0,
+    sort: Optional[List[tuple]] = None,
+) -> bool:
+    """
+    Explains a query and tells whether its winning plan scans the whole collection.
+
+    Args:
+        collection (Collection): Collection the query runs on
+        query (dict | list[dict]): A find filter or an aggregation pipeline
+        min_docs (int): Collections with fewer documents are never reported
+        sort (list[tuple], optional): Sort of a find filter
+
+    Returns:
+        bool: True if the plan has a COLLSCAN stage on a collection of at least `min_docs` documents.
+    """
+    if collection.estimated_document_count() < min_docs:
+        return False
+
+    if isinstance(query, list):
+        explain = collection.database.command(
+            "aggregate", collection.name, pipeline=query, explain=True
+        )
+    else:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = cursor.explain()
+
+    return any(_has_stage(plan, "COLLSCAN") for plan in _winning_plans(explain))
+
+
+def check_query_plans(
+    db: Optional[Database] = None,
+    queries: Optional[List[tuple]] = None,
+    min_docs: int = QUERY_PLAN_MIN_DOCS,
+) -> List[tuple]:
+    """
+    Returns the queries that fall back to a collection scan.
+
+    Args:
+        db (Database, optional): Database to check. Defaults to the shared `anime` database.
+        queries (list[tuple], optional): Triples of (collection name, filter or pipeline,
+            sort or None). Defaults to `hot_queries`.
+        min_docs (int): Collections with fewer documents are not reported. Defaults to
+            QUERY_PLAN_MIN_DOCS.
+
+    Returns:
+        list[tuple]: The offending (collection name, query, sort) triples.
+    """
+    if db is None:
+        db = get_db()
+    if queries is None:
+        queries = hot_queries(db)
+
+    offending = []
+    for collection_name, query, sort in queries:
+        if is_collection_scan(db[collection_name], query, min_docs=min_docs, sort=sort):
+            logger.warning(f"COLLSCAN on {collection_name} for {query}")
+            offending.append((collection_name, query, sort))
+    return offending
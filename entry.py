@@ -1,56 +1,76 @@
+from __future__ import annotations
+
+import json
 import os
 from datetime import datetime, timezone
+from functools import lru_cache
 from itertools import zip_longest
+from typing import TYPE_CHECKING, Dict
+
 from dotenv import load_dotenv
-from flask import Flask, abort, render_template, request, jsonify
-from flask_frozen import Freezer
-from pymongo import MongoClient
-from src.rank_processing import (
-    get_available_seasons,
-    get_season_averages,
-    get_weekly_change,
-)
-from src.post_processing import get_active_posts, main
+from flask import Flask, abort, render_template
+
 from static.assets import back_symbol, new_entry, right_new_entry
-from util.seasonal_schedule import SeasonScheduler
-from util.logger_config import logger
-import json
 
-load_dotenv()
-
-app = Flask(__name__)
-app.config["FREEZER_RELATIVE_URLS"] = True  # For proper relative paths
-app.config["FREEZER_DESTINATION"] = "docs"  # GitHub Pages default folder
-app.config["DEBUG"] = True
-app.config["TEMPLATES_AUTO_RELOAD"] = True
-app.config["FREEZER_RELATIVE_URLS_PRETTY"] = True  # For pretty URLs
-app.config["FREEZER_DEFAULT_MIMETYPE"] = "text/html"
-freezer = Freezer(app)
-
-episode_schedule = SeasonScheduler()
-post_schedule = SeasonScheduler(schedule_type="post")
-
-if (
-    post_schedule.year is None
-    or post_schedule.season_number is None
-    or post_schedule.week_id is None
-):
-    raise RuntimeError("Could not determine current post schedule details")
-
-# The Airing Period for the rank
-rank_schedule = episode_schedule.get_schedule_for_date(
-    year=post_schedule.year,
-    season=post_schedule.season_number,
-    week_id=post_schedule.week_id,
-)
-if rank_schedule is None:
-    raise RuntimeError("Could not determine current episode schedule details")
-
-airing_period = episode_schedule.get_airing_period(
-    schedule_details=rank_schedule
-)
-client = MongoClient(os.getenv("MONGO_URI"))
-available_seasons = get_available_seasons()
+if TYPE_CHECKING:
+    from util.seasonal_schedule import ScheduleWeek, SeasonScheduler
+
+# Nothing below connects to MongoDB or Reddit, or scans the templates, at import time.
+# The heavier modules (schedules, rankings, Reddit processing) are imported by the views
+# using them, and the current schedule is resolved on the first request that needs it.
+# Nothing enforces this automatically, run examples/check_import_budget.py to check it.
+
+
+def current_post_week() -> ScheduleWeek:
+    """The week of the post schedule containing the current time."""
+    from util.seasonal_schedule import resolve_week
+
+    week = resolve_week(datetime.now(timezone.utc), "post")
+    if week is None:
+        raise RuntimeError("Could not determine current post schedule details")
+    return week
+
+
+def post_schedule() -> SeasonScheduler:
+    """The post schedule of the current week, built once per week."""
+    return _post_schedule_for(current_post_week())
+
+
+def airing_period() -> Dict:
+    """The airing period of the episodes ranked by the current post schedule."""
+    return _airing_period_for(current_post_week())
+
+
+# Keyed on the week, so a long-running server moves on to the new week when it starts
+@lru_cache(maxsize=4)
+def _post_schedule_for(week: ScheduleWeek) -> SeasonScheduler:
+    from util.seasonal_schedule import SeasonScheduler
+
+    schedule = SeasonScheduler(schedule_type="post", post_time=week.post_time)
+    if schedule.year is None or schedule.season_number is None or schedule.week_id is None:
+        raise RuntimeError("Could not determine current post schedule details")
+    return schedule
+
+
+@lru_cache(maxsize=4)
+def _airing_period_for(week: ScheduleWeek) -> Dict:
+    from util.seasonal_schedule import DEFAULT_CACHE_DB_PATH, ScheduleIndex
+
+    # The Airing Period for the rank
+    rank_week = ScheduleIndex.for_path(DEFAULT_CACHE_DB_PATH).matching_week(
+        week, "episodes"
+    )
+    if rank_week is None:
+        raise RuntimeError("Could not determine current episode schedule details")
+    return _airing_details(rank_week)
+
+
+@lru_cache(maxsize=None)
+def available_seasons() -> Dict:
+    """The weeks with a saved chart in `templates/`, scanned on first use."""
+    from src.rank_processing import get_available_seasons
+
+    return get_available_seasons()
 
 
 def _season_to_number(season: str) -> int:
@@ -61,48 +81,38 @@ def _season_to_number(season: str) -> int:
     return mapping[season]
 
 
-def _build_forced_post_schedule(
-    year: int, season: str, week: int
-) -> SeasonScheduler:
-    season_number = _season_to_number(season)
+def _schedule_week_or_404(
+    year: int, season: str, week: int, schedule_type: str
+) -> ScheduleWeek:
+    from util.seasonal_schedule import schedule_week
 
-    probe = SeasonScheduler(schedule_type="post")
-    schedule_details = probe.get_schedule_for_date(
-        year=year, season=season_number, week_id=week
-    )
-    if schedule_details is None or schedule_details.week_id is None:
+    found = schedule_week(year, _season_to_number(season), week, schedule_type)
+    if found is None:
         abort(404)
+    return found
 
-    # Use a timestamp inside the requested week that keeps `schedule.year == year`.
-    # This matters for winter week 1 which can start in the previous calendar year.
-    forced_time = (
-        schedule_details.end_date
-        if getattr(schedule_details.end_date, "year", None) == year
-        else schedule_details.start_date
-    )
 
-    return SeasonScheduler(schedule_type="post", post_time=forced_time)
+def _build_forced_post_schedule(year: int, season: str, week: int) -> ScheduleWeek:
+    # The week is looked up by its key, so `schedule.year == year` also holds for winter
+    # week 1, which can start in the previous calendar year.
+    return _schedule_week_or_404(year, season, week, "post")
 
 
-def _airing_details_for_week(year: int, season: str, week: int):
-    season_number = _season_to_number(season)
-    schedule_details = episode_schedule.get_schedule_for_date(
-        year=year, season=season_number, week_id=week
-    )
-    if schedule_details is None or schedule_details.week_id is None:
-        abort(404)
-
-    converted_start_date = schedule_details.start_date.strftime("%B, %d")
-    converted_end_date = schedule_details.end_date.strftime("%B, %d")
+def _airing_details(week: ScheduleWeek) -> Dict:
+    converted_start_date = week.start_date.strftime("%B, %d")
+    converted_end_date = week.end_date.strftime("%B, %d")
 
     return {
         "airing_period": f"Airing Period: {converted_start_date} - {converted_end_date}",
-        "season": season.lower(),
-        "week_id": week,
+        "season": week.season_name,
+        "week_id": week.week_id,
     }
 
 
-@app.route("/current_chart/", endpoint="current_chart")
+def _airing_details_for_week(year: int, season: str, week: int):
+    return _airing_details(_schedule_week_or_404(year, season, week, "episodes"))
+
+
 def karma_rank():
     """
     Render the current karma rankings chart.
@@ -118,7 +128,9 @@ def karma_rank():
             - Various symbols for UI elements
     """
 
-    current_shows = get_weekly_change(schedule=post_schedule)
+    from src.rank_processing import get_weekly_change
+
+    current_shows = get_weekly_change(schedule=post_schedule())
     total_karma = sum([show["karma"] for show in current_shows[:15]])
     total_karma = f"{total_karma:,}"
 
@@ -133,7 +145,7 @@ def karma_rank():
     return render_template(
         "rank.html.j2",
         complete_rankings=complete_rankings,
-        airing_details=airing_period,
+        airing_details=airing_period(),
         sum_karma=total_karma,
         back_symbol=back_symbol,
         new_entry=new_entry,
@@ -141,8 +153,6 @@ def karma_rank():
     )
 
 
-@app.route("/<int:year>/<season>/<int:week>", endpoint="rank_for_week")
-@app.route("/<int:year>/<season>/<int:week>/", endpoint="rank_for_week_slash")
 def karma_rank_for_week(year: int, season: str, week: int):
     """Render `rank.html.j2` for an arbitrary (year, season, week).
 
@@ -150,6 +160,8 @@ def karma_rank_for_week(year: int, season: str, week: int):
     need to review or tweak the HTML for a previous week.
     """
 
+    from src.rank_processing import get_weekly_change
+
     forced_schedule = _build_forced_post_schedule(
         year=year, season=season, week=week
     )
@@ -176,7 +188,6 @@ def karma_rank_for_week(year: int, season: str, week: int):
     )
 
 
-@app.route("/<int:year>/<season>/week_<int:week>.html", endpoint="show_week")
 def show_week(year: int, season: str, week: int) -> str:
     """
     Dynamically render a specific week's chart.
@@ -197,7 +208,6 @@ def show_week(year: int, season: str, week: int) -> str:
     return render_template(template_path)
 
 
-@app.route("/", endpoint="new_home")
 def current_week():
     """
     Render the current week's anime karma rankings.
@@ -214,9 +224,13 @@ def current_week():
             - active_discussions: Currently active discussion posts on r/anime (under the 48 hours rule)
     """
 
-    current_shows = get_weekly_change(schedule=post_schedule)
+    from src.post_processing import get_active_posts
+    from src.rank_processing import get_season_averages, get_weekly_change
+
+    schedule = post_schedule()
+    current_shows = get_weekly_change(schedule=schedule)
     season_averages = get_season_averages(
-        schedule=post_schedule,
+        schedule=schedule,
     )
 
     active_discussions = get_active_posts()
@@ -224,16 +238,15 @@ def current_week():
     return render_template(
         "new_home.html",
         current_shows=current_shows,
-        current_week_id=post_schedule.week_id,
-        airing_details=airing_period,
+        current_week_id=schedule.week_id,
+        airing_details=airing_period(),
         average_shows=season_averages,
         active_discussions=active_discussions,
-        available_seasons=available_seasons,
-        current_time=post_schedule.post_time,
+        available_seasons=available_seasons(),
+        current_time=datetime.now(timezone.utc),
     )
 
 
-@app.route("/karma_watch.html", endpoint="karma_watch")
 def karma_watch():
     """
     Render the Karma Watch page for comparing show karma progression.
@@ -244,8 +257,10 @@ def karma_watch():
     Returns:
         rendered template: The karma_watch.html template
     """
+    from database.utils.client import get_db
+
     # Get all available shows with karma progression data
-    collection = client.anime.karma_watch
+    collection = get_db().karma_watch
 
     # Get karma progression data for all tracked shows
     karma_data = list(
@@ -309,16 +324,13 @@ def karma_watch():
     with open(karma_watch_path, "w") as f:
         json.dump(karma_data, f, indent=4)
 
-    client.close()
-
     return render_template(
         "karma_watch.html",
-        available_seasons=available_seasons,
+        available_seasons=available_seasons(),
         current_time=datetime.now(timezone.utc),
     )
 
 
-@app.route("/committees.html", endpoint="committees")
 def production_committees():
     """
     Render the Production Committees page.
@@ -329,12 +341,14 @@ def production_committees():
     Returns:
         rendered template: The production_committees.html template with context
     """
+    from database.utils.client import get_db
+
     # Get filter parameters from request
-    season = post_schedule.season_name
-    year = post_schedule.year
+    schedule = post_schedule()
+    season = schedule.season_name
+    year = schedule.year
 
-    client = MongoClient(os.getenv("MONGO_URI"))
-    db = client.anime
+    db = get_db()
 
     # Get committee data, which saves a json to /static/data/committees.json
     committee_data = list(db.committees.find({}, {"_id": 0}))
@@ -345,11 +359,10 @@ def production_committees():
     # Filters
     filter_seasons = ["winter", "spring", "summer", "fall"]
     filter_years = sorted(db.committees.distinct("year"), reverse=True)
-    client.close()
 
     return render_template(
         "committees.html",
-        available_seasons=available_seasons,
+        available_seasons=available_seasons(),
         filter_seasons=filter_seasons,
         filter_years=filter_years,
         current_season=season,
@@ -358,18 +371,55 @@ def production_committees():
     )
 
 
-@app.route("/previous-weeks.html")
 def previous_weeks():
 
     return render_template(
-        "previous_weeks.html", available_seasons=available_seasons
+        "previous_weeks.html", available_seasons=available_seasons()
+    )
+
+
+def create_app() -> Flask:
+    """
+    Builds the Flask app of the site.
+
+    Creating the app is cheap: the database, Reddit and the schedule are only reached by
+    the views, when a page is first rendered or frozen.
+    """
+    load_dotenv()
+
+    app = Flask(__name__)
+    app.config["FREEZER_RELATIVE_URLS"] = True  # For proper relative paths
+    app.config["FREEZER_DESTINATION"] = "docs"  # GitHub Pages default folder
+    app.config["DEBUG"] = True
+    app.config["TEMPLATES_AUTO_RELOAD"] = True
+    app.config["FREEZER_RELATIVE_URLS_PRETTY"] = True  # For pretty URLs
+    app.config["FREEZER_DEFAULT_MIMETYPE"] = "text/html"
+
+    app.add_url_rule("/current_chart/", "current_chart", karma_rank)
+    app.add_url_rule("/<int:year>/<season>/<int:week>", "rank_for_week", karma_rank_for_week)
+    app.add_url_rule(
+        "/<int:year>/<season>/<int:week>/", "rank_for_week_slash", karma_rank_for_week
     )
+    app.add_url_rule("/<int:year>/<season>/week_<int:week>.html", "show_week", show_week)
+    app.add_url_rule("/", "new_home", current_week)
+    app.add_url_rule("/karma_watch.html", "karma_watch", karma_watch)
+    app.add_url_rule("/committees.html", "committees", production_committees)
+    app.add_url_rule("/previous-weeks.html", "previous_weeks", previous_weeks)
+    return app
 
 
 if __name__ == "__main__":
     import sys
 
+    from database.utils.indexes import ensure_indexes
+
+    app = create_app()
+    ensure_indexes()
+
     if "freeze" in sys.argv:
+        from flask_frozen import Freezer
+
+        freezer = Freezer(app)
 
         @freezer.register_generator
         def current_chart():
@@ -391,6 +441,8 @@ if __name__ == "__main__":
 
         freezer.freeze()
     elif "run" in sys.argv:
+        from src.post_processing import main
+
         main()
     else:
         app.run(host="0.0.0.0")
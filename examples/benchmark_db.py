@@ -0,0 +1,72 @@
+"""
+MongoDB helpers shared by the benchmarks that run the production code paths.
+
+Those paths write to the `anime` database of MONGO_URI, so `local_database` refuses
+to run against anything but a local, disposable MongoDB and seeds its `seasonals`
+collection from the `database/anime.seasonals.json` export. `CommandCounter` counts the
+commands, i.e. the network round trips, the shared client sends.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+from pymongo import monitoring
+
+EXPORT_PATH = Path("database/anime.seasonals.json")
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "[::1]")
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts the commands sent by every client created after `install`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = Counter()
+
+    @classmethod
+    def install(cls) -> "CommandCounter":
+        counter = cls()
+        monitoring.register(counter)
+        return counter
+
+    def reset(self):
+        with self._lock:
+            self.commands.clear()
+
+    @property
+    def total(self) -> int:
+        return sum(self.commands.values())
+
+    def started(self, event):
+        with self._lock:
+            self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def local_database():
+    """Returns the `anime` database of a local MONGO_URI, with the export seeded."""
+    from database.utils.client import get_db
+    from database.utils.indexes import ensure_indexes
+
+    mongo_uri = os.getenv("MONGO_URI", "")
+    if not any(host in mongo_uri for host in LOCAL_HOSTS):
+        sys.exit("The benchmark writes to the anime database, set MONGO_URI to a local MongoDB")
+
+    db = get_db()
+    with open(EXPORT_PATH) as f:
+        documents = json.load(f)
+    for document in documents:
+        document.pop("_id", None)
+    db.seasonals.drop()
+    db.seasonals.insert_many(documents)
+    ensure_indexes()
+    return db
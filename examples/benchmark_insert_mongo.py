@@ -0,0 +1,125 @@
+"""
+Benchmarks the MongoDB round trips needed to record a closed post on its show.
+
+Every post of the recorded Reddit fixture (`examples/fixtures/autolovepon.json`) is
+recorded twice, the second time as a retried job, into a local MongoDB reseeded before
+each run (see `local_database`). A path that is idempotent per `reddit_id` stores each
+post once:
+- step by step: find the show, create `reddit_karma`, its year and its season one
+  `$set` at a time, then `$push` the post, as `insert_mongo` used to do
+- pipeline: the single `reddit_karma_update` pipeline update of `insert_mongo`
+- insert_mongo: the whole function, with the `episodes` and `season_stats` writes of
+  `record_episodes`, without the ranking refresh
+
+Run with `python -m examples.benchmark_insert_mongo` against a local MongoDB.
+"""
+
+import time
+
+from examples.benchmark_db import CommandCounter, local_database
+from examples.reddit_fixture import FixtureReddit
+from src.post_processing import (
+    RedditPostDetails,
+    _episode_data,
+    get_mal_id_reddit_post,
+    get_title_details,
+    insert_mongo,
+    post_schedule_week,
+    reddit_karma_update,
+)
+
+
+def step_by_step(col, post_details, schedule):
+    query = {"id": post_details["mal_id"]}
+    year, season = str(schedule.year), schedule.season_name
+    show = col.find_one(query)
+    if not show:
+        return
+    if not isinstance(show.get("reddit_karma"), dict):
+        col.update_one(query, {"$set": {"reddit_karma": {}}})
+        show = col.find_one(query)
+    if year not in show["reddit_karma"]:
+        col.update_one(query, {"$set": {f"reddit_karma.{year}": {}}})
+        show = col.find_one(query)
+    if season not in (show["reddit_karma"].get(year) or {}):
+        col.update_one(query, {"$set": {f"reddit_karma.{year}.{season}": []}})
+    col.update_one(
+        query, {"$push": {f"reddit_karma.{year}.{season}": _episode_data(post_details)}}
+    )
+
+
+def pipeline(col, post_details, schedule):
+    col.update_one(
+        {"id": post_details["mal_id"]},
+        reddit_karma_update(schedule.year, schedule.season_name, _episode_data(post_details)),
+    )
+
+
+def closed_posts(reddit):
+    posts = []
+    for submission in reddit.redditor("AutoLovepon").submissions.new(limit=None):
+        title_details, episode = get_title_details(submission.title)
+        schedule = post_schedule_week(submission.created_utc)
+        post_details = RedditPostDetails(
+            mal_id=get_mal_id_reddit_post(submission.selftext),
+            title=title_details,
+            week_id=schedule.week_id,
+            episode=episode,
+            karma=submission.score,
+            comments=submission.num_comments,
+            upvote_ratio=submission.upvote_ratio,
+            post_id=submission.id,
+            url=submission.url,
+        )
+        posts.append((post_details.model_dump(), schedule))
+    return posts
+
+
+def stored_posts(db, posts):
+    """Counts the entries of the fixture posts in their benchmark season arrays."""
+    count = 0
+    for post_details, schedule in posts:
+        path = f"reddit_karma.{schedule.year}.{schedule.season_name}"
+        show = db.seasonals.find_one({"id": post_details["mal_id"]}, {path: 1})
+        for year in (show or {}).get("reddit_karma", {}).values():
+            for season in year.values():
+                count += sum(e.get("reddit_id") == post_details["post_id"] for e in season)
+    return count
+
+
+def run(name, record, posts, commands):
+    db = local_database()
+    for collection in ("episodes", "season_stats"):
+        db.drop_collection(collection)
+
+    commands.reset()
+    started = time.perf_counter()
+    for post_details, schedule in posts + posts:
+        record(db, post_details, schedule)
+    elapsed = time.perf_counter() - started
+
+    round_trips = commands.total / (2 * len(posts))
+    by_command = ", ".join(f"{n} {c}" for c, n in sorted(commands.commands.items()))
+    print(
+        f"  {name:13} {elapsed * 1000:8.1f} ms, {round_trips:4.1f} round trips/post"
+        f" ({by_command}), {stored_posts(db, posts)} entries stored"
+    )
+
+
+def main():
+    commands = CommandCounter.install()
+    posts = closed_posts(FixtureReddit(latency_ms=0))
+    print(f"{len(posts)} closed posts, each recorded twice")
+
+    run("step by step", lambda db, p, s: step_by_step(db.seasonals, p, s), posts, commands)
+    run("pipeline", lambda db, p, s: pipeline(db.seasonals, p, s), posts, commands)
+    run(
+        "insert_mongo",
+        lambda db, p, s: insert_mongo(p, schedule=s, refresh_rankings=False),
+        posts,
+        commands,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmarks the hourly karma polling cycle against the recorded Reddit fixture.
+
+Both paths poll the live posts of `examples/fixtures/autolovepon.json`, served by
+`FixtureReddit`, and record their hourly karma in a local MongoDB (see `local_database`):
+- per post: a listing, then a `seasonals.find_one` and one or two `karma_watch` round
+  trips per live post, as `get_active_posts` used to do
+- batched: `get_active_posts`, the submission snapshot refreshes the live posts through
+  batched `reddit.info` lookups and the samples are written with one `bulk_write`
+
+The snapshot TTL is disabled so every cycle goes to the fixture.
+
+Run with `python -m examples.benchmark_karma_polling` against a local MongoDB.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from examples.benchmark_db import CommandCounter, local_database
+from examples.reddit_fixture import FixtureReddit
+from src.post_processing import (
+    get_active_posts,
+    get_mal_id_reddit_post,
+    get_submission_snapshot,
+)
+
+CYCLES = 5
+
+
+def per_post_cycle(reddit, db):
+    current_time = datetime.now(timezone.utc)
+    updated_at = current_time.strftime("%Y-%m-%d %H:%M:%S")
+    cutoff = (current_time - timedelta(hours=48)).timestamp()
+    posts = []
+    for submission in reddit.redditor("AutoLovepon").submissions.new(limit=50):
+        if submission.created_utc <= cutoff:
+            continue
+        mal_id = get_mal_id_reddit_post(submission.selftext)
+        show = db.seasonals.find_one({"id": mal_id}, {"_id": 0, "title": 1, "images": 1})
+        if not show:
+            continue
+        posts.append(show)
+
+        hour = round((current_time.timestamp() - submission.created_utc) / 3600)
+        sample = {"hour": hour, "karma": submission.score}
+        query = {"mal_id": mal_id, "reddit_id": submission.id}
+        existing = db.karma_watch.find_one(query)
+        if not existing:
+            db.karma_watch.insert_one(
+                {**query, "updated_at": updated_at, "hourly_karma": [sample]}
+            )
+        elif any(entry["hour"] == hour for entry in existing["hourly_karma"]):
+            db.karma_watch.update_one(
+                {**query, "hourly_karma.hour": hour},
+                {"$set": {"updated_at": updated_at, "hourly_karma.$.karma": sample["karma"]}},
+            )
+        else:
+            db.karma_watch.update_one(
+                query,
+                {"$set": {"updated_at": updated_at}, "$push": {"hourly_karma": sample}},
+            )
+    return posts
+
+
+def run(name, cycle, reddit, commands):
+    timings = []
+    calls, round_trips, posts = 0, 0, 0
+    for _ in range(CYCLES):
+        reddit.calls = 0
+        commands.reset()
+        started = time.perf_counter()
+        posts = len(cycle())
+        timings.append(time.perf_counter() - started)
+        calls, round_trips = reddit.calls, commands.total
+
+    print(
+        f"  {name:10} {posts} posts, first cycle {timings[0] * 1000:8.1f} ms,"
+        f" then {sum(timings[1:]) / (CYCLES - 1) * 1000:8.1f} ms/cycle,"
+        f" {calls} Reddit calls, {round_trips} MongoDB round trips"
+    )
+
+
+def main():
+    commands = CommandCounter.install()
+    db = local_database()
+
+    reddit = FixtureReddit()
+    print(
+        f"{len(reddit.live_posts())} live posts of {len(reddit.posts)},"
+        f" {reddit.latency * 1000:.0f} ms per Reddit call, {CYCLES} cycles"
+    )
+
+    for collection in ("karma_watch", "reddit_snapshot"):
+        db.drop_collection(collection)
+    run("per post", lambda: per_post_cycle(reddit, db), reddit, commands)
+
+    for collection in ("karma_watch", "reddit_snapshot"):
+        db.drop_collection(collection)
+    get_submission_snapshot().ttl = timedelta(0)
+    run("batched", lambda: get_active_posts(reddit=reddit), reddit, commands)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmarks the end-to-end closing latency of a burst of posts against the recorded
+Reddit fixture.
+
+Both paths close the same BURST posts of `examples/fixtures/autolovepon.json`, served by
+`FixtureReddit`, into a local MongoDB reseeded before each run (see `local_database`):
+- one by one: the posts are closed one after the other, each with its own `reddit.info`
+  lookup, `submission_final_state` and `insert_mongo`. This is the sequence of
+  `process_post`, which can't be called on the fixture because `close_post` builds a PRAW
+  `Submission` bound to a real Reddit instance. It already stores with today's single
+  `insert_mongo` update over the pooled client, so the difference with the batched path
+  is only the batched lookups, the concurrency and the single bulk write. The cost of
+  the older step by step storage is measured by `benchmark_insert_mongo`
+- batched: `close_posts_batch`, batched `reddit.info` lookups, a bounded worker pool and
+  one bulk write for the whole burst
+
+Run with `python -m examples.benchmark_post_closing` against a local MongoDB.
+"""
+
+import time
+
+from examples.benchmark_db import CommandCounter, local_database
+from examples.reddit_fixture import FixtureReddit
+from src.post_processing import (
+    RedditPostDetails,
+    close_posts_batch,
+    insert_mongo,
+    post_schedule_week,
+    submission_final_state,
+)
+
+BURST = 50
+
+
+def close_one_by_one(posts, reddit, db):
+    for post in posts:
+        (submission,) = reddit.info(fullnames=[f"t3_{post['id']}"])
+        post_details = submission_final_state(
+            submission, post_id=post["id"], week_id=post["week_id"], col=db.seasonals
+        )
+        schedule = post_schedule_week(post["created_utc"])
+        insert_mongo(RedditPostDetails(**post_details).model_dump(), schedule=schedule)
+
+
+def run(name, close, reddit, commands):
+    db = local_database()
+    for collection in ("episodes", "season_stats", "weekly_rankings"):
+        db.drop_collection(collection)
+
+    reddit.calls = 0
+    commands.reset()
+    started = time.perf_counter()
+    close(db)
+    elapsed = time.perf_counter() - started
+
+    closed = db.episodes.count_documents({})
+    print(
+        f"  {name:10} {elapsed * 1000:9.1f} ms, {closed} posts closed,"
+        f" {reddit.calls} Reddit calls, {commands.total} MongoDB round trips"
+    )
+
+
+def main():
+    commands = CommandCounter.install()
+    reddit = FixtureReddit()
+
+    posts = []
+    for post in reddit.posts[-BURST:]:
+        created_utc = int(post["created_utc"])
+        posts.append(
+            {
+                "id": post["id"],
+                "created_utc": created_utc,
+                "week_id": post_schedule_week(created_utc).week_id,
+            }
+        )
+    print(f"Burst of {len(posts)} posts, {reddit.latency * 1000:.0f} ms per Reddit call")
+
+    run("one by one", lambda db: close_one_by_one(posts, reddit, db), reddit, commands)
+    run("batched", lambda db: close_posts_batch(posts, reddit), reddit, commands)
+
+
+if __name__ == "__main__":
+    main()
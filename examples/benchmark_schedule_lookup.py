@@ -0,0 +1,75 @@
+"""
+Benchmarks timestamp-to-week resolution against a scratch schedule cache.
+
+Each path resolves the same random post times of the 2025 season-year:
+- sqlite: a `ScheduleCache` and its queries per lookup, as `SeasonScheduler` used to do
+- index: `ScheduleIndex`, bisect over the in-memory schedule of the year
+- scheduler: a full `SeasonScheduler` construction, which now resolves through the index
+
+Run with `python -m examples.benchmark_schedule_lookup`.
+"""
+
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from util.seasonal_schedule import ScheduleCache, ScheduleIndex, SeasonScheduler
+
+YEAR = 2025
+LOOKUPS = 2000
+
+
+def sqlite_lookup(db_path, schedule_type, ts):
+    cache = ScheduleCache(db_path)
+    cache.ensure_year(YEAR, schedule_type)
+    return cache.get_for_timestamp(YEAR, schedule_type, ts)
+
+
+def timed(func, timestamps):
+    started = time.perf_counter()
+    for ts in timestamps:
+        func(ts)
+    return (time.perf_counter() - started) / len(timestamps) * 1e6
+
+
+def main():
+    start = int(datetime(YEAR - 1, 12, 28, tzinfo=timezone.utc).timestamp())
+    end = int(datetime(YEAR, 12, 20, tzinfo=timezone.utc).timestamp())
+    timestamps = [random.randint(start, end) for _ in range(LOOKUPS)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "schedules.sqlite")
+        index = ScheduleIndex.for_path(db_path)
+
+        for schedule_type in ("episodes", "post"):
+            # Cold start, builds and persists the year
+            started = time.perf_counter()
+            index.year(YEAR, schedule_type)
+            cold = (time.perf_counter() - started) * 1000
+
+            sqlite_us = timed(
+                lambda ts: sqlite_lookup(db_path, schedule_type, ts), timestamps
+            )
+            index_us = timed(
+                lambda ts: index.get_for_timestamp(YEAR, schedule_type, ts),
+                timestamps,
+            )
+            scheduler_us = timed(
+                lambda ts: SeasonScheduler(
+                    schedule_type=schedule_type,
+                    post_time=datetime.fromtimestamp(ts, tz=timezone.utc),
+                    cache_db_path=db_path,
+                ),
+                timestamps,
+            )
+
+            print(f"{schedule_type} ({LOOKUPS} lookups, cold start {cold:.1f} ms)")
+            print(f"  sqlite:    {sqlite_us:9.2f} us/lookup")
+            print(f"  index:     {index_us:9.2f} us/lookup")
+            print(f"  scheduler: {scheduler_us:9.2f} us/construction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmarks the schedule objects built per post against a scratch schedule cache.
+
+- SeasonScheduler: the Pydantic model, with its validators and airing period
+- resolve_week: the `ScheduleWeek` of the index for the same post time
+- ScheduleWeek: a bare construction of the slotted value, for reference
+
+Memory is the traced allocation per object while keeping OBJECTS of them alive. Weeks
+from `resolve_week` are shared, so that column is the cost of a new distinct week.
+
+Run with `python -m examples.benchmark_schedule_objects`.
+"""
+
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from util.seasonal_schedule import ScheduleIndex, ScheduleWeek, SeasonScheduler, resolve_week
+
+YEAR = 2025
+OBJECTS = 5000
+
+
+def timed(build, post_times):
+    started = time.perf_counter()
+    for post_time in post_times:
+        build(post_time)
+    return (time.perf_counter() - started) / len(post_times) * 1e6
+
+
+def traced(build, post_times):
+    tracemalloc.start()
+    objects = [build(post_time) for post_time in post_times]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(objects)
+
+
+def main():
+    start = int(datetime(YEAR - 1, 12, 28, tzinfo=timezone.utc).timestamp())
+    end = int(datetime(YEAR, 12, 20, tzinfo=timezone.utc).timestamp())
+    post_times = [
+        datetime.fromtimestamp(random.randint(start, end), tz=timezone.utc)
+        for _ in range(OBJECTS)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "schedules.sqlite")
+        ScheduleIndex.for_path(db_path).year(YEAR, "episodes")
+
+        builders = {
+            "SeasonScheduler": lambda t: SeasonScheduler(post_time=t, cache_db_path=db_path),
+            "resolve_week": lambda t: resolve_week(t, cache_db_path=db_path),
+            "ScheduleWeek": lambda t: ScheduleWeek(
+                "episodes", YEAR, 1, 1, int(t.timestamp()), int(t.timestamp()) + 1
+            ),
+        }
+
+        print(f"{OBJECTS} objects")
+        for name, build in builders.items():
+            print(
+                f"  {name:16} {timed(build, post_times):8.2f} us/object"
+                f" {traced(build, post_times):8.0f} bytes/object"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmarks the seasonal import against the `database/anime.seasonals.json` export.
+
+Both paths import the export into an empty `seasonals` collection of a scratch database
+(BENCHMARK_DB, default "anime_benchmark"), which is dropped afterwards:
+- per entry: a `find_one` and an `insert_one` per show, as `MalClient.push_to_db` does
+- bulk: `MalClient.push_many_to_db`, first as an import, then as a metadata refresh
+
+Run with `python -m examples.benchmark_seasonal_import` against a local MongoDB.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from database.utils.client import get_client
+from util.mal import MalClient, MalEntry
+
+EXPORT_PATH = Path("database/anime.seasonals.json")
+
+
+def load_entries():
+    with open(EXPORT_PATH) as f:
+        documents = json.load(f)
+    for document in documents:
+        document.pop("_id", None)
+    # The export is already in the seasonals format, skip the MAL node transform
+    return [MalEntry.model_construct(**document) for document in documents]
+
+
+def per_entry_import(collection, entries):
+    for entry in entries:
+        entry_dict = entry.model_dump()
+        if not collection.find_one({"id": entry_dict["id"]}):
+            collection.insert_one(entry_dict)
+
+
+def main():
+    entries = load_entries()
+    db = get_client()[os.getenv("BENCHMARK_DB", "anime_benchmark")]
+    collection = db.seasonals
+    mal = MalClient()
+
+    try:
+        collection.drop()
+        started = time.perf_counter()
+        per_entry_import(collection, entries)
+        per_entry = time.perf_counter() - started
+
+        collection.drop()
+        started = time.perf_counter()
+        imported = mal.push_many_to_db(entries, collection=collection)
+        bulk = time.perf_counter() - started
+
+        started = time.perf_counter()
+        refreshed = mal.push_many_to_db(entries, refresh=True, collection=collection)
+        refresh = time.perf_counter() - started
+    finally:
+        collection.drop()
+
+    print(f"{len(entries)} entries from {EXPORT_PATH}")
+    print(f"per entry import: {per_entry * 1000:.1f} ms")
+    print(f"bulk import:      {bulk * 1000:.1f} ms {imported}")
+    print(f"bulk refresh:     {refresh * 1000:.1f} ms {refreshed}")
+
+
+if __name__ == "__main__":
+    main()
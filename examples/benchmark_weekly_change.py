@@ -0,0 +1,80 @@
+"""
+Benchmarks repeated `get_weekly_change` calls with and without the pooled MongoDB client.
+
+Each path reads the rankings of the 2025 winter weeks of the `database/anime.seasonals.json`
+export, seeded into a local MongoDB (see `local_database`), CALLS times in a row. The
+result cache is bypassed so every call reaches MongoDB:
+- fresh client: a new `MongoClient` per call, closed afterwards, as every function used
+  to do
+- pooled: the process-wide client of `database.utils.client.get_client`
+
+Run with `python -m examples.benchmark_weekly_change` against a local MongoDB. Point
+MONGO_URI at a TLS or authenticated server to include the handshake costs.
+"""
+
+import os
+import time
+from unittest import mock
+
+from pymongo import MongoClient
+
+from database.utils.client import get_client, pool_stats
+from examples.benchmark_db import local_database
+from src import rank_processing
+from src.rank_processing import compute_weekly_change, get_weekly_change
+from util.seasonal_schedule import SEASON_NAMES, schedule_week
+
+YEAR, SEASON = 2025, "winter"
+WEEKS = range(6, 14)
+CALLS = 200
+
+
+def fresh_client_call(schedule):
+    client = MongoClient(os.environ["MONGO_URI"])
+    try:
+        with mock.patch.object(rank_processing, "get_db", lambda: client.anime):
+            return get_weekly_change.__wrapped__(schedule)
+    finally:
+        client.close()
+
+
+def pooled_call(schedule):
+    return get_weekly_change.__wrapped__(schedule)
+
+
+def timed(call, schedules):
+    started = time.perf_counter()
+    for i in range(CALLS):
+        call(schedules[i % len(schedules)])
+    return (time.perf_counter() - started) / CALLS * 1000
+
+
+def main():
+    db = local_database()
+    season_number = SEASON_NAMES.index(SEASON) + 1
+    schedules = [
+        schedule_week(YEAR, season_number, week_id, "post") for week_id in WEEKS
+    ]
+    # Materialize the rankings once, without the JSON backups of refresh_weekly_ranking,
+    # both paths then read the same documents
+    for week_id in WEEKS:
+        db.weekly_rankings.update_one(
+            {"year": YEAR, "season": SEASON, "week_id": week_id},
+            {"$set": {"rows": compute_weekly_change(YEAR, SEASON, week_id)}},
+            upsert=True,
+        )
+    get_client().admin.command("ping")
+
+    print(f"{CALLS} calls over {YEAR} {SEASON} weeks {WEEKS.start}-{WEEKS.stop - 1}")
+    print(f"  fresh client: {timed(fresh_client_call, schedules):8.2f} ms/call")
+    print(f"  pooled:       {timed(pooled_call, schedules):8.2f} ms/call")
+
+    stats = pool_stats()
+    print(
+        f"  pool: {stats['connections_created']} connections created,"
+        f" {stats['checkouts']} checkouts"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Checks that importing `entry` stays cheap, see `entry.create_app`.
+
+Imports `entry` in a fresh interpreter with `python -X importtime` and fails (exit
+code 1) when:
+- the cumulative import time of `entry`, best of RUNS, exceeds ENTRY_IMPORT_BUDGET_MS
+- a module that connects, authenticates or pulls the data stack at import was imported
+
+Run with `python -m examples.check_import_budget`, e.g. before `entry.py freeze`.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_MS = float(os.getenv("ENTRY_IMPORT_BUDGET_MS", 400))
+RUNS = 3
+
+# Only the views and the __main__ block may import these
+DEFERRED_MODULES = (
+    "apscheduler",
+    "database.utils.client",
+    "flask_frozen",
+    "numpy",
+    "pandas",
+    "praw",
+    "pymongo",
+    "src.post_processing",
+    "src.rank_processing",
+    "util.seasonal_schedule",
+)
+
+# import time: self [us] | cumulative | imported package
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module: str = "entry") -> dict:
+    """Returns the cumulative import time in ms of every module imported by `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2)) / 1000
+    return times
+
+
+def main():
+    runs = [import_times() for _ in range(RUNS)]
+    best = min(runs, key=lambda times: times["entry"])
+    elapsed = best["entry"]
+
+    deferred = sorted(
+        name
+        for name in best
+        if any(name == d or name.startswith(f"{d}.") for d in DEFERRED_MODULES)
+    )
+    slowest = sorted(best.items(), key=lambda item: item[1], reverse=True)[1:6]
+
+    print(f"import entry: {elapsed:.1f} ms (budget {BUDGET_MS:.0f} ms)")
+    for name, ms in slowest:
+        print(f"  {name:40} {ms:8.1f} ms")
+
+    failed = False
+    if elapsed > BUDGET_MS:
+        print(f"Import time is over budget by {elapsed - BUDGET_MS:.1f} ms")
+        failed = True
+    if deferred:
+        print(f"Imported at import time: {', '.join(deferred)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Checks that the hot queries are served by an index, see `database.utils.indexes`.
+
+Explains every query of `hot_queries`, built by the production helpers for the current
+week, against the database of MONGO_URI and fails (exit code 1) when one of them
+scans a collection of at least QUERY_PLAN_MIN_DOCS documents (default 1000).
+
+Run with `python -m examples.check_query_plans`, e.g. after `ensure_indexes` ran on a
+copy of the production data. Pass `--ensure` to create the missing indexes first.
+"""
+
+import sys
+
+from database.utils.client import get_db
+from database.utils.indexes import (
+    QUERY_PLAN_MIN_DOCS,
+    check_query_plans,
+    ensure_indexes,
+    hot_queries,
+)
+
+
+def main():
+    db = get_db()
+    if "--ensure" in sys.argv:
+        ensure_indexes(db)
+
+    queries = hot_queries(db)
+    offending = check_query_plans(db, queries=queries)
+
+    print(
+        f"{len(queries)} hot queries, {len(offending)} collection scans"
+        f" (collections of at least {QUERY_PLAN_MIN_DOCS} documents)"
+    )
+    for collection_name, query, sort in offending:
+        print(f"  COLLSCAN {collection_name}: {query}" + (f" sort {sort}" if sort else ""))
+    sys.exit(1 if offending else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Checks that the scheduler schedules every live post, whatever other processes listed.
+
+Against the recorded Reddit fixture (`examples/fixtures/autolovepon.json`) and a local
+MongoDB (see `local_database`), with persisted snapshots as in production:
+1. the scheduler's snapshot is seeded while the HELD newest posts are not made yet
+2. another process (the Flask app, the freezer, a one-off script) seeds its own snapshot
+   once the first HELD - 1 of them were made
+3. the last one is made, and the scheduler runs `update_scheduler` again
+
+Fails (exit code 1) when a post of the 48 hours window is missing from the jobs of the
+scheduler, e.g. because the other process moved a shared high-water mark past it.
+
+Run with `python -m examples.check_snapshot_scheduling` against a local MongoDB.
+"""
+
+import sys
+from datetime import timedelta
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from examples.benchmark_db import local_database
+from examples.reddit_fixture import FixtureReddit
+from src.post_processing import (
+    SNAPSHOT_COLLECTION,
+    SubmissionSnapshot,
+    fetch_recent_posts,
+    get_submission_snapshot,
+    schedule_post_processing,
+)
+
+HELD = 3
+
+
+def scheduled_ids(scheduler):
+    return {post["id"] for job in scheduler.get_jobs() for post in job.args[0]}
+
+
+def main():
+    db = local_database()
+    db.drop_collection(SNAPSHOT_COLLECTION)
+
+    reddit = FixtureReddit(latency_ms=0)
+    posts = reddit.posts
+    scheduler = BackgroundScheduler()
+    snapshot = get_submission_snapshot()
+    snapshot.persist = True
+    snapshot.ttl = timedelta(0)
+
+    reddit.posts = posts[HELD:]
+    schedule_post_processing(fetch_recent_posts(reddit), reddit, scheduler)
+
+    reddit.posts = posts[1:]
+    SubmissionSnapshot(persist=True).get(reddit)
+
+    reddit.posts = posts
+    schedule_post_processing(fetch_recent_posts(reddit), reddit, scheduler)
+
+    live = [post["id"] for post in reddit.live_posts()]
+    missing = [post_id for post_id in live if post_id not in scheduled_ids(scheduler)]
+    print(f"{len(live) - len(missing)} of {len(live)} live posts scheduled")
+    if missing:
+        print(f"  never scheduled: {', '.join(missing)}")
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == "__main__":
+    main()
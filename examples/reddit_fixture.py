@@ -0,0 +1,183 @@
+"""
+Recorded-fixture stand-in for the Reddit API, used by the offline benchmarks.
+
+The fixture (FIXTURE_PATH) holds AutoLovepon discussion posts as Reddit returned them,
+with the time they were recorded at. `FixtureReddit` serves them through the part of PRAW
+the post processing uses:
+- `reddit.redditor(name).submissions.new(limit=..., params={"before": fullname})`
+- `reddit.info(fullnames=[...])`
+
+Posts keep their age relative to the recording, so the live 48 hours window holds the same
+posts whenever a benchmark runs. Every API call sleeps FIXTURE_LATENCY_MS and is counted.
+
+Refresh the fixture with `python -m examples.reddit_fixture record`, which needs the
+Reddit credentials of `setup_reddit_instance`, or rebuild it offline from the Reddit posts
+stored in the `database/anime.seasonals.json` export with
+`python -m examples.reddit_fixture build`.
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "autolovepon.json"
+EXPORT_PATH = Path("database/anime.seasonals.json")
+LATENCY_MS = float(os.getenv("FIXTURE_LATENCY_MS", 250))
+
+# Posts of the export used by `build`, spread over FIXTURE_SPAN before the recording
+FIXTURE_WEEKS = (("2025", "winter", 12), ("2025", "winter", 13))
+FIXTURE_SPAN = timedelta(days=4)
+
+SUBMISSION_FIELDS = (
+    "id",
+    "fullname",
+    "title",
+    "selftext",
+    "created_utc",
+    "score",
+    "num_comments",
+    "upvote_ratio",
+    "url",
+    "removed_by_category",
+    "hidden",
+)
+
+
+class FixtureSubmissions:
+    """The `redditor(name).submissions` listing of `FixtureReddit`."""
+
+    def __init__(self, reddit: "FixtureReddit"):
+        self.reddit = reddit
+
+    def new(self, limit: int = 100, params: Optional[Dict] = None) -> Iterator:
+        self.reddit._call()
+        posts = self.reddit.posts
+        before = (params or {}).get("before")
+        if before:
+            fullnames = [post["fullname"] for post in posts]
+            posts = posts[: fullnames.index(before)] if before in fullnames else []
+        return iter([self.reddit._submission(post) for post in posts[:limit]])
+
+
+class FixtureReddit:
+    """
+    Serves the posts of a recorded fixture through the PRAW calls of the post processing.
+
+    Attributes:
+        posts (list[dict]): The recorded posts, newest first, shifted to the current time
+        calls (int): Number of API calls served
+        latency (float): Seconds slept per API call
+    """
+
+    def __init__(self, path: Path = FIXTURE_PATH, latency_ms: float = LATENCY_MS):
+        with open(path) as f:
+            fixture = json.load(f)
+
+        shift = datetime.now(timezone.utc).timestamp() - fixture["recorded_at"]
+        self.posts = sorted(
+            ({**post, "created_utc": post["created_utc"] + shift} for post in fixture["posts"]),
+            key=lambda x: x["created_utc"],
+            reverse=True,
+        )
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def _call(self) -> None:
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def _submission(self, post: Dict) -> SimpleNamespace:
+        return SimpleNamespace(**post)
+
+    def redditor(self, name: str) -> SimpleNamespace:
+        return SimpleNamespace(name=name, submissions=FixtureSubmissions(self))
+
+    def info(self, fullnames: List[str]) -> Iterator:
+        self._call()
+        wanted = set(fullnames)
+        return iter(
+            [self._submission(post) for post in self.posts if post["fullname"] in wanted]
+        )
+
+    def live_posts(self, window: timedelta = timedelta(hours=48)) -> List[Dict]:
+        """Returns the posts created within `window` of the current time."""
+        cutoff = (datetime.now(timezone.utc) - window).timestamp()
+        return [post for post in self.posts if post["created_utc"] > cutoff]
+
+
+def write_fixture(posts: List[Dict], path: Path = FIXTURE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fixture = {
+        "recorded_at": datetime.now(timezone.utc).timestamp(),
+        "posts": posts,
+    }
+    with open(path, "w") as f:
+        json.dump(fixture, f, indent=1, ensure_ascii=False)
+    print(f"Wrote {len(posts)} posts to {path}")
+
+
+def record(username: str = "AutoLovepon") -> List[Dict]:
+    """Lists the newest submissions of `username` from Reddit."""
+    from src.post_processing import LISTING_LIMIT, setup_reddit_instance
+
+    reddit = setup_reddit_instance()
+    return [
+        {field: getattr(submission, field) for field in SUBMISSION_FIELDS}
+        for submission in reddit.redditor(username).submissions.new(limit=LISTING_LIMIT)
+    ]
+
+
+def build() -> List[Dict]:
+    """Rebuilds the posts of FIXTURE_WEEKS from the closed posts stored in the export."""
+    with open(EXPORT_PATH) as f:
+        documents = json.load(f)
+
+    posts = []
+    for document in documents:
+        for year, season, week_id in FIXTURE_WEEKS:
+            for entry in (document.get("reddit_karma") or {}).get(year, {}).get(season) or []:
+                if entry.get("week_id") != week_id or not entry.get("reddit_id"):
+                    continue
+                english = document.get("title_english") or document["title"]
+                posts.append(
+                    {
+                        "id": entry["reddit_id"],
+                        "fullname": f"t3_{entry['reddit_id']}",
+                        "title": f"{document['title']} • {english} - Episode {entry['episode']} discussion",
+                        "selftext": f"*{english}*, episode {entry['episode']}\n\n"
+                        f"[MyAnimeList](https://myanimelist.net/anime/{document['id']})",
+                        "score": entry["karma"],
+                        "num_comments": entry["comments"],
+                        "upvote_ratio": entry.get("upvote_ratio", 1.0),
+                        "url": entry["url"],
+                        "removed_by_category": None,
+                        "hidden": False,
+                    }
+                )
+
+    # Spread the posts evenly over FIXTURE_SPAN, in a stable order
+    posts.sort(key=lambda x: x["id"])
+    now = datetime.now(timezone.utc).timestamp()
+    step = FIXTURE_SPAN.total_seconds() / max(len(posts), 1)
+    for i, post in enumerate(posts):
+        post["created_utc"] = round(now - (i + 1) * step)
+    return posts
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "record":
+        write_fixture(record())
+    elif command == "build":
+        write_fixture(build())
+    else:
+        sys.exit("Usage: python -m examples.reddit_fixture [record|build]")
+
+
+if __name__ == "__main__":
+    main()
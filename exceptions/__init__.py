@@ -6,6 +6,7 @@ from .custom_exceptions import (
     RankProcessingError,
     BackupError,
     MalAPIError,
+    MalRateLimited,
     ConfigurationError,
     DatabaseError,
     PostUnavailable
@@ -17,6 +18,7 @@ __all__ = [
     "RankProcessingError",
     "BackupError",
     "MalAPIError",
+    "MalRateLimited",
     "ConfigurationError",
     "DatabaseError",
     "PostUnavailable"
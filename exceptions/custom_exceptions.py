@@ -39,6 +39,14 @@ class MalAPIError(KarmaTrackError):
         self.status_code = status_code
 
 
+class MalRateLimited(MalAPIError):
+    """Exception raised when MAL keeps answering 429 and the request should be retried later."""
+
+    def __init__(self, message, retry_after: float):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
 class ConfigurationError(KarmaTrackError):
     """Exception raised for configuration-related errors (e.g., missing environment variables)."""
 
@@ -1,9 +1,12 @@
 import json
 import os
 import re
+import threading
+import time
+from concurrent import futures
 from datetime import datetime, timedelta, timezone
 from math import ceil
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 import pandas as pd
 from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
@@ -21,13 +24,27 @@ from pydantic import (
     ValidationError,
     field_validator,
 )
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
 from pytz import utc
 
-from exceptions import PostProcessingError, PostUnavailable
+from database.utils.client import get_client, get_db
+from database.utils.episodes import record_episodes
+from database.utils.indexes import ensure_indexes
+from exceptions import MalRateLimited, PostProcessingError, PostUnavailable
 from util.logger_config import logger
-from util.mal import MalClient
-from util.seasonal_schedule import SeasonScheduler
+from util.mal import DEFERRED_RETRY_POLICY, MalClient
+from util.rate_limit import GovernedRequestor, reddit_governor
+from util.result_cache import bump_data_versions
+from util.seasonal_schedule import (
+    ScheduleIndex,
+    ScheduleWeek,
+    SeasonScheduler,
+    resolve_week,
+    schedule_week,
+)
+from src.rank_processing import changed_seasons, refresh_weekly_rankings
 
 
 class AnimeTitle(BaseModel):
@@ -124,8 +141,45 @@ load_dotenv()
 # Declare a global variable for the scheduler instance
 scheduler_instance: Optional[BackgroundScheduler] = None
 
+# Discussion posts are tracked during their first 48 hours
+ACTIVE_POST_WINDOW = timedelta(hours=48)
+
+# Reddit's /api/info endpoint accepts up to 100 fullnames per request
+REDDIT_INFO_BATCH_SIZE = 100
+
+# Posts whose 48 hours end within the same window are closed by a single job
+CLOSE_BATCH_WINDOW = timedelta(minutes=5)
+
+# Worker threads used to close the posts of a batch concurrently
+CLOSE_WORKERS = 8
+
+# Times a post is rescheduled because MAL rate limited the fetch of its show
+MAL_MAX_DEFERRALS = 5
+
+# Number of submissions requested per listing page
+LISTING_LIMIT = 100
+
+# An empty incremental page behind a high-water mark this old triggers a full listing,
+# in case its anchor submission was deleted
+CURSOR_RECHECK_AGE = timedelta(hours=6)
+
+# How long a snapshot of the bot's submissions is served before it is refreshed
+SNAPSHOT_TTL = timedelta(minutes=int(os.getenv("REDDIT_SNAPSHOT_TTL_MINUTES", 5)))
+
+# Submissions kept in the snapshot. From Friday to Sunday the weekly posts are read for
+# the previous post week, which can start up to 14 days back
+SNAPSHOT_RETENTION = timedelta(
+    days=int(os.getenv("REDDIT_SNAPSHOT_RETENTION_DAYS", 15))
+)
+
+# Collection mirroring the snapshot when REDDIT_SNAPSHOT_PERSIST is set
+SNAPSHOT_COLLECTION = "reddit_snapshot"
+
+# Delay before `update_scheduler` runs again when some posts could not be scheduled
+SCHEDULER_RETRY_DELAY = timedelta(minutes=15)
+
 
-def setup_scheduler(mongo_uri=os.getenv("MONGO_URI"), mongo_database="scheduler"):
+def setup_scheduler(mongo_uri=None, mongo_database="scheduler"):
     """
     Sets up a scheduler with MongoDB as a job store.
 
@@ -133,14 +187,15 @@ def setup_scheduler(mongo_uri=os.getenv("MONGO_URI"), mongo_database="scheduler"
     It also sets up the executors and job defaults for the scheduler.
 
     Args:
-        mongo_uri (str): The MongoDB connection URI
+        mongo_uri (str, optional): The MongoDB connection URI. Defaults to the shared client.
         mongo_database (str): The MongoDB database name
 
     Returns:
         BackgroundScheduler: A scheduler instance configured with MongoDB job store
     """
 
-    client = MongoClient(mongo_uri)
+    client = MongoClient(mongo_uri) if mongo_uri else get_client()
+    ensure_indexes(client.anime)
     jobstores = {"default": MongoDBJobStore(client=client, database=mongo_database)}
     executors = {
         "default": ThreadPoolExecutor(10),
@@ -193,7 +248,8 @@ def setup_reddit_instance(
 
     This function initializes a Reddit API instance with the specified client ID,
     client secret, and user agent. It is used to interact with Reddit through the
-    PRAW library.
+    PRAW library. Its requests share the process-wide `reddit_governor` budget, so the
+    scheduler threads stay within Reddit's per-minute quota together.
 
     Args:
         reddit_id (str): The Reddit client ID
@@ -210,16 +266,36 @@ def setup_reddit_instance(
     """
     # log = setup_logging("reddit")
 
+    # Every request goes through the process-wide Reddit rate limit budget
     reddit = Reddit(
         client_id=reddit_id,
         client_secret=reddit_secret,
         user_agent=reddit_username,
+        requestor_class=GovernedRequestor,
     )
 
     logger.info("Reddit instance initialized")
     return reddit
 
 
+_reddit: Optional[Reddit] = None
+_reddit_lock = threading.Lock()
+
+
+def get_reddit() -> Reddit:
+    """
+    Returns the process-wide Reddit API instance, created on first use.
+
+    Importing this module doesn't authenticate anything, so the Flask app and the
+    freezer only pay for Reddit when a page needs it.
+    """
+    global _reddit
+    with _reddit_lock:
+        if _reddit is None:
+            _reddit = setup_reddit_instance()
+        return _reddit
+
+
 def update_scheduler(reddit: Reddit) -> None:
     """
     Updates the scheduler with new Reddit discussion posts.
@@ -228,6 +304,13 @@ def update_scheduler(reddit: Reddit) -> None:
     48-hour active period. It is called both on startup and via a daily scheduled job to ensure
     all new posts are properly tracked and processed.
 
+    Every post still in its 48 hours window is offered again on each run. The posts come
+    from this process's `SubmissionSnapshot`, whose high-water mark no other process can
+    move, so a post listed by the Flask app or a script first is still scheduled here
+    (`examples/check_snapshot_scheduling.py` checks it). When the run fails or some posts
+    could not be scheduled, a one-off retry of this job is added `SCHEDULER_RETRY_DELAY`
+    from now.
+
     Args:
         reddit (Reddit): An authenticated Reddit API instance for interacting with Reddit.
 
@@ -245,67 +328,133 @@ def update_scheduler(reddit: Reddit) -> None:
     # log = setup_logging("scheduler")
     logger.info("Updating scheduler...")
 
+    # Use the global scheduler_instance here
+    if scheduler_instance is None:
+        raise RuntimeError(
+            "Scheduler instance is not initialized; call setup_scheduler() first"
+        )
+
     try:
         new_posts = fetch_recent_posts(reddit=reddit)
-        # Use the global scheduler_instance here
-        if scheduler_instance is None:
-            raise RuntimeError(
-                "Scheduler instance is not initialized; call setup_scheduler() first"
-            )
-        schedule_post_processing(new_posts, reddit, scheduler_instance)
+        failed = schedule_post_processing(new_posts, reddit, scheduler_instance)
     except Exception as e:
         logger.error(f"Error updating scheduler: {e}", exc_info=True)
+        failed = None
+
+    if failed is None or failed:
+        run_date = datetime.now(timezone.utc) + SCHEDULER_RETRY_DELAY
+        scheduler_instance.add_job(
+            update_scheduler,
+            trigger=DateTrigger(run_date=run_date),
+            args=[reddit],
+            id="update_scheduler_retry",
+            replace_existing=True,
+            name="Retry scheduler update",
+        )
+        logger.warning(f"Scheduler update incomplete, retrying at {run_date}")
 
 
 def schedule_post_processing(
     posts: list[dict], reddit: Reddit, scheduler: BackgroundScheduler
-) -> None:
+) -> List[Dict]:
     """
     Schedule post processing jobs for a list of Reddit discussion posts.
 
     This function takes a list of posts and schedules them for processing after their
-    48-hour active period ends. For each post, it creates a job that will run at the
-    specified closing time to process the final state of the post.
+    48-hour active period ends. Episodes air in clusters, so posts are grouped by the
+    closing window (`CLOSE_BATCH_WINDOW`) they fall into, and a single job per window
+    closes all of its posts with `close_posts_batch` when the window ends.
 
     Args:
         posts (list[dict]): A list of dictionaries containing post details. Each dict should have:
             - "id" (str): The Reddit post ID
             - "closing_at" (datetime): When the post should be processed
-            - "title_en" (str): English title of the anime (used for job name)
+            - "created_utc" (int): When the post was created
+            - "week_id" (int): The identifier for the week
         reddit (Reddit): An authenticated Reddit API instance
         scheduler (BackgroundScheduler): The scheduler instance to add jobs to
 
     Returns:
-        None
+        list[dict]: The posts that could not be scheduled.
 
     Raises:
-        ConflictingIdError: If a job with the same ID already exists
-        Exception: For any other errors during job scheduling
+        Exception: Errors during job scheduling are caught and logged
     """
     # log = setup_logging("scheduler")
 
+    window = int(CLOSE_BATCH_WINDOW.total_seconds())
+    batches: Dict[int, List[Dict]] = {}
+    failed: List[Dict] = []
     for post in posts:
-        trigger = DateTrigger(run_date=post["closing_at"])
-        job_id = f"process_{post['id']}"
-        job_name = post.get("title_en")
-
-        if scheduler.get_job(job_id):
-            logger.warning(f"Job {job_id} already exists, skipping...")
-            continue  # Skip if job already exists
+        if scheduler.get_job(f"process_{post['id']}"):
+            logger.warning(f"Job process_{post['id']} already exists, skipping...")
+            continue  # Skip posts scheduled on their own before batching existed
+        window_start = int(post["closing_at"].timestamp()) // window * window
+        batches.setdefault(window_start, []).append(post)
+
+    for window_start, batch in batches.items():
+        job_id = f"close_batch_{window_start}"
         try:
-            scheduler.add_job(
-                process_post,
-                trigger=trigger,
-                args=[post, reddit],
-                id=job_id,
-                timezone="utc",
-                name=job_name,
-            )
-            logger.success(f"Job scheduled for post: {post['id']}")
+            job = scheduler.get_job(job_id)
+            if job:
+                scheduled_ids = {post["id"] for post in job.args[0]}
+                new_posts = [post for post in batch if post["id"] not in scheduled_ids]
+                if not new_posts:
+                    logger.warning(f"Job {job_id} already has every post, skipping...")
+                    continue
+                batch = job.args[0] + new_posts
+                scheduler.modify_job(
+                    job_id, args=[batch, reddit], name=f"Close {len(batch)} posts"
+                )
+            else:
+                scheduler.add_job(
+                    close_posts_batch,
+                    trigger=DateTrigger(
+                        run_date=datetime.fromtimestamp(window_start + window, tz=utc)
+                    ),
+                    args=[batch, reddit],
+                    id=job_id,
+                    timezone="utc",
+                    name=f"Close {len(batch)} posts",
+                )
+            logger.success(f"Job {job_id} scheduled for {len(batch)} posts")
         except ConflictingIdError:
             logger.warning(f"Conflicting ID error for job: {job_id}")
+            failed.extend(batch)
         except Exception as e:
             logger.error(f"Error scheduling job: {e}", exc_info=True)
+            failed.extend(batch)
+
+    return failed
+
+
+def post_schedule_week(created_utc: float) -> ScheduleWeek:
+    """
+    Returns the episodes week a post was created in.
+
+    A post in a gap of the schedule can't be ranked, so every path that parses or closes
+    posts skips it on this error, see `parse_submission`.
+
+    Raises:
+        PostProcessingError: If no week of the schedule contains the post.
+    """
+    week = resolve_week(datetime.fromtimestamp(created_utc, tz=timezone.utc))
+    if week is None:
+        raise PostProcessingError("Could not infer week_id for post")
+    return week
+
+
+def post_schedule_weeks(created_utcs: List[float]) -> List[Optional[ScheduleWeek]]:
+    """
+    Returns the episodes week of many posts at once, with `SeasonScheduler.resolve_many`.
+
+    Posts outside of every week of the schedule get None.
+    """
+    resolved = SeasonScheduler().resolve_many(created_utcs)
+    return [
+        schedule_week(int(year), int(season), int(week_id)) if week_id else None
+        for year, season, week_id in zip(*resolved)
+    ]
 
 
 def process_post(post: Dict, reddit: Reddit) -> None:
@@ -339,10 +488,8 @@ def process_post(post: Dict, reddit: Reddit) -> None:
 
         try:
             post_validation = RedditPostDetails(**post_details)
-            schedule = SeasonScheduler(
-                post_time=datetime.fromtimestamp(post["created_utc"], tz=timezone.utc)
-            )
-            insert_mongo(post_validation.model_dump(), schedule=schedule)
+            schedule = post_schedule_week(post["created_utc"])
+            insert_mongo(post_validation.model_dump(), schedule=schedule, defer_mal=True)
 
         except ValidationError as e:
             logger.error(f"Validation error for post {post['id']}: {e}")
@@ -354,12 +501,82 @@ def process_post(post: Dict, reddit: Reddit) -> None:
         logger.error(f"Error processing post {post['id']}: {e}")
 
 
+def close_posts_batch(posts: List[Dict], reddit: Reddit) -> None:
+    """
+    Close a burst of Reddit posts and store all of their details in MongoDB at once.
+
+    The final state of every post is fetched through batched `reddit.info` lookups, the
+    posts are then closed concurrently on a bounded pool of `CLOSE_WORKERS` threads
+    (database lookups and MAL fetches for unknown shows), and every result is committed
+    with `insert_mongo_many`. The end-to-end latency of the batch is logged.
+
+    Args:
+        posts (list[dict]): Posts as scheduled by `schedule_post_processing`, each with the keys
+            "id", "week_id" and "created_utc"
+        reddit (Reddit): An authenticated instance of the Reddit API client
+
+    Returns:
+        None
+    """
+    started = time.perf_counter()
+    col = get_db().seasonals
+
+    submissions = {
+        submission.id: submission
+        for submission in fetch_submissions_by_id(reddit, [post["id"] for post in posts])
+    }
+    weeks = dict(
+        zip(
+            (post["id"] for post in posts),
+            post_schedule_weeks([post["created_utc"] for post in posts]),
+        )
+    )
+
+    def close(post: Dict) -> Tuple[Dict, ScheduleWeek]:
+        submission = submissions.get(post["id"])
+        if submission is None:
+            raise PostUnavailable
+        post_details = submission_final_state(
+            submission, post_id=post["id"], week_id=post["week_id"], col=col
+        )
+        week = weeks[post["id"]]
+        if week is None:
+            raise PostProcessingError("Could not infer week_id for post")
+        post_validation = RedditPostDetails(**post_details)
+        return post_validation.model_dump(), week
+
+    closed = []
+    with futures.ThreadPoolExecutor(max_workers=CLOSE_WORKERS) as pool:
+        pending = {pool.submit(close, post): post for post in posts}
+        for future in futures.as_completed(pending):
+            post = pending[future]
+            try:
+                closed.append(future.result())
+            except PostUnavailable:
+                logger.error(f"Post {post['id']} is unavailable")
+            except ValidationError as e:
+                logger.error(f"Validation error for post {post['id']}: {e}")
+            except PostProcessingError as e:
+                logger.error(f"Post processing error for post {post['id']}: {e}")
+            except Exception as e:
+                logger.error(f"Error processing post {post['id']}: {e}")
+
+    try:
+        insert_mongo_many(closed, defer_mal=True)
+    except PyMongoError as e:
+        logger.error(f"Error storing the closed posts: {e}")
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Closed {len(closed)} of {len(posts)} posts in {elapsed:.2f}s")
+    logger.debug(f"Reddit rate limit: {reddit_governor.metrics()}")
+
+
 def fetch_recent_posts(reddit: Reddit, username="AutoLovepon") -> List[Dict]:
     """
     Retrieves recent Reddit posts submitted by AutoLovepon (The r/anime bot) within the last 48 hours.
 
-    This function fetches the latest submissions from the user and filters them to include only those
-    created within the past 48 hours. For each relevant submission, it compiles essential details such as the post ID,
+    This function reads the user's submissions from the shared snapshot (see `SubmissionSnapshot`)
+    and filters them to include only those created within the past 48 hours. For each relevant submission, it compiles essential details such as the post ID,
     title, creation time, scheduled closing time, associated week ID, and season. The collected posts are returned
     as a list of dictionaries for further processing.
 
@@ -391,26 +608,23 @@ def fetch_recent_posts(reddit: Reddit, username="AutoLovepon") -> List[Dict]:
         "Another Anime Discussion Topic" 2024-04-28 12:45:00+00:00
     """
 
-    user: Redditor = reddit.redditor(username)
     posts = []
     two_days_ago: datetime = datetime.now(timezone.utc) - timedelta(hours=48)
-    submissions: List[Submission] = user.submissions.new(limit=100)
-    for submission in submissions:
+    for record in get_submission_snapshot(username).get(reddit):
         created_time: datetime = datetime.fromtimestamp(
-            submission.created_utc, tz=timezone.utc
+            record["created_utc"], tz=timezone.utc
         )
         if created_time > two_days_ago:
-            season_scheduler = SeasonScheduler(post_time=created_time)
             trigger_time = created_time + timedelta(hours=48)
-            logger.debug(f"Trigger set for post: {submission.url} at {trigger_time}")
+            logger.debug(f"Trigger set for post: {record['url']} at {trigger_time}")
             posts.append(
                 {
-                    "id": submission.id,
-                    "title": submission.title,
-                    "created_utc": int(submission.created_utc),
+                    "id": record["id"],
+                    "title": record["title"],
+                    "created_utc": int(record["created_utc"]),
                     "closing_at": trigger_time,
-                    "week_id": season_scheduler.week_id,
-                    "season": season_scheduler.season_name,
+                    "week_id": record["week_id"],
+                    "season": record["season"],
                 }
             )
     if posts:
@@ -495,6 +709,26 @@ def close_post(post_id, reddit: Reddit, week_id: int) -> Dict:
         No explicit exceptions, but logs any errors encountered during processing
     """
     post = Submission(reddit=reddit, id=post_id)
+    return submission_final_state(
+        post, post_id=post_id, week_id=week_id, col=get_db().seasonals
+    )
+
+
+def submission_final_state(
+    post: Submission, post_id: str, week_id: int, col: Collection
+) -> Dict:
+    """
+    Extracts the final state of a closed discussion post, see `close_post`.
+
+    Args:
+        post (Submission): The PRAW Submission object of the post, already fetched or lazy
+        post_id (str): The Reddit post ID
+        week_id (int): The week number for seasonal tracking purposes
+        col (Collection): The `seasonals` collection
+
+    Returns:
+        dict: The post's final state and metadata.
+    """
     try:
         post_available = check_post_status(post, post_id)
     except PostUnavailable:
@@ -506,25 +740,10 @@ def close_post(post_id, reddit: Reddit, week_id: int) -> Dict:
     )  # Try to get the MAL id from the body of the post
     title_details, episode = get_title_details(post.title)
     if not week_id:
-        inferred_week_id = SeasonScheduler(
-            post_time=datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-        ).week_id
-        if inferred_week_id is None:
-            raise PostProcessingError("Could not infer week_id for post")
-        week_id = inferred_week_id
-    client = MongoClient(os.getenv("MONGO_URI"))
-    db = client.anime
-    col = db.seasonals
-
-    romaji = title_details.get("romaji")
-    english = title_details.get("english")
+        week_id = post_schedule_week(post.created_utc).week_id
 
     # If no MAL ID is found, try to the entry from the title
-    query = (
-        {"id": mal_id}
-        if mal_id
-        else {"$or": [{"title": romaji}, {"title_english": english}]}
-    )
+    query = show_query(mal_id, title_details)
     logger.debug(f"Looking for entry on the db with: {json.dumps(query, indent=2)}")
     mal_doc = col.find_one(query, {"id": 1})  # Check if the show exists on the db
 
@@ -534,7 +753,8 @@ def close_post(post_id, reddit: Reddit, week_id: int) -> Dict:
             f"Post {post_id} has a MAL ID but no document found in the database. Fetching it and pushing it to the db..."
         )
         try:
-            mal = MalClient()
+            # Don't wait on a rate limit here, insert_mongo fetches the show again
+            mal = MalClient(retry_policy=DEFERRED_RETRY_POLICY)
             entry = mal.fetch_entry_by_id(int(mal_id))
             if entry:
                 mal.push_to_db(entry)
@@ -563,18 +783,38 @@ def close_post(post_id, reddit: Reddit, week_id: int) -> Dict:
     return post_details
 
 
+def show_query(mal_id: Optional[int], title_details: Dict) -> Dict:
+    """
+    Returns the `seasonals` filter of a post's show: its MAL ID, or its titles when the
+    post has no MAL link.
+    """
+    if mal_id:
+        return {"id": mal_id}
+    return {
+        "$or": [
+            {"title": title_details.get("romaji")},
+            {"title_english": title_details.get("english")},
+        ]
+    }
+
+
 def insert_mongo(
     post_details: dict,
-    client: MongoClient = MongoClient(os.getenv("MONGO_URI")),
-    schedule: Optional[SeasonScheduler] = None,
-) -> None:
+    client: Optional[MongoClient] = None,
+    schedule: Optional[Union[SeasonScheduler, ScheduleWeek]] = None,
+    refresh_rankings: bool = True,
+    defer_mal: bool = False,
+    deferrals: int = 0,
+) -> bool:
     """
     Inserts post details into the MongoDB database.
 
     This function processes the provided post details and inserts them into the appropriate MongoDB collections.
     If a document with the specified MAL ID exists in the season collection, it appends the new karma data
-    to the existing `reddit_karma` array. If the MAL ID does not exist, it creates a new document in the
-    `new_entries` collection.
+    to its `reddit_karma.<year>.<season>` array in a single update (see `reddit_karma_update`), which is a
+    no-op when the Reddit post was already recorded, and records the post in the `episodes` collection
+    and the `season_stats` aggregates (see `record_episodes`).
+    If the MAL ID does not exist, it creates a new document in the `new_entries` collection.
 
     Args:
         post_details (dict): A dictionary containing the details of the Reddit post. Expected keys include:
@@ -589,18 +829,26 @@ def insert_mongo(
             - "mal_id" (int or None): The MyAnimeList ID associated with the post.
 
         client (MongoClient, optional): An instance of MongoClient for connecting to MongoDB.
-                                         Defaults to a new client using the `MONGO_URI` environment variable.
+                                         Defaults to the shared client from `database.utils.client`.
+        refresh_rankings (bool, optional): Whether to refresh the materialized ranking of the
+                                           post's week (see `refresh_weekly_rankings`). Defaults to True.
+        defer_mal (bool, optional): Set from scheduler jobs. When MAL rate limits the fetch of a
+                                    missing show, the insert is rescheduled (see `defer_insert_mongo`)
+                                    instead of sleeping in the job's thread. Defaults to False.
+        deferrals (int, optional): Number of times the insert was already rescheduled.
 
     Raises:
         KeyError: If essential keys are missing from `post_details`.
         Exception: For any unexpected errors during database operations.
 
     Returns:
-        None
+        bool: True if the post was recorded on its show in the `seasonals` collection.
     """
 
     if schedule is None:
         schedule = SeasonScheduler()
+    if client is None:
+        client = get_client()
 
     # Get the database and collection
     db = client.anime
@@ -610,70 +858,36 @@ def insert_mongo(
     mal_id = post_details.get("mal_id") or post_details.get("id")
     reddit_id = post_details.get("post_id")
 
-    episode_data = {
-        "week_id": post_details["week_id"],
-        "episode": post_details["episode"],
-        "karma": post_details["karma"],
-        "comments": post_details["comments"],
-        "upvote_ratio": post_details["upvote_ratio"],
-        "reddit_id": reddit_id,
-        "url": post_details["url"],
-    }
+    episode_data = _episode_data(post_details)
     logger.info(
         f"Inserting data into MongoDB for MAL ID: {json.dumps(mal_id, indent=2)}"
     )
     query = {"id": mal_id}
-    show = col.find_one(query)
-
-    if show:
-        year_str = str(schedule.year)
-        season_name = schedule.season_name
+    karma_update = reddit_karma_update(schedule.year, schedule.season_name, episode_data)
 
-        # Handle the reddit_karma structure properly to support multiple years and seasons
+    # A single round trip creates the season array if needed and appends the post
+    show_found = False
+    if mal_id:
         try:
-            # Ensure reddit_karma exists and is a document (not null or other type)
-            rk_value = (show or {}).get("reddit_karma", None)
-            if not isinstance(rk_value, dict):
-                # Initialize reddit_karma as an empty document if missing or null
-                col.update_one(query, {"$set": {"reddit_karma": {}}})
-                show = col.find_one(query)  # Refresh the data
-
-            # Check if the year exists in reddit_karma
-            reddit_karma = (show or {}).get("reddit_karma", {})
-            if year_str not in reddit_karma:
-                # Initialize the year as an empty object if it doesn't exist
-                col.update_one(query, {"$set": {f"reddit_karma.{year_str}": {}}})
-                show = col.find_one(query)  # Refresh the data
-
-            # Check if the season exists in the year
-            year_data = ((show or {}).get("reddit_karma", {}) or {}).get(year_str) or {}
-            if season_name not in year_data:
-                # Initialize the season as an empty array if it doesn't exist
-                col.update_one(
-                    query,
-                    {"$set": {f"reddit_karma.{year_str}.{season_name}": []}},
+            update_result = col.update_one(query, karma_update)
+            show_found = update_result.matched_count > 0
+            if show_found:
+                logger.info(
+                    f"Updated {update_result.modified_count} documents with {mal_id}"
                 )
-
-            # Now push the episode data to the season array
-            update_path = f"reddit_karma.{year_str}.{season_name}"
-            update_result = col.update_one(
-                query, {"$push": {update_path: episode_data}}
-            )
-
-            logger.info(
-                f"Updated {update_result.modified_count} documents with {mal_id} | {(show or {}).get('title_english')}"
-            )
-        except Exception as e:
+        except PyMongoError as e:
             logger.error(
                 f"Error updating document with MAL ID {mal_id} and from the post {reddit_id}: {e}"
             )
-    else:
+            return False
+
+    if not show_found:
         if mal_id:
             logger.warning(
                 f"Document with MAL ID {mal_id} not found. Trying to fetch from MAL api and create a new entry..."
             )
             try:
-                mal = MalClient()
+                mal = MalClient(retry_policy=DEFERRED_RETRY_POLICY if defer_mal else None)
                 entry = mal.fetch_entry_by_id(mal_id)
                 if entry:
                     mal.push_to_db(entry)
@@ -682,20 +896,17 @@ def insert_mongo(
                     )
 
                     # After creating the entry, add the karma data with the proper structure
-                    show = col.find_one(query)
-                    if show:
-                        year_str = str(schedule.year)
-                        season_name = schedule.season_name
-
-                        # Properly initialize the nested structure
-                        reddit_karma = {}
-                        reddit_karma[year_str] = {}
-                        reddit_karma[year_str][season_name] = [episode_data]
-
-                        col.update_one(query, {"$set": {"reddit_karma": reddit_karma}})
+                    update_result = col.update_one(query, karma_update)
+                    if update_result.matched_count:
+                        show_found = True
                         logger.info(
                             f"Added karma data to newly created entry for MAL ID {mal_id}"
                         )
+            except MalRateLimited as e:
+                if defer_mal:
+                    defer_insert_mongo(post_details, schedule, e.retry_after, deferrals)
+                else:
+                    logger.error(f"MAL rate limited the fetch of {mal_id} for the post {reddit_id}")
             except Exception as e:
                 logger.error(
                     f"Error fetching MAL entry for post id {mal_id} and from the post {reddit_id}: {e}"
@@ -711,6 +922,186 @@ def insert_mongo(
                 f"Created new document: for the post {reddit_id} MAL ID: {mal_id} with the ID: {insert_result.inserted_id}"
             )
 
+    if show_found:
+        record_episodes(
+            [(schedule.year, schedule.season_name, mal_id, episode_data)], db=db
+        )
+
+    if show_found and refresh_rankings:
+        week = (schedule.year, schedule.season_name, post_details["week_id"])
+        refresh_weekly_rankings([week])
+        bump_data_versions(changed_seasons([week]))
+
+    return show_found
+
+
+def defer_insert_mongo(
+    post_details: Dict,
+    schedule: Union[SeasonScheduler, ScheduleWeek],
+    delay: float,
+    deferrals: int,
+) -> bool:
+    """
+    Reschedules `insert_mongo` for a post whose show couldn't be fetched from MAL.
+
+    The retry runs as a one-off job `delay` seconds from now, at most `MAL_MAX_DEFERRALS`
+    times per post.
+
+    Returns:
+        bool: True if the retry was scheduled.
+    """
+    reddit_id = post_details.get("post_id")
+    if scheduler_instance is None or deferrals >= MAL_MAX_DEFERRALS:
+        logger.error(f"Giving up on the post {reddit_id} after {deferrals} MAL rate limits")
+        return False
+
+    run_date = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    scheduler_instance.add_job(
+        retry_insert_mongo,
+        trigger=DateTrigger(run_date=run_date),
+        args=[post_details, schedule.post_time, deferrals + 1],
+        id=f"retry_insert_{reddit_id}",
+        replace_existing=True,
+        name=f"Retry insert of {reddit_id}",
+    )
+    logger.warning(f"MAL rate limited, retrying the post {reddit_id} in {delay:.0f}s")
+    return True
+
+
+def retry_insert_mongo(post_details: Dict, post_time: datetime, deferrals: int) -> None:
+    """Scheduler job retrying `insert_mongo` after a MAL rate limit, see `defer_insert_mongo`."""
+    insert_mongo(
+        post_details,
+        schedule=resolve_week(post_time),
+        defer_mal=True,
+        deferrals=deferrals,
+    )
+
+
+def insert_mongo_many(
+    closed_posts: List[Tuple[Dict, ScheduleWeek]],
+    client: Optional[MongoClient] = None,
+    defer_mal: bool = False,
+) -> None:
+    """
+    Inserts the details of several closed posts into MongoDB with a single bulk write.
+
+    Posts whose show already exists in the `seasonals` collection are appended to its
+    `reddit_karma.<year>.<season>` array in one unordered `bulk_write`, and recorded in the
+    `episodes` collection and the `season_stats` aggregates with `record_episodes`. Every other post
+    goes through `insert_mongo`, which fetches the missing show from MAL or stores the
+    post in `new_entries`. The materialized ranking of every week that received a post is
+    refreshed once at the end, and the data versions of their seasons are bumped.
+
+    Args:
+        closed_posts (list[tuple[dict, ScheduleWeek]]): Pairs of post details, as described
+            in `insert_mongo`, and the schedule the post belongs to
+        client (MongoClient, optional): MongoDB client. Defaults to the shared client.
+        defer_mal (bool, optional): Passed to `insert_mongo`. Defaults to False.
+    """
+    if not closed_posts:
+        return
+    if client is None:
+        client = get_client()
+    col = client.anime.seasonals
+
+    mal_ids = [post_details.get("mal_id") for post_details, _ in closed_posts]
+    known_ids = set(col.distinct("id", {"id": {"$in": [i for i in mal_ids if i]}}))
+
+    operations = []
+    episodes = []
+    changed_weeks = set()
+    for post_details, schedule in closed_posts:
+        mal_id = post_details.get("mal_id")
+        week = (schedule.year, schedule.season_name, post_details["week_id"])
+        if mal_id not in known_ids:
+            if insert_mongo(
+                post_details,
+                client=client,
+                schedule=schedule,
+                refresh_rankings=False,
+                defer_mal=defer_mal,
+            ):
+                changed_weeks.add(week)
+            continue
+
+        changed_weeks.add(week)
+        episode_data = _episode_data(post_details)
+        operations.append(
+            UpdateOne(
+                {"id": mal_id},
+                reddit_karma_update(schedule.year, schedule.season_name, episode_data),
+            )
+        )
+        episodes.append((schedule.year, schedule.season_name, mal_id, episode_data))
+
+    if operations:
+        result = col.bulk_write(operations, ordered=False)
+        logger.info(
+            f"Updated {result.modified_count} documents with {len(operations)} closed posts"
+        )
+        record_episodes(episodes, db=client.anime)
+
+    refresh_weekly_rankings(changed_weeks)
+    bump_data_versions(changed_seasons(changed_weeks))
+
+
+def reddit_karma_update(year: int, season: str, episode_data: Dict) -> List[Dict]:
+    """
+    Builds the update pipeline that records a closed post on its show document.
+
+    The pipeline turns a missing or null `reddit_karma` and `reddit_karma.<year>` into
+    documents, creates the `reddit_karma.<year>.<season>` array on demand and appends the
+    episode data to it, all in one update. The post is only appended if no entry with the
+    same `reddit_id` exists, so retried jobs don't push duplicates.
+
+    Args:
+        year (int): Year of the season
+        season (str): Season name (winter, spring, summer, fall)
+        episode_data (dict): The entry to append, see `_episode_data`
+
+    Returns:
+        list[dict]: An aggregation pipeline to use as the update of `update_one`.
+    """
+    year = str(year)
+    season_path = f"reddit_karma.{year}.{season}"
+
+    def as_document(path: str) -> Dict:
+        return {"$cond": [{"$eq": [{"$type": f"${path}"}, "object"]}, f"${path}", {}]}
+
+    return [
+        {"$set": {"reddit_karma": as_document("reddit_karma")}},
+        {"$set": {f"reddit_karma.{year}": as_document(f"reddit_karma.{year}")}},
+        {
+            "$set": {
+                season_path: {
+                    "$let": {
+                        "vars": {"posts": {"$ifNull": [f"${season_path}", []]}},
+                        "in": {
+                            "$cond": [
+                                {"$in": [episode_data["reddit_id"], "$$posts.reddit_id"]},
+                                "$$posts",
+                                {"$concatArrays": ["$$posts", [{"$literal": episode_data}]]},
+                            ]
+                        },
+                    }
+                }
+            }
+        },
+    ]
+
+
+def _episode_data(post_details: Dict) -> Dict:
+    return {
+        "week_id": post_details["week_id"],
+        "episode": post_details["episode"],
+        "karma": post_details["karma"],
+        "comments": post_details["comments"],
+        "upvote_ratio": post_details["upvote_ratio"],
+        "reddit_id": post_details.get("post_id"),
+        "url": post_details["url"],
+    }
+
 
 def get_title_details(title: str) -> Tuple[Dict, str]:
     """
@@ -787,7 +1178,7 @@ def get_title_details(title: str) -> Tuple[Dict, str]:
 
 
 def get_active_posts(
-    reddit: Reddit = setup_reddit_instance(),
+    reddit: Optional[Reddit] = None,
     username="AutoLovepon",
     default_tz: timezone = timezone.utc,
 ) -> List:
@@ -799,7 +1190,7 @@ def get_active_posts(
     which we use to gauge the post's performance in terms of karma.
 
     Parameters:
-        reddit (Reddit): An authenticated Reddit API instance, defaulting to the one provided by setup_reddit_instance().
+        reddit (Reddit, optional): An authenticated Reddit API instance, defaulting to the shared one from get_reddit().
         username (str): The Reddit username whose posts are to be fetched. Defaults to "AutoLovepon".
         default_tz (timezone): The timezone to be used for datetime calculations. Defaults to UTC.
 
@@ -814,183 +1205,556 @@ def get_active_posts(
         ensuring only those posts in the active discussion period are returned.
     """
     # log = setup_logging("hourly_data")
+    if reddit is None:
+        reddit = get_reddit()
 
-    user = reddit.redditor(username)
-    client = MongoClient(os.getenv("MONGO_URI"))
-    db = client.anime
+    db = get_db()
     seasonals = db.seasonals
     hourly_data = db.karma_watch
     posts = []
+    samples = []
     current_time = datetime.now(tz=default_tz)
-    two_days_ago = current_time - timedelta(hours=48)
     schedule = SeasonScheduler()
 
-    # Get the submissions from AutoLovePon
-    for submission in user.submissions.new(limit=50):
-        # The time the submission was created should be in datetime format
-        created_time = datetime.fromtimestamp(submission.created_utc, tz=default_tz)
+    # Keep the live posts that are linked to a MAL entry
+    tracked = []
+    live_cutoff = (current_time - ACTIVE_POST_WINDOW).timestamp()
+    for record in get_submission_snapshot(username).get(reddit, now=current_time):
+        if record["created_utc"] <= live_cutoff:
+            continue
+        if not record["mal_id"]:
+            logger.warning(f"Post {record['id']} has no MAL ID. Skipping...")
+            continue
+        tracked.append(record)
+
+    # Fetch the series details of every tracked post in a single query
+    show_projection = {
+        "_id": 0,
+        "id": 1,
+        "title": 1,
+        "streams": 1,
+        "title_english": 1,
+        "mal_id": "$id",
+        "images": 1,
+        "broadcast": 1,
+    }
+    mal_ids = list({record["mal_id"] for record in tracked})
+    shows = {
+        show.pop("id"): show
+        for show in seasonals.find({"id": {"$in": mal_ids}}, show_projection)
+    }
 
-        # Check if the submission was created within the last 48 hours
-        if created_time > two_days_ago:
-            trigger_time = created_time + timedelta(hours=48)
-            time_left = trigger_time - current_time
-            hours_since_post = current_time - created_time
+    for record in tracked:
+        mal_id, post_id, episode = record["mal_id"], record["id"], record["episode"]
+        show = shows.get(mal_id)
+
+        # If there is a valid mal_id but no document found, try to fetch the entry from MAL and push it to the db
+        if not show:
+            logger.warning(
+                f"Post {post_id} has a MAL ID but no document found in the database."
+            )
+            try:
+                mal = MalClient()
+                entry = mal.fetch_entry_by_id(mal_id)
+                if entry:
+                    mal.push_to_db(entry)
+                    logger.success(
+                        f"Fetched and pushed entry from the post {post_id} with the MAL ID {mal_id} to the database."
+                    )
+            except Exception as e:
+                logger.error(
+                    f"Error fetching MAL entry for post id {mal_id} and from the post {post_id}: {e}"
+                )
+            continue
+
+        created_time = datetime.fromtimestamp(record["created_utc"], tz=default_tz)
+        time_left = created_time + ACTIVE_POST_WINDOW - current_time
+        hours_since_post = current_time - created_time
+
+        post_details = dict(show)
+        post_details["reddit_url"] = record["url"]
+        post_details["karma"] = record["karma"]
+        post_details["comments"] = record["comments"]
+        post_details["episode"] = episode
+        # Time left in hours
+        post_details["time_left"] = time_left.total_seconds() / 3600
+        posts.append(post_details)
+
+        samples.append(
+            {
+                "mal_id": mal_id,
+                "reddit_id": post_id,
+                # Round the hour since post to nearest hour
+                "hour": round(hours_since_post.total_seconds() / 3600, 0),
+                "karma": record["karma"],
+                "title": show.get("title"),
+                "title_english": show.get("title_english"),
+                "episode": episode,
+            }
+        )
 
-            # Try to get a valid mal_id from the post body
-            mal_id = get_mal_id_reddit_post(submission.selftext)
-            if not mal_id:
-                logger.warning(f"Post {submission.id} has no MAL ID. Skipping...")
-                continue
+    posts.sort(key=lambda x: x["karma"], reverse=True)
+    record_hourly_karma(hourly_data, samples, schedule, current_time)
 
-            # Try to get the number of the episode from the title
-            _, episode = get_title_details(submission.title)
+    return posts
 
-            # If there is a mal_id, try to get the series details from the db
 
-            try:
-                mal_id = int(mal_id)
-                show = None
-                show = seasonals.find_one(
-                    {"id": mal_id},
-                    {
-                        "_id": 0,
-                        "title": 1,
-                        "streams": 1,
-                        "title_english": 1,
-                        "mal_id": "$id",
-                        "images": 1,
-                        "broadcast": 1,
-                    },
-                )
+class SubmissionSnapshot:
+    """
+    Parsed, TTL-bounded snapshot of the submissions made by a Reddit user.
+
+    Every Reddit reader in this module is served from the snapshot, so the number of API
+    calls does not grow with the number of consumers. A refresh pages only the submissions
+    made after the newest one this snapshot has listed (`newest`, see
+    `fetch_new_submissions`), parses their title, episode and MAL ID once, and updates the
+    score of every post still in its 48 hours window through batched `reddit.info`
+    lookups. Each record keeps the time its score was read (`stats_at`), so `window` can
+    refresh a closed post whose score was read before it closed.
+
+    The snapshot lives in process memory and, when `persist` is set, is mirrored to the
+    `reddit_snapshot` collection so a restarted process does not need a full listing: its
+    high-water mark is then the newest persisted record. The mark is never shared through
+    a separate document, so a process listing Reddit can't move it past posts another
+    process has not seen yet.
+    """
 
-                # If there is a valid mal_id but no document found, try to fetch the entry from MAL and push it to the db
-                if not show:
-                    logger.warning(
-                        f"Post {submission.id} has a MAL ID but no document found in the database."
-                    )
+    def __init__(
+        self,
+        username: str = "AutoLovepon",
+        ttl: timedelta = SNAPSHOT_TTL,
+        retention: timedelta = SNAPSHOT_RETENTION,
+        persist: bool = bool(os.getenv("REDDIT_SNAPSHOT_PERSIST")),
+    ):
+        self.username = username
+        self.ttl = ttl
+        self.retention = retention
+        self.persist = persist
+        self.records: Dict[str, Dict] = {}
+        # Fullname and creation time of the newest submission listed into the snapshot
+        self.newest: Optional[Dict] = None
+        self.refreshed_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def get(self, reddit: Reddit, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Returns the parsed submissions, newest first, refreshing them if the TTL expired.
+
+        Args:
+            reddit (Reddit): An authenticated Reddit API instance
+            now (datetime, optional): Reference time. Defaults to the current UTC time.
+
+        Returns:
+            list[dict]: Copies of the snapshot records, see `parse_submission`.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        with self._lock:
+            if self.refreshed_at is None or now - self.refreshed_at >= self.ttl:
+                self._refresh(reddit, now)
+            records = [dict(record) for record in self.records.values()]
+
+        return sorted(records, key=lambda x: x["created_utc"], reverse=True)
+
+    def window(
+        self,
+        reddit: Reddit,
+        start: datetime,
+        end: datetime,
+        now: Optional[datetime] = None,
+    ) -> List[Dict]:
+        """
+        Returns the parsed submissions created between `start` and `end`, newest first.
+
+        Closed posts whose score was read while they were still live are refreshed once
+        through batched `reddit.info` lookups, so they report their final state. A window
+        that starts before the retention period is listed from Reddit instead.
+
+        Args:
+            reddit (Reddit): An authenticated Reddit API instance
+            start (datetime): Start of the window, inclusive
+            end (datetime): End of the window, inclusive
+            now (datetime, optional): Reference time. Defaults to the current UTC time.
+
+        Returns:
+            list[dict]: Copies of the records in the window, see `parse_submission`.
+        """
+        if now is None:
+            now = datetime.now(timezone.utc)
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+
+        if start < now - self.retention:
+            logger.warning(f"Posts since {start} are not in the snapshot, listing them")
+            records = []
+            user: Redditor = reddit.redditor(self.username)
+            for submission in user.submissions.new(limit=None):
+                if submission.created_utc < start_ts:
+                    break
+                if submission.created_utc <= end_ts:
                     try:
-                        mal = MalClient()
-                        entry = mal.fetch_entry_by_id(mal_id)
-                        if entry:
-                            mal.push_to_db(entry)
-                            logger.success(
-                                f"Fetched and pushed entry from the post {submission.id} with the MAL ID {mal_id} to the database."
-                            )
-                            show = seasonals.find_one(
-                                {"id": mal_id},
-                                {
-                                    "_id": 0,
-                                    "title": 1,
-                                    "streams": 1,
-                                    "title_english": 1,
-                                    "mal_id": "$id",
-                                    "images": 1,
-                                    "broadcast": 1,
-                                },
-                            )
-                    except Exception as e:
-                        logger.error(
-                            f"Error fetching MAL entry for post id {mal_id} and from the post {submission.id}: {e}"
-                        )
+                        record = parse_submission(submission)
+                    except PostProcessingError as e:
+                        logger.warning(f"Skipping post {submission.id}: {e}")
                         continue
-                else:
-                    post_details = dict(show)
-                    post_details["reddit_url"] = submission.url
-                    post_details["karma"] = submission.score
-                    post_details["comments"] = submission.num_comments
-                    post_details["episode"] = episode
-                    # Time left in hours
-                    post_details["time_left"] = time_left.total_seconds() / 3600
-
-                    posts.append(post_details)
-                    posts.sort(key=lambda x: x["karma"], reverse=True)
-
-                    # Round the hour since post to nearest hour
-                    hour = round(hours_since_post.total_seconds() / 3600, 0)
-                    karma = submission.score
-
-                    # Check if document for this mal_id and reddit_id exists
-                    existing_doc = hourly_data.find_one(
-                        {"mal_id": mal_id, "reddit_id": submission.id}
+                    record["stats_at"] = now.timestamp()
+                    records.append(record)
+            return records
+
+        def in_window(record: Dict) -> bool:
+            return start_ts <= record["created_utc"] <= end_ts
+
+        records = [record for record in self.get(reddit, now=now) if in_window(record)]
+
+        closing_age = ACTIVE_POST_WINDOW.total_seconds()
+        stale_ids = [
+            record["id"]
+            for record in records
+            if record["created_utc"] + closing_age <= now.timestamp()
+            and record.get("stats_at", 0) < record["created_utc"] + closing_age
+        ]
+        if not stale_ids:
+            return records
+
+        with self._lock:
+            changed = {}
+            for submission in fetch_submissions_by_id(reddit, stale_ids):
+                if submission.id in self.records:
+                    record = dict(self.records[submission.id])
+                    record.update(_submission_stats(submission))
+                    changed[submission.id] = record
+            self._store(changed, now)
+            records = [
+                dict(record) for record in self.records.values() if in_window(record)
+            ]
+        logger.debug(f"Refreshed the final state of {len(changed)} closed posts")
+
+        return sorted(records, key=lambda x: x["created_utc"], reverse=True)
+
+    def _store(self, changed: Dict[str, Dict], now: datetime) -> None:
+        """Stores changed records, stamped with the time their score was read."""
+        for record in changed.values():
+            record["stats_at"] = now.timestamp()
+        self.records.update(changed)
+
+        if self.persist and changed:
+            get_client().anime[SNAPSHOT_COLLECTION].bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": post_id},
+                        {"$set": {**record, "username": self.username}},
+                        upsert=True,
                     )
+                    for post_id, record in changed.items()
+                ],
+                ordered=False,
+            )
 
-                    if existing_doc:
-                        # Document exists, check if this hour already exists in hourly_karma
-                        hour_exists = any(
-                            entry.get("hour") == hour
-                            for entry in existing_doc.get("hourly_karma", [])
-                        )
+    def _advance(self, listed: Iterable[Dict]) -> None:
+        """Moves `newest` forward to the newest of the listed submissions."""
+        for submission in listed:
+            if self.newest is None or submission["created_utc"] > self.newest["created_utc"]:
+                self.newest = {
+                    "fullname": submission["fullname"],
+                    "created_utc": submission["created_utc"],
+                }
 
-                        if hour_exists:
-                            # Hour exists, update the karma value for this hour
-                            hourly_data.update_one(
-                                {
-                                    "mal_id": mal_id,
-                                    "reddit_id": submission.id,
-                                    "hourly_karma.hour": hour,
-                                },
-                                {
-                                    "$set": {
-                                        "updated_at": current_time.strftime(
-                                            "%Y-%m-%d %H:%M:%S"
-                                        ),
-                                        "hourly_karma.$.karma": karma,
-                                    }
-                                },
-                            )
+    def _refresh(self, reddit: Reddit, now: datetime) -> None:
+        client = get_client()
+        snapshot = client.anime[SNAPSHOT_COLLECTION]
+        retention_cutoff = (now - self.retention).timestamp()
+
+        if not self.records and self.persist:
+            for record in snapshot.find(
+                snapshot_query(self.username, retention_cutoff),
+                {"_id": 0, "username": 0},
+            ):
+                self.records[record["id"]] = record
+            self._advance(self.records.values())
+
+        # Without any known submission, list everything once to seed the snapshot
+        if self.newest:
+            submissions = fetch_new_submissions(
+                reddit, username=self.username, after=self.newest
+            )
+        else:
+            user: Redditor = reddit.redditor(self.username)
+            submissions = list(user.submissions.new(limit=LISTING_LIMIT))
+
+        changed = {}
+        for submission in submissions:
+            if submission.created_utc > retention_cutoff:
+                try:
+                    changed[submission.id] = parse_submission(submission)
+                except PostProcessingError as e:
+                    logger.warning(f"Skipping post {submission.id}: {e}")
+
+        # Refresh the score of every live post the listing did not return
+        live_cutoff = (now - ACTIVE_POST_WINDOW).timestamp()
+        stale_ids = [
+            post_id
+            for post_id, record in self.records.items()
+            if record["created_utc"] > live_cutoff and post_id not in changed
+        ]
+        for submission in fetch_submissions_by_id(reddit, stale_ids):
+            record = dict(self.records[submission.id])
+            record.update(_submission_stats(submission))
+            changed[submission.id] = record
+
+        self._store(changed, now)
+        for post_id, record in list(self.records.items()):
+            if record["created_utc"] <= retention_cutoff:
+                del self.records[post_id]
+
+        if self.persist and changed:
+            snapshot.delete_many(
+                {"username": self.username, "created_utc": {"$lte": retention_cutoff}}
+            )
 
-                        else:
-                            # Hour doesn't exist, push new entry
-                            hourly_data.update_one(
-                                {"mal_id": mal_id, "reddit_id": submission.id},
-                                {
-                                    "$set": {
-                                        "updated_at": current_time.strftime(
-                                            "%Y-%m-%d %H:%M:%S"
-                                        )
-                                    },
-                                    "$push": {
-                                        "hourly_karma": {
-                                            "hour": hour,
-                                            "karma": karma,
-                                        }
-                                    },
-                                },
-                            )
+        self._advance(
+            {"fullname": submission.fullname, "created_utc": submission.created_utc}
+            for submission in submissions
+        )
 
-                    else:
-                        # Document doesn't exist, create a new one
-                        logger.info(
-                            f"No existing hourly tracking found for MAL ID {mal_id}, post {submission.id}. Creating new document..."
-                        )
-                        hourly_data.insert_one(
-                            {
-                                "mal_id": mal_id,
-                                "reddit_id": submission.id,
-                                "week_id": schedule.week_id,
-                                "season": schedule.season_name,
-                                "year": schedule.year,
-                                "title": show.get("title"),
-                                "title_english": show.get("title_english"),
-                                "episode": episode,
-                                "created_at": current_time.strftime(
-                                    "%Y-%m-%d %H:%M:%S"
-                                ),
-                                "updated_at": current_time.strftime(
-                                    "%Y-%m-%d %H:%M:%S"
-                                ),
-                                "hourly_karma": [{"hour": hour, "karma": karma}],
-                            }
-                        )
-                        logger.info(
-                            f"Created new hourly tracking for MAL ID {mal_id}, post {submission.id}"
-                        )
+        self.refreshed_at = now
+        logger.debug(
+            f"Refreshed submission snapshot: {len(submissions)} listed, {len(stale_ids)} refreshed, {len(self.records)} kept"
+        )
+        logger.debug(f"Reddit rate limit: {reddit_governor.metrics()}")
 
-            except ValueError:
-                logger.error(f"Error updating hourly data for MAL ID: {mal_id}")
-                continue
-    client.close()
-    return posts
+
+_snapshots: Dict[str, SubmissionSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def snapshot_query(username: str, created_after: float) -> Dict:
+    """Returns the filter of a user's persisted snapshot records newer than a timestamp."""
+    return {"username": username, "created_utc": {"$gt": created_after}}
+
+
+def get_submission_snapshot(username: str = "AutoLovepon") -> SubmissionSnapshot:
+    """Returns the process-wide submission snapshot for a Reddit user."""
+    with _snapshots_lock:
+        if username not in _snapshots:
+            _snapshots[username] = SubmissionSnapshot(username=username)
+        return _snapshots[username]
+
+
+def parse_submission(submission: Submission) -> Dict:
+    """
+    Parses a submission into the record stored by `SubmissionSnapshot`.
+
+    Args:
+        submission (Submission): The PRAW Submission object of a discussion post
+
+    Returns:
+        dict: A dictionary with the keys "id", "fullname", "title", "title_details",
+            "episode", "mal_id", "created_utc", "week_id", "season", "karma",
+            "comments", "upvote_ratio" and "url".
+
+    Raises:
+        PostProcessingError: If no week of the schedule contains the post, as in
+            `post_schedule_week`. Such posts are left out of the snapshot.
+    """
+    title_details, episode = get_title_details(submission.title)
+    week = post_schedule_week(submission.created_utc)
+    return {
+        "id": submission.id,
+        "fullname": submission.fullname,
+        "title": submission.title,
+        "title_details": title_details,
+        "episode": episode,
+        "mal_id": get_mal_id_reddit_post(submission.selftext),
+        "created_utc": submission.created_utc,
+        "week_id": week.week_id,
+        "season": week.season_name,
+        **_submission_stats(submission),
+    }
+
+
+def _submission_stats(submission: Submission) -> Dict:
+    return {
+        "karma": submission.score,
+        "comments": submission.num_comments,
+        "upvote_ratio": submission.upvote_ratio,
+        "url": submission.url,
+    }
+
+
+def fetch_new_submissions(
+    reddit: Reddit,
+    username: str = "AutoLovepon",
+    after: Optional[Dict] = None,
+) -> List[Submission]:
+    """
+    Lists only the submissions made after a high-water mark.
+
+    `after` holds the fullname and creation time of the newest submission the caller has
+    seen, e.g. `SubmissionSnapshot.newest`. The listing is paged with `before=<fullname>`,
+    so only newer submissions are downloaded. A full listing is used instead when there is
+    no mark yet, when a full page of new submissions came back (so some may be missing),
+    or when an old mark returns nothing (its anchor submission may have been deleted).
+
+    Args:
+        reddit (Reddit): An authenticated Reddit API instance
+        username (str): The Reddit username whose posts are listed. Defaults to "AutoLovepon".
+        after (dict, optional): The "fullname" and "created_utc" of the newest known submission
+
+    Returns:
+        list[Submission]: The new submissions, newest first.
+    """
+    user: Redditor = reddit.redditor(username)
+    if after:
+        submissions = list(
+            user.submissions.new(limit=LISTING_LIMIT, params={"before": after["fullname"]})
+        )
+        mark_age = datetime.now(timezone.utc) - datetime.fromtimestamp(
+            after["created_utc"], tz=timezone.utc
+        )
+        is_complete = len(submissions) < LISTING_LIMIT and (
+            submissions or mark_age < CURSOR_RECHECK_AGE
+        )
+        if is_complete:
+            logger.debug(
+                f"Found {len(submissions)} new submissions after {after['fullname']}"
+            )
+            return submissions
+        logger.warning(
+            f"No complete listing after {after['fullname']}, listing all submissions"
+        )
+
+    return list(user.submissions.new(limit=LISTING_LIMIT))
+
+
+def fetch_submissions_by_id(reddit: Reddit, post_ids: List[str]) -> List[Submission]:
+    """
+    Fetches the current state of several submissions through batched `reddit.info` lookups.
+
+    Args:
+        reddit (Reddit): An authenticated Reddit API instance
+        post_ids (list[str]): Reddit post IDs, without the `t3_` prefix
+
+    Returns:
+        list[Submission]: The submissions Reddit returned, deleted ones are omitted.
+    """
+    post_ids = list(dict.fromkeys(post_ids))
+    submissions: List[Submission] = []
+    for start in range(0, len(post_ids), REDDIT_INFO_BATCH_SIZE):
+        fullnames = [
+            f"t3_{post_id}"
+            for post_id in post_ids[start : start + REDDIT_INFO_BATCH_SIZE]
+        ]
+        submissions.extend(reddit.info(fullnames=fullnames))
+    return submissions
+
+
+def record_hourly_karma(
+    hourly_data: Collection,
+    samples: List[Dict],
+    schedule: SeasonScheduler,
+    current_time: datetime,
+) -> None:
+    """
+    Writes one polling cycle of hourly karma samples to the `karma_watch` collection.
+
+    The whole cycle is sent as a single unordered `bulk_write` of upserts, see
+    `hourly_karma_update`.
+
+    Args:
+        hourly_data (Collection): The `karma_watch` collection
+        samples (list[dict]): One sample per live post with the keys "mal_id", "reddit_id",
+            "hour", "karma", "title", "title_english" and "episode"
+        schedule (SeasonScheduler): Schedule used to tag newly tracked posts
+        current_time (datetime): Time of the polling cycle
+    """
+    if not samples:
+        return
+
+    updated_at = current_time.strftime("%Y-%m-%d %H:%M:%S")
+
+    # One upsert per post, whether the hour is updated or appended is resolved on the server
+    operations = [
+        UpdateOne(
+            karma_watch_key(sample["mal_id"], sample["reddit_id"]),
+            hourly_karma_update(sample, schedule, updated_at),
+            upsert=True,
+        )
+        for sample in samples
+    ]
+    try:
+        result = hourly_data.bulk_write(operations, ordered=False)
+        logger.info(
+            f"Hourly karma: {result.upserted_count} posts started tracking, {result.modified_count} updated"
+        )
+    except PyMongoError as e:
+        logger.error(f"Error updating hourly data: {e}")
+
+
+def karma_watch_key(mal_id: int, reddit_id: str) -> Dict:
+    """Returns the filter of a post's document in the `karma_watch` collection."""
+    return {"mal_id": mal_id, "reddit_id": reddit_id}
+
+
+def hourly_karma_update(
+    sample: Dict, schedule: SeasonScheduler, updated_at: str
+) -> List[Dict]:
+    """
+    Builds the upsert pipeline that records one hourly karma sample of a post.
+
+    If the post already has an entry for the sample's hour, its karma is replaced,
+    otherwise a new entry is appended to `hourly_karma`. The descriptive fields are
+    only filled when the document is created.
+
+    Args:
+        sample (dict): A sample as described in `record_hourly_karma`
+        schedule (SeasonScheduler): Schedule used to tag newly tracked posts
+        updated_at (str): Formatted time of the polling cycle
+
+    Returns:
+        list[dict]: An aggregation pipeline to use as the update of an upsert.
+    """
+    hour, karma = sample["hour"], sample["karma"]
+
+    def on_insert(field: str, value) -> Dict:
+        return {"$ifNull": [f"${field}", {"$literal": value}]}
+
+    return [
+        {
+            "$set": {
+                "week_id": on_insert("week_id", schedule.week_id),
+                "season": on_insert("season", schedule.season_name),
+                "year": on_insert("year", schedule.year),
+                "title": on_insert("title", sample["title"]),
+                "title_english": on_insert("title_english", sample["title_english"]),
+                "episode": on_insert("episode", sample["episode"]),
+                "created_at": on_insert("created_at", updated_at),
+                "updated_at": updated_at,
+                "hourly_karma": {
+                    "$let": {
+                        "vars": {"hours": {"$ifNull": ["$hourly_karma", []]}},
+                        "in": {
+                            "$cond": [
+                                {"$in": [hour, "$$hours.hour"]},
+                                {
+                                    "$map": {
+                                        "input": "$$hours",
+                                        "as": "entry",
+                                        "in": {
+                                            "$cond": [
+                                                {"$eq": ["$$entry.hour", hour]},
+                                                {"$mergeObjects": ["$$entry", {"karma": karma}]},
+                                                "$$entry",
+                                            ]
+                                        },
+                                    }
+                                },
+                                {"$concatArrays": ["$$hours", [{"hour": hour, "karma": karma}]]},
+                            ]
+                        },
+                    }
+                },
+            }
+        }
+    ]
 
 
 def get_mal_id_reddit_post(post_body: str) -> Optional[int]:
@@ -1029,9 +1793,7 @@ def fetch_weekly_posts_db(
     if schedule is None:
         schedule = SeasonScheduler(schedule_type="post")
 
-    client = MongoClient(os.getenv("MONGO_URI"))
-    db = client.anime
-    seasonal_entries = db.seasonals
+    seasonal_entries = get_db().seasonals
 
     # Determine current week
     current_week = schedule.week_id
@@ -1066,12 +1828,11 @@ def fetch_weekly_posts_db(
         )
     )
 
-    client.close()
     return current_data
 
 
 def fetch_weekly_posts_reddit(
-    reddit: Reddit = setup_reddit_instance(),
+    reddit: Optional[Reddit] = None,
     schedule: Optional[SeasonScheduler] = None,
     username: str = "AutoLovepon",
     default_tz: timezone = timezone.utc,
@@ -1082,7 +1843,7 @@ def fetch_weekly_posts_reddit(
     extract details like anime title, episode number, and MyAnimeList ID.
     Args:
         reddit (Reddit, optional): A praw.Reddit instance for API interactions.
-            Defaults to a new instance from setup_reddit_instance().
+            Defaults to the shared instance from get_reddit().
         schedule (SeasonScheduler, optional): Scheduler to determine current anime season and the week id.
             Defaults to a new SeasonScheduler instance.
         username (str, optional): Reddit username to fetch posts from. Defaults to "AutoLovepon".
@@ -1104,13 +1865,15 @@ def fetch_weekly_posts_reddit(
         are unavailable.
     Notes:
         - Adjusts the week_id based on if  the current day is in Friday to Sunday
-        - Fetches up to 100 most recent posts from the user, but it is very unlikely to reach that number.
+        - Reads the posts from the shared submission snapshot (see `SubmissionSnapshot.window`),
+          which keeps the last 15 days of posts and refreshes closed posts to their final state.
     """
 
+    if reddit is None:
+        reddit = get_reddit()
     if schedule is None:
         schedule = SeasonScheduler()
 
-    user = reddit.redditor(username)
     posts = []
 
     if (
@@ -1120,61 +1883,29 @@ def fetch_weekly_posts_reddit(
     ):
         return None
 
-    is_fri_sat_sun = datetime.now().weekday() in (4, 5, 6)
-    if not is_fri_sat_sun:
-        week_id = schedule.week_id
-        schedule_year = schedule.year
-        schedule_season = schedule.season_number
-    else:
-        if schedule.week_id == 1:
-            week_id = 13
-            if schedule.season_number == 1:
-                schedule_year = schedule.year - 1
-                schedule_season = 4
-            else:
-                schedule_year = schedule.year
-                schedule_season = schedule.season_number - 1
-        else:
-            week_id = schedule.week_id - 1
-            schedule_year = schedule.year
-            schedule_season = schedule.season_number
-    # Get the current week schedule
-    schedule_details = schedule.get_schedule_for_date(
-        year=schedule_year, season=schedule_season, week_id=week_id
-    )
-    if schedule_details:
-        start_date = schedule_details.start_date
-        end_date = schedule_details.end_date
+    week = schedule.week
+    if datetime.now().weekday() in (4, 5, 6):
+        week = ScheduleIndex.for_path(schedule.cache_db_path).previous_week(week)
+    snapshot = get_submission_snapshot(username)
+    for record in snapshot.window(reddit, week.start_date, week.end_date):
+        title_details = record["title_details"]
 
-        if start_date is None or end_date is None:
-            return None
-
-        for submission in user.submissions.new(limit=100):
-            created_time = datetime.fromtimestamp(submission.created_utc, tz=default_tz)
-            if created_time >= start_date and created_time <= end_date:
-                title_details, episode = get_title_details(submission.title)
-
-                posts.append(
-                    {
-                        "id": get_mal_id_reddit_post(submission.selftext),
-                        "reddit_id": submission.id,
-                        "title": title_details.get("romaji"),
-                        "title_english": title_details.get("english"),
-                        "episode": episode,
-                        "created_utc": int(submission.created_utc),
-                        "week_id": week_id,
-                        "karma": submission.score,
-                        "comments": submission.num_comments,
-                        "upvote_ratio": submission.upvote_ratio,
-                        "url": submission.url,
-                    }
-                )
-        if posts:
-            return posts
-        else:
-            return []
-    else:
-        return
+        posts.append(
+            {
+                "id": record["mal_id"],
+                "reddit_id": record["id"],
+                "title": title_details.get("romaji"),
+                "title_english": title_details.get("english"),
+                "episode": record["episode"],
+                "created_utc": int(record["created_utc"]),
+                "week_id": week.week_id,
+                "karma": record["karma"],
+                "comments": record["comments"],
+                "upvote_ratio": record["upvote_ratio"],
+                "url": record["url"],
+            }
+        )
+    return posts
 
 
 def missing_shows_on_db(shows_reddit: List[Dict], shows_db: List[Dict]) -> List:
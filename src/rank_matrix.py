@@ -0,0 +1,163 @@
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from src.rank_processing import SEASON_NAMES, WEEKS_PER_SEASON
+
+
+class RankMatrix(NamedTuple):
+    """
+    Ranks of every show in every week, as shows x weeks arrays.
+
+    Weeks are indexed by `week_ordinal`, so two columns are consecutive weeks exactly
+    when their ordinals differ by one. A rank of 0 means the show had no post that week.
+    """
+
+    mal_ids: np.ndarray
+    weeks: np.ndarray
+    rank: np.ndarray
+    karma: np.ndarray
+    rank_change: np.ndarray
+    karma_change: np.ndarray
+    has_previous: np.ndarray
+
+
+def week_ordinal(year: int, season: str, week_id: int) -> int:
+    """Numbers the weeks of every season consecutively, across season and year boundaries."""
+    return (
+        int(year) * len(SEASON_NAMES) + SEASON_NAMES.index(season)
+    ) * WEEKS_PER_SEASON + week_id - 1
+
+
+def min_ranks(week_index: np.ndarray, karma: np.ndarray, comments: np.ndarray) -> np.ndarray:
+    """
+    Ranks posts within their week by karma then comments, in a single `lexsort`.
+
+    Ties share the lowest rank of their group, like `assign_rank`.
+
+    Args:
+        week_index (np.ndarray): Week of each post
+        karma (np.ndarray): Karma of each post
+        comments (np.ndarray): Comments of each post
+
+    Returns:
+        np.ndarray: The 1-based rank of each post, in input order.
+    """
+    order = np.lexsort((-comments, -karma, week_index))
+    week, karma, comments = week_index[order], karma[order], comments[order]
+    positions = np.arange(len(order))
+
+    new_week = np.r_[True, week[1:] != week[:-1]]
+    new_tie = new_week | np.r_[
+        True, (karma[1:] != karma[:-1]) | (comments[1:] != comments[:-1])
+    ]
+    week_start = np.maximum.accumulate(np.where(new_week, positions, 0))
+    tie_start = np.maximum.accumulate(np.where(new_tie, positions, 0))
+
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = tie_start - week_start + 1
+    return ranks
+
+
+def _arrays(entries: List[Dict]) -> Tuple[np.ndarray, ...]:
+    count = len(entries)
+    ordinals = np.fromiter(
+        (week_ordinal(e["year"], e["season"], e["week_id"]) for e in entries),
+        dtype=np.int64,
+        count=count,
+    )
+    mal_ids = np.fromiter((e["mal_id"] for e in entries), dtype=np.int64, count=count)
+    karma = np.fromiter((e["karma"] for e in entries), dtype=np.int64, count=count)
+    comments = np.fromiter((e["comments"] for e in entries), dtype=np.int64, count=count)
+    return ordinals, mal_ids, karma, comments
+
+
+def _rank_matrix(ordinals, mal_ids, karma, comments) -> Tuple[RankMatrix, np.ndarray, np.ndarray, np.ndarray]:
+    shows, show_index = np.unique(mal_ids, return_inverse=True)
+    weeks, week_index = np.unique(ordinals, return_inverse=True)
+    ranks = min_ranks(week_index, karma, comments)
+
+    shape = (len(shows), len(weeks))
+    rank = np.zeros(shape, dtype=np.int64)
+    rank[show_index, week_index] = ranks
+    karma_matrix = np.zeros(shape, dtype=np.int64)
+    karma_matrix[show_index, week_index] = karma
+
+    # A column only has a previous week if the week before it was loaded
+    consecutive = np.r_[False, np.diff(weeks) == 1]
+    previous_rank = np.zeros(shape, dtype=np.int64)
+    previous_rank[:, 1:] = rank[:, :-1]
+    previous_rank[:, ~consecutive] = 0
+    previous_karma = np.zeros(shape, dtype=np.int64)
+    previous_karma[:, 1:] = karma_matrix[:, :-1]
+
+    has_previous = (rank > 0) & (previous_rank > 0)
+    matrix = RankMatrix(
+        mal_ids=shows,
+        weeks=weeks,
+        rank=rank,
+        karma=karma_matrix,
+        rank_change=np.where(has_previous, previous_rank - rank, 0),
+        karma_change=np.where(has_previous, karma_matrix - previous_karma, 0),
+        has_previous=has_previous,
+    )
+    return matrix, show_index, week_index, ranks
+
+
+def rank_matrix(entries: List[Dict]) -> RankMatrix:
+    """
+    Ranks a whole season, or several, in one vectorized pass.
+
+    Args:
+        entries (list[dict]): Posts with the keys "year", "season", "week_id", "mal_id",
+            "karma" and "comments", e.g. from `season_entries`
+
+    Returns:
+        RankMatrix: Ranks and week-over-week changes of every show in every week.
+    """
+    return _rank_matrix(*_arrays(entries))[0]
+
+
+def weekly_rows(entries: List[Dict]) -> Dict[Tuple[int, str, int], List[Dict]]:
+    """
+    Builds the ranked rows of every week found in `entries`, as `compute_weekly_change` does.
+
+    Posts of a week whose previous week is not part of `entries` are ranked as "new" or
+    "returning", so load the season before as well to get the changes of its first week.
+
+    Args:
+        entries (list[dict]): Posts as described in `rank_matrix`, with the show fields
+            consumed by the templates
+
+    Returns:
+        dict: The rows of each (year, season, week_id), sorted by rank.
+    """
+    if not entries:
+        return {}
+
+    ordinals, mal_ids, karma, comments = _arrays(entries)
+    matrix, show_index, week_index, ranks = _rank_matrix(
+        ordinals, mal_ids, karma, comments
+    )
+    has_previous = matrix.has_previous[show_index, week_index]
+    rank_change = matrix.rank_change[show_index, week_index]
+    karma_change = matrix.karma_change[show_index, week_index]
+
+    rows = defaultdict(list)
+    for i in np.lexsort((mal_ids, ranks, ordinals)):
+        entry = dict(entries[i])
+        year = int(entry.pop("year"))
+        season = entry.pop("season")
+        if has_previous[i]:
+            change = int(rank_change[i])
+        else:
+            change = "new" if entry["episode"] == "1" else "returning"
+        entry.update(
+            current_rank=int(ranks[i]),
+            karma_change=int(karma_change[i]),
+            rank_change=change,
+            season=season,
+        )
+        rows[(year, season, entry["week_id"])].append(entry)
+    return dict(rows)
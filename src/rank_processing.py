@@ -1,18 +1,36 @@
-from pymongo import MongoClient
+from pymongo import UpdateMany, UpdateOne
+from pymongo.database import Database
 from pymongo.errors import OperationFailure
+from concurrent import futures
 from datetime import datetime, timezone
+from math import ceil
 import os
-import requests
 import time
 import pandas as pd
 from datetime import datetime, timezone
 import os
+from database.utils.client import get_db
+from database.utils.episodes import episodes_ready, show_week_key, week_pipeline
 from util.logger_config import logger
-from util.mal import MalImages
-from util.seasonal_schedule import SeasonScheduler
+from util.mal import MAL_WORKERS, MalClient, MalImages
+from util.rate_limit import mal_governor
+from util.seasonal_schedule import (
+    DEFAULT_CACHE_DB_PATH,
+    SEASON_NAMES,
+    WEEKS_PER_SEASON,
+    ScheduleIndex,
+    ScheduleWeek,
+    SeasonScheduler,
+    schedule_week,
+)
 from util.data_backup import save_weekly_ranking
+from util.result_cache import bump_data_versions, cached_by_schedule
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Show fields of the ranking rows that MAL refreshes after the week was materialized,
+# read from `seasonals` whenever a stored ranking is served
+MUTABLE_SHOW_FIELDS = ("score",)
 
 
 class KarmaRankEntry(BaseModel):
@@ -57,165 +75,323 @@ def assign_rank(sorted_entries):
     return sorted_entries
 
 
-def get_weekly_change(schedule: SeasonScheduler):
-    """Calculate weekly rank and karma changes using MongoDB data."""
-    client = MongoClient(os.getenv("MONGO_URI"))
-    db = client.anime
-    seasonal_entries = db.seasonals
+def _week_key(week: ScheduleWeek) -> Tuple[int, str, int]:
+    return week.year, week.season_name, week.week_id
 
-    # Determine current week and season
-    current_week = schedule.week_id
-    season = schedule.season_name
-    year = schedule.year
 
-    if current_week is None or season is None or year is None:
-        raise RuntimeError("Could not determine schedule week/season/year")
+def _schedule_week(year: int, season: str, week_id: int) -> ScheduleWeek:
+    week = schedule_week(year, SEASON_NAMES.index(season) + 1, week_id)
+    if week is None:
+        raise ValueError(f"No week {week_id} in the schedule of {year} {season}")
+    return week
 
-    reddit_karma = f"reddit_karma.{year}.{season}"
 
-    # Calculate last week ID
-    last_week = 13 if current_week == 1 else current_week - 1
-
-    # Fetch current week's data
-    current_data = list(
-        seasonal_entries.aggregate(
-            [
-                {"$unwind": f"${reddit_karma}"},
-                {"$match": {f"{reddit_karma}.week_id": current_week}},
-                {
-                    "$project": {
-                        "_id": 0,
-                        "title": 1,
-                        "title_english": 1,
-                        "episode": f"${reddit_karma}.episode",
-                        "karma": f"${reddit_karma}.karma",
-                        "comments": f"${reddit_karma}.comments",
-                        "week_id": f"${reddit_karma}.week_id",
-                        "images": 1,
-                        "banner": f"${reddit_karma}.banner",
-                        "studio": "$studios.name",
-                        "score": 1,
-                        "streams": 1,
-                        "url": f"${reddit_karma}.url",
-                        "mal_id": "$id",
-                        "num_episodes": 1,
-                        "banner": 1,
-                    }
-                },
-            ]
-        )
+def previous_week(year: int, season: str, week_id: int) -> Tuple[int, str, int]:
+    """
+    Returns the (year, season, week_id) before the given week.
+
+    The week is stepped through `ScheduleIndex.previous_week`, so the keys of the
+    rankings wrap across seasons and years exactly like the schedule does.
+    """
+    week = _schedule_week(year, season, week_id)
+    return _week_key(ScheduleIndex.for_path(DEFAULT_CACHE_DB_PATH).previous_week(week))
+
+
+def next_week(year: int, season: str, week_id: int) -> Tuple[int, str, int]:
+    """Returns the (year, season, week_id) after the given week, see `previous_week`."""
+    week = _schedule_week(year, season, week_id)
+    return _week_key(ScheduleIndex.for_path(DEFAULT_CACHE_DB_PATH).next_week(week))
+
+
+def weekly_change_pipeline(
+    year: int, season: str, current_week: int
+) -> Tuple[str, List[Dict]]:
+    """
+    Builds the single aggregation behind `compute_weekly_change`.
+
+    The posts of the week are read with the posts of the week before appended by a
+    `$unionWith`. `$setWindowFields` ranks both weeks by karma then comments, ties sharing
+    the lowest rank like `assign_rank`, and a `$facet` joins every post of the week with
+    the previous week's entry of the same `mal_id` to compute the changes.
+
+    Args:
+        year (int): Year of the season
+        season (str): Season name (winter, spring, summer, fall)
+        current_week (int): Week of the season
+
+    Returns:
+        tuple[str, list[dict]]: The collection to aggregate and the pipeline.
+    """
+    collection, current = week_pipeline(year, season, current_week)
+    _, previous = week_pipeline(
+        *previous_week(year, season, current_week), details=False
     )
 
-    # Fetch previous week's data
-    if last_week != 13:
-        previous_year = year
-        previous_season = season
-    else:
-        season_number = schedule.season_number
-        if season_number is None:
-            raise RuntimeError("Could not determine schedule season number")
-
-        # Wrap seasons: winter(1) -> fall(4) and adjust year accordingly
-        if season_number == 1:
-            previous_year = year - 1
-            previous_season = schedule._get_season_name(4)
-        else:
-            previous_year = year
-            previous_season = schedule._get_season_name(season_number - 1)
-
-    reddit_karma = f"reddit_karma.{previous_year}.{previous_season}"
-    previous_data = list(
-        seasonal_entries.aggregate(
-            [
-                {"$unwind": f"${reddit_karma}"},
-                {"$match": {f"{reddit_karma}.week_id": last_week}},
-                {
-                    "$project": {
-                        "_id": 0,
-                        "title": 1,
-                        "title_english": 1,
-                        "episode": f"${reddit_karma}.episode",
-                        "karma": f"${reddit_karma}.karma",
-                        "comments": f"${reddit_karma}.comments",
-                        "week_id": f"${reddit_karma}.week_id",
-                        "mal_id": "$id",
+    return collection, [
+        *current,
+        {"$set": {"_current": True}},
+        {
+            "$unionWith": {
+                "coll": collection,
+                "pipeline": [*previous, {"$set": {"_current": False}}],
+            }
+        },
+        {
+            "$setWindowFields": {
+                "partitionBy": "$_current",
+                "sortBy": {"karma": -1, "comments": -1},
+                "output": {"_rank": {"$rank": {}}},
+            }
+        },
+        {
+            "$facet": {
+                "current": [{"$match": {"_current": True}}],
+                "previous": [
+                    {"$match": {"_current": False}},
+                    {"$project": {"mal_id": 1, "karma": 1, "_rank": 1}},
+                ],
+            }
+        },
+        {"$unwind": "$current"},
+        {
+            "$set": {
+                "previous": {
+                    "$last": {
+                        "$filter": {
+                            "input": "$previous",
+                            "cond": {"$eq": ["$$this.mal_id", "$current.mal_id"]},
+                        }
                     }
-                },
-            ]
-        )
-    )
+                }
+            }
+        },
+        {
+            "$replaceWith": {
+                "$mergeObjects": [
+                    "$current",
+                    {
+                        "current_rank": "$current._rank",
+                        "karma_change": {
+                            "$cond": [
+                                {"$ifNull": ["$previous", False]},
+                                {"$subtract": ["$current.karma", "$previous.karma"]},
+                                0,
+                            ]
+                        },
+                        "rank_change": {
+                            "$cond": [
+                                {"$ifNull": ["$previous", False]},
+                                {"$subtract": ["$previous._rank", "$current._rank"]},
+                                {
+                                    "$cond": [
+                                        {"$eq": ["$current.episode", "1"]},
+                                        "new",
+                                        "returning",
+                                    ]
+                                },
+                            ]
+                        },
+                        "season": season,
+                    },
+                ]
+            }
+        },
+        {"$unset": ["_current", "_rank"]},
+        {"$sort": {"current_rank": 1, "mal_id": 1}},
+    ]
 
-    # Sort and rank current and previous data
-    current_sorted = sorted(
-        current_data, key=lambda x: (-x["karma"], -x["comments"])
-    )
-    current_sorted = assign_rank(current_sorted)
-    for entry in current_sorted:
-        entry["current_rank"] = entry.pop("rank", None)
 
-    previous_sorted = sorted(
-        previous_data, key=lambda x: (-x["karma"], -x["comments"])
-    )
-    previous_sorted = assign_rank(previous_sorted)
-    for entry in previous_sorted:
-        entry["previous_rank"] = entry.pop("rank", None)
+def compute_weekly_change(year: int, season: str, current_week: int) -> List[Dict]:
+    """
+    Calculates the ranking of a week, with rank and karma changes, in one aggregation
+    over the posts of the week and of the week before (see `weekly_change_pipeline`).
 
-    # Build previous week lookup
-    previous_dict = {entry["mal_id"]: entry for entry in previous_sorted}
+    Args:
+        year (int): Year of the season
+        season (str): Season name (winter, spring, summer, fall)
+        current_week (int): Week of the season
 
-    # Merge data and compute changes
-    merged_data = []
-    for current_entry in current_sorted:
+    Returns:
+        list[dict]: The ranked rows of the week, as consumed by the templates.
+    """
+    collection, pipeline = weekly_change_pipeline(year, season, current_week)
+    return list(get_db()[collection].aggregate(pipeline))
 
-        mal_id = current_entry["mal_id"]
-        previous_entry = previous_dict.get(mal_id, {})
 
-        # Calculate karma change
-        karma_change = (
-            current_entry["karma"] - previous_entry.get("karma", 0)
-            if mal_id in previous_dict
-            else 0
-        )
+def ranking_key(year: int, season: str, week_id: int) -> Dict:
+    """Returns the filter of a week's document in the `weekly_rankings` collection."""
+    return {"year": year, "season": season, "week_id": week_id}
 
-        # Determine rank change
-        if mal_id in previous_dict:
-            rank_change = (
-                previous_entry["previous_rank"] - current_entry["current_rank"]
-            )
-        else:
-            rank_change = (
-                "new" if current_entry["episode"] == "1" else "returning"
-            )
 
-        merged_entry = {
-            **current_entry,
-            "karma_change": karma_change,
-            "rank_change": rank_change,
-            "season": season,
-        }
-        merged_data.append(merged_entry)
+def refresh_weekly_ranking(year: int, season: str, week_id: int) -> List[Dict]:
+    """
+    Recomputes the ranking of a week and stores it in the `weekly_rankings` collection.
+
+    The JSON backup of the week is rewritten as well.
+
+    Args:
+        year (int): Year of the season
+        season (str): Season name (winter, spring, summer, fall)
+        week_id (int): Week of the season
 
-    client.close()
+    Returns:
+        list[dict]: The ranked rows of the week.
+    """
+    rows = compute_weekly_change(year, season, week_id)
+
+    get_db().weekly_rankings.update_one(
+        ranking_key(year, season, week_id),
+        {"$set": {"rows": rows, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+    logger.info(f"Materialized the ranking of {year} {season} week {week_id}")
 
     # Save the weekly ranking data to JSON
     try:
-        save_weekly_ranking(merged_data, year, season, current_week)
-        logger.info(
-            f"Saved weekly ranking data for {year} {season} week {current_week}"
-        )
+        save_weekly_ranking(rows, year, season, week_id)
+        logger.info(f"Saved weekly ranking data for {year} {season} week {week_id}")
     except Exception as e:
         logger.error(f"Failed to save weekly ranking data: {e}")
 
-    return merged_data
+    return rows
 
 
-def process_stats(data: dict, current_week):
+def refresh_weekly_rankings(weeks: Iterable[Tuple[int, str, int]]) -> None:
+    """
+    Keeps the materialized rankings in line after posts were recorded.
+
+    Each given week is recomputed once. The following week is recomputed too when it is
+    already materialized, since its rank and karma changes are relative to the given week.
+    Failures are logged, the posts themselves are already stored.
+
+    Args:
+        weeks (Iterable[tuple[int, str, int]]): The (year, season, week_id) that changed
+    """
+    collection = get_db().weekly_rankings
+    for year, season, week_id in set(weeks):
+        try:
+            refresh_weekly_ranking(year, season, week_id)
+
+            following = next_week(year, season, week_id)
+            if collection.count_documents(
+                dict(zip(("year", "season", "week_id"), following)), limit=1
+            ):
+                refresh_weekly_ranking(*following)
+        except Exception as e:
+            logger.error(
+                f"Failed to refresh the ranking of {year} {season} week {week_id}: {e}"
+            )
+
+
+def changed_seasons(weeks: Iterable[Tuple[int, str, int]]) -> set:
+    """
+    Returns the (year, season) whose cached results depend on the given weeks.
+
+    The season of the following week is included, since the ranking of a season's first
+    week is relative to the last week of the season before.
+    """
+    seasons = set()
+    for week in weeks:
+        seasons.add(week[:2])
+        seasons.add(next_week(*week)[:2])
+    return seasons
+
+
+@cached_by_schedule("weekly_change")
+def get_weekly_change(schedule: SeasonScheduler) -> List[Dict]:
+    """
+    Returns the ranking of the schedule's week, with rank and karma changes.
+
+    The rows come from the `weekly_rankings` collection, kept up to date as posts close,
+    with the `MUTABLE_SHOW_FIELDS` of their shows read at the time of the call (see
+    `with_current_show_fields`). A week that was never materialized is computed and
+    stored on first read. Results are cached in `ranking_cache` until the season's data
+    version is bumped.
+
+    Args:
+        schedule (SeasonScheduler): Schedule of the week to rank
+
+    Returns:
+        list[dict]: The ranked rows of the week, as consumed by the templates.
+    """
+    current_week = schedule.week_id
+    season = schedule.season_name
+    year = schedule.year
+
+    if current_week is None or season is None or year is None:
+        raise RuntimeError("Could not determine schedule week/season/year")
+
+    ranking = get_db().weekly_rankings.find_one(
+        ranking_key(year, season, current_week), {"_id": 0, "rows": 1}
+    )
+    if ranking is not None:
+        return with_current_show_fields(ranking["rows"])
+
+    return refresh_weekly_ranking(year, season, current_week)
+
+
+def with_current_show_fields(rows: List[Dict]) -> List[Dict]:
+    """
+    Replaces the `MUTABLE_SHOW_FIELDS` of materialized ranking rows with the current
+    values of their shows, so MAL refreshes don't need to rewrite every ranking.
+
+    Args:
+        rows (list[dict]): Ranking rows, each with the `mal_id` of its show
+
+    Returns:
+        list[dict]: The same rows, updated in place.
+    """
+    mal_ids = list({row["mal_id"] for row in rows})
+    projection = {"_id": 0, "id": 1, **{field: 1 for field in MUTABLE_SHOW_FIELDS}}
+    shows = {
+        show.pop("id"): show
+        for show in get_db().seasonals.find({"id": {"$in": mal_ids}}, projection)
+    }
+    for row in rows:
+        row.update(shows.get(row["mal_id"], {}))
+    return rows
+
+
+def show_seasons(mal_ids: Iterable[int], db: Optional[Database] = None) -> set:
+    """
+    Returns the (year, season) in which the given shows have posts, whose cached
+    rankings include the shows' `MUTABLE_SHOW_FIELDS`.
+    """
+    if db is None:
+        db = get_db()
+    if not episodes_ready(db):
+        return set()
+
+    groups = db.episodes.aggregate(
+        [
+            {"$match": {"mal_id": {"$in": list(mal_ids)}}},
+            {"$group": {"_id": {"year": "$year", "season": "$season"}}},
+        ]
+    )
+    return {(group["_id"]["year"], group["_id"]["season"]) for group in groups}
+
+
+def process_stats(
+    data: dict, current_week, schedule: Optional[SeasonScheduler] = None
+):
+    """
+    Stores the MAL stats of a show on its post of `current_week`.
+
+    Args:
+        data (dict): MAL API response of the show, see `MalClient.fetch_stats`
+        current_week (int): Week of the post to update
+        schedule (SeasonScheduler, optional): Schedule giving the year and season of the
+            week. Defaults to the current post schedule.
+    """
+    if schedule is None:
+        schedule = SeasonScheduler(schedule_type="post")
+    year, season = schedule.year, schedule.season_name
+    reddit_karma = f"reddit_karma.{year}.{season}"
 
     mal_id = data.get("id")
     # Transform API response into the correct statistics format
 
-    client = MongoClient(os.getenv("MONGO_URI"))
-    db = client.anime
+    db = get_db()
     col = db.seasonals
 
     mal_score = data.get("mean")
@@ -246,44 +422,78 @@ def process_stats(data: dict, current_week):
     }
 
     col.update_one(
-        {"id": mal_id, "reddit_karma.2025.winter.week_id": current_week},
-        {"$set": {"reddit_karma.$.mal_stats": new_statistic}},
+        {"id": mal_id, f"{reddit_karma}.week_id": current_week},
+        {"$set": {f"{reddit_karma}.$.mal_stats": new_statistic}},
+    )
+    db.episodes.update_many(
+        show_week_key(year, season, current_week, mal_id),
+        {"$set": {"mal_stats": new_statistic}},
     )
-    client.close()
+    # The season of the update above, and every season that shows the score
+    bump_data_versions({(year, season)} | show_seasons([mal_id], db=db))
 
     return pipeline
 
 
-def get_season_averages(schedule: SeasonScheduler):
-    # 1. Connect to your MongoDB
-    client = MongoClient(os.getenv("MONGO_URI"))
-    season = schedule.season_name
-    year = schedule.year
+def season_averages_pipeline(
+    year: int, season: str, db: Optional[Database] = None
+) -> Tuple[str, List[Dict]]:
+    """
+    Builds the aggregation behind `get_season_averages`.
 
-    logger.debug(f"Getting season averages for {season} {year}")
+    The `season_stats` aggregates are read once the `episodes` migration is complete,
+    the `reddit_karma` arrays of `seasonals` before that.
 
-    # 2. Get your specific database and collection
-    db = client.anime
-    collection = db.seasonals
-    try:
-        db.validate_collection(collection)
-    except OperationFailure:
-        return
+    Returns:
+        tuple[str, list[dict]]: The collection to aggregate and the pipeline.
+    """
+    if episodes_ready(db):
+        # Running aggregates kept by `record_episodes`, one document per show
+        return "season_stats", [
+            {
+                "$match": {
+                    "year": int(year),
+                    "season": season,
+                    "total_episodes": {"$gte": 2},
+                }
+            },
+            {
+                "$lookup": {
+                    "from": "seasonals",
+                    "localField": "mal_id",
+                    "foreignField": "id",
+                    "as": "show",
+                }
+            },
+            {"$unwind": "$show"},
+            {
+                "$project": {
+                    "_id": 0,
+                    "mal_id": 1,
+                    "title": "$show.title",
+                    "title_english": "$show.title_english",
+                    "images": "$show.images",
+                    "streams": "$show.streams",
+                    "average_karma": {"$divide": ["$karma_sum", "$total_episodes"]},
+                    "average_comments": {
+                        "$divide": ["$comments_sum", "$total_episodes"]
+                    },
+                    "max_karma": 1,
+                    "min_karma": 1,
+                    "total_episodes": 1,
+                }
+            },
+        ]
 
-    pipeline = [
+    return "seasonals", [
         {
             "$match": {
-                f"reddit_karma.{year}.{season}": {
-                    "$exists": True,
-                    "$type": "array",
-                }
+                f"reddit_karma.{year}.{season}": {"$exists": True, "$type": "array"}
             }
         },
         {
             "$match": {
-                "$expr": {
-                    "$gte": [{"$size": f"$reddit_karma.{year}.{season}"}, 2]
-                }
+                "$expr": {"$gte": [{"$size": f"$reddit_karma.{year}.{season}"}, 2]}
             }
         },
         {
@@ -294,12 +504,8 @@ def get_season_averages(schedule: SeasonScheduler):
                 "title_english": 1,
                 "images": 1,
                 "streams": 1,
-                "average_karma": {
-                    "$avg": f"$reddit_karma.{year}.{season}.karma"
-                },
-                "average_comments": {
-                    "$avg": f"$reddit_karma.{year}.{season}.comments"
-                },
+                "average_karma": {"$avg": f"$reddit_karma.{year}.{season}.karma"},
+                "average_comments": {"$avg": f"$reddit_karma.{year}.{season}.comments"},
                 "max_karma": {"$max": f"$reddit_karma.{year}.{season}.karma"},
                 "min_karma": {"$min": f"$reddit_karma.{year}.{season}.karma"},
                 "total_episodes": {"$size": f"$reddit_karma.{year}.{season}"},
@@ -307,27 +513,62 @@ def get_season_averages(schedule: SeasonScheduler):
         },
     ]
 
+
+@cached_by_schedule("season_averages", per_week=False)
+def get_season_averages(schedule: SeasonScheduler):
+    season = schedule.season_name
+    year = schedule.year
+
+    logger.debug(f"Getting season averages for {season} {year}")
+
+    db = get_db()
+    collection, pipeline = season_averages_pipeline(year, season, db=db)
+
     try:
-        season_averages = list(collection.aggregate(pipeline))
-        client.close()
+        season_averages = list(db[collection].aggregate(pipeline))
         season_averages = sorted(
             season_averages, key=lambda x: x["average_karma"], reverse=True
         )
         return season_averages
     except Exception as e:
         print(e)
-        client.close()
         return
 
 
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of the values, 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, ceil(q / 100 * len(ordered)) - 1))]
+
+
 def update_mal_numbers(
-    schedule: SeasonScheduler = SeasonScheduler(schedule_type="post"),
-):
-    # 1. Connect to your MongoDB
-    client = MongoClient(os.getenv("MONGO_URI"))
+    schedule: Optional[SeasonScheduler] = None,
+) -> Optional[Dict]:
+    """
+    Refreshes the MAL score, members and list statistics of every show aired in the week.
+
+    The shows are fetched concurrently on `MAL_WORKERS` threads sharing one pooled HTTP
+    session, paced by `mal_governor`. Every update is then written with one unordered
+    `bulk_write` on `seasonals` (and one on `episodes`): the score and members of each
+    show by its `id`, and the stats of its post of the week when `reddit_karma` has one.
+
+    Args:
+        schedule (SeasonScheduler, optional): Schedule of the week to refresh. Defaults to
+            the current post schedule.
 
-    # 2. Get your specific database and collection
-    db = client.anime
+    Returns:
+        dict: Run report with the number of shows, failures and writes, and the request
+            latency percentiles in seconds. "seasonals_matched" and "episodes_matched"
+            count the writes that matched a document, from the `bulk_write` results.
+            None if the collection is unavailable.
+    """
+    if schedule is None:
+        schedule = SeasonScheduler(schedule_type="post")
+
+    # Get your specific database and collection
+    db = get_db()
     collection = db.seasonals
     try:
         db.validate_collection(collection)
@@ -340,65 +581,98 @@ def update_mal_numbers(
     season = schedule.season_name
     reddit_karma = f"reddit_karma.{year}.{season}"
 
-    pipeline = [
-        {"$match": {reddit_karma: {"$elemMatch": {"week_id": week_id}}}},
-        {"$project": {"_id": 0, "id": 1}},
-    ]
-
-    mal_ids = list(collection.aggregate(pipeline))
-    mal_ids = [entry["id"] for entry in mal_ids]
-
-    if mal_ids:
-
-        for mal_id in mal_ids:
+    if episodes_ready(db):
+        mal_ids = db.episodes.distinct(
+            "mal_id", {"year": int(year), "season": season, "week_id": week_id}
+        )
+    else:
+        pipeline = [
+            {"$match": {reddit_karma: {"$elemMatch": {"week_id": week_id}}}},
+            {"$project": {"_id": 0, "id": 1}},
+        ]
+
+        mal_ids = list(collection.aggregate(pipeline))
+        mal_ids = [entry["id"] for entry in mal_ids]
+
+    started = time.perf_counter()
+    mal = MalClient()
+    latencies = []
+    failures = {}
+    show_updates = []
+    episode_updates = []
+    updated_ids = []
+
+    def fetch(mal_id: int) -> Tuple[Dict, float]:
+        request_started = time.perf_counter()
+        data = mal.fetch_stats(mal_id)
+        return data, time.perf_counter() - request_started
+
+    with futures.ThreadPoolExecutor(max_workers=MAL_WORKERS) as pool:
+        pending = {pool.submit(fetch, mal_id): mal_id for mal_id in mal_ids}
+        for future in futures.as_completed(pending):
+            mal_id = pending[future]
             try:
-                logger.info(f"Getting mal_details for id: {mal_id}")
-                endpoint = f"https://api.myanimelist.net/v2/anime/{mal_id}?fields=id,mean,rank,popularity,num_list_users,num_scoring_users,statistics"
-                headers = {
-                    "X-MAL-CLIENT-ID": os.getenv("MAL_SECRET"),
-                }
-
-                response = requests.get(
-                    url=endpoint, headers=headers, timeout=90
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    logger.success(f"Got MAL data for {mal_id}")
-                    new_statistic = {
-                        "score": data.get("mean"),
-                        "members": data.get("num_list_users"),
-                        "scoring_members": data.get("num_scoring_users"),
-                        "extra_stats": data.get("statistics", {}).get(
-                            "status"
-                        ),
-                    }
-
-                    collection.update_one(
-                        {"id": mal_id, f"{reddit_karma}.week_id": week_id},
-                        {
-                            "$set": {
-                                f"{reddit_karma}.$.mal_stats": new_statistic
-                            }
-                        },
-                    )
-
-                    collection.update_one(
-                        {"id": mal_id},
-                        {
-                            "$set": {
-                                "score": data.get("mean"),
-                                "members": data.get("num_list_users"),
-                            }
-                        },
-                    )
-
-                else:
-                    logger.error(
-                        f"Error with ID {mal_id}: {response.status_code}"
-                    )
+                data, latency = future.result()
             except Exception as e:
                 logger.error(f"Error with ID {mal_id}: {e}")
-    client.close()
+                failures[mal_id] = str(e)
+                continue
+
+            latencies.append(latency)
+            updated_ids.append(mal_id)
+            new_statistic = {
+                "score": data.get("mean"),
+                "members": data.get("num_list_users"),
+                "scoring_members": data.get("num_scoring_users"),
+                "extra_stats": data.get("statistics", {}).get("status"),
+            }
+            show_updates.append(
+                UpdateOne(
+                    {"id": mal_id},
+                    {
+                        "$set": {
+                            "score": data.get("mean"),
+                            "members": data.get("num_list_users"),
+                        }
+                    },
+                )
+            )
+            show_updates.append(
+                UpdateOne(
+                    {"id": mal_id, f"{reddit_karma}.week_id": week_id},
+                    {"$set": {f"{reddit_karma}.$.mal_stats": new_statistic}},
+                )
+            )
+            episode_updates.append(
+                UpdateMany(
+                    show_week_key(year, season, week_id, mal_id),
+                    {"$set": {"mal_stats": new_statistic}},
+                )
+            )
+
+    seasonals_matched = episodes_matched = 0
+    if show_updates:
+        seasonals_matched = collection.bulk_write(show_updates, ordered=False).matched_count
+        episodes_matched = db.episodes.bulk_write(
+            episode_updates, ordered=False
+        ).matched_count
+        # The rankings of every season of the shows carry their new score
+        bump_data_versions({(year, season)} | show_seasons(updated_ids, db=db))
+
+    report = {
+        "shows": len(mal_ids),
+        "seasonals_matched": seasonals_matched,
+        "episodes_matched": episodes_matched,
+        "failed": len(failures),
+        "failures": failures,
+        "latency_p50": round(_percentile(latencies, 50), 3),
+        "latency_p90": round(_percentile(latencies, 90), 3),
+        "latency_p99": round(_percentile(latencies, 99), 3),
+        "elapsed": round(time.perf_counter() - started, 3),
+    }
+    logger.info(f"MAL stats refresh for {year} {season} week {week_id}: {report}")
+    logger.debug(f"MAL rate limit: {mal_governor.metrics()}")
+    return report
 
 
 def get_available_seasons() -> dict:
@@ -1,8 +1,11 @@
 import os
-from pymongo import MongoClient
 import json
+from database.utils.client import get_db
 from util.logger_config import logger
 
+# Newest years first, then seasons by name, served by the committees index
+COMMITTEE_SORT = [("year", -1), ("season", 1)]
+
 
 def get_committee_data():
     """
@@ -12,13 +15,11 @@ def get_committee_data():
     Returns:
         dict: Dictionary containing processed committee data
     """
-    # Connect to MongoDB
-    client = MongoClient(os.getenv("MONGO_URI"))
-    db = client.anime
+    db = get_db()
 
     logger.info("Setting up the committees data")
     # Basic pipeline to get committees with seasonal data
-    committee_data = list(db.committees.find({},{"_id": 0}).sort([("year", -1), ("season", 1)]))
+    committee_data = list(db.committees.find({},{"_id": 0}).sort(COMMITTEE_SORT))
 
     # Get all committee member IDs for lookup
     all_producer_ids = set()
@@ -90,8 +91,6 @@ def get_committee_data():
     with open(os.path.join("static", "data", "committees.json"), "w") as f:
         json.dump(committee_data, f, indent=4)
 
-    client.close()
-
     return {
         "shows": committee_data
     }
\ No newline at end of file
@@ -4,6 +4,8 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 from pymongo import MongoClient
+from database.utils.client import get_client
+from database.utils.episodes import available_weeks, episodes_ready, season_entries
 from util.logger_config import logger
 from dotenv import load_dotenv
 load_dotenv()
@@ -76,21 +78,22 @@ def get_available_seasons_from_db(mongo_uri=None):
     Get all available years and seasons with weekly rankings from MongoDB.
 
     Args:
-        mongo_uri (str, optional): MongoDB connection URI. Defaults to None (uses environment variable).
+        mongo_uri (str, optional): MongoDB connection URI. Defaults to None (uses the shared client).
 
     Returns:
         dict: Dictionary with years and seasons available in the database
     """
-    import os
-
-    if mongo_uri is None:
-        mongo_uri = os.getenv("MONGO_URI")
-
     try:
-        client = MongoClient(mongo_uri)
+        client = MongoClient(mongo_uri) if mongo_uri else get_client()
         db = client.anime
         seasonals = db.seasonals
 
+        if episodes_ready(db):
+            available_seasons = available_weeks(db)
+            if mongo_uri:
+                client.close()
+            return available_seasons
+
         # Find all documents with reddit_karma data
         pipeline = [
             {"$project": {"_id": 0, "reddit_karma": 1}},
@@ -120,7 +123,8 @@ def get_available_seasons_from_db(mongo_uri=None):
                         )
                         available_seasons[year][season] = week_ids
 
-        client.close()
+        if mongo_uri:
+            client.close()
         logger.info(
             f"Found {len(available_seasons)} years with seasonal data in the database"
         )
@@ -139,18 +143,15 @@ def backup_weekly_rankings(mongo_uri=None, specific_year=None, specific_season=N
     for all available weeks of all seasons, or for a specific year/season if specified.
 
     Args:
-        mongo_uri (str, optional): MongoDB connection URI. Defaults to None (uses environment variable).
+        mongo_uri (str, optional): MongoDB connection URI. Defaults to None (uses the shared client).
         specific_year (str, optional): Specific year to backup. Defaults to None (all years).
         specific_season (str, optional): Specific season to backup. Defaults to None (all seasons).
 
     Returns:
         dict: Summary of the backup operation
     """
-    import os
-    from src.rank_processing import assign_rank
-
-    if mongo_uri is None:
-        mongo_uri = os.getenv("MONGO_URI")
+    from src.rank_matrix import weekly_rows
+    from src.rank_processing import previous_week
 
     summary = {
         "success": False,
@@ -161,9 +162,8 @@ def backup_weekly_rankings(mongo_uri=None, specific_year=None, specific_season=N
     }
 
     try:
-        client = MongoClient(mongo_uri)
+        client = MongoClient(mongo_uri) if mongo_uri else get_client()
         db = client.anime
-        seasonals = db.seasonals
 
         # Get available seasons or filter by specific year/season
         available_seasons = get_available_seasons_from_db(mongo_uri)
@@ -189,53 +189,25 @@ def backup_weekly_rankings(mongo_uri=None, specific_year=None, specific_season=N
                 continue
 
             for season, weeks in seasons.items():
+                try:
+                    # Rank the whole season at once, with the week before it for the
+                    # changes of week 1
+                    previous_year, previous_season, _ = previous_week(int(year), season, 1)
+                    entries = season_entries(year, season, db=db) + season_entries(
+                        previous_year, previous_season, db=db, details=False
+                    )
+                    season_rows = weekly_rows(entries)
+                except Exception as e:
+                    error_msg = f"Error ranking {year}/{season}: {str(e)}"
+                    logger.error(error_msg)
+                    summary["errors"].append(error_msg)
+                    continue
+
                 for week_id in weeks:
                     try:
-                        # Fetch data for this week
-                        reddit_karma = f"reddit_karma.{year}.{season}"
-                        current_data = list(
-                            seasonals.aggregate(
-                                [
-                                    {"$unwind": f"${reddit_karma}"},
-                                    {"$match": {f"{reddit_karma}.week_id": week_id}},
-                                    {
-                                        "$project": {
-                                            "_id": 0,
-                                            "title": 1,
-                                            "title_english": 1,
-                                            "episode": f"${reddit_karma}.episode",
-                                            "karma": f"${reddit_karma}.karma",
-                                            "comments": f"${reddit_karma}.comments",
-                                            "week_id": f"${reddit_karma}.week_id",
-                                            "images": 1,
-                                            "banner": f"${reddit_karma}.banner",
-                                            "studio": "$studios.name",
-                                            "score": 1,
-                                            "streams": 1,
-                                            "url": f"${reddit_karma}.url",
-                                            "mal_id": "$id",
-                                            "num_episodes": 1,
-                                        }
-                                    },
-                                ]
-                            )
-                        )
-
-                        # Calculate rankings
-                        if current_data:
-                            current_sorted = sorted(
-                                current_data,
-                                key=lambda x: (-x["karma"], -x["comments"]),
-                            )
-                            current_sorted = assign_rank(current_sorted)
-
-                            for entry in current_sorted:
-                                entry["current_rank"] = entry.pop("rank", None)
-                                # Add season info and placeholder for rank change
-                                entry["season"] = season
-                                entry["rank_change"] = 0  # Default value
-                                entry["karma_change"] = 0  # Default value
+                        current_sorted = season_rows.get((int(year), season, week_id))
 
+                        if current_sorted:
                             # Save the data
                             success = save_weekly_ranking(
                                 current_sorted, year, season, week_id
@@ -259,7 +231,8 @@ def backup_weekly_rankings(mongo_uri=None, specific_year=None, specific_season=N
 
             summary["years_processed"] += 1
 
-        client.close()
+        if mongo_uri:
+            client.close()
 
         summary["success"] = len(summary["errors"]) == 0
         logger.info(
@@ -1,5 +1,4 @@
 from pymongo.collection import Collection
-from pymongo import MongoClient
 import os
 import pandas as pd
 from bson import ObjectId
@@ -9,10 +8,6 @@ from bs4 import BeautifulSoup
 import re
 
 
-client = MongoClient(os.getenv('MONGO_URI'))
-karma_watch = client.anime.karma_watch
-
-
 
 class AnimeBanner:
 
@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from util.logger_config import logger
+
+# Seconds a response stays fresh, by endpoint
+CACHE_TTLS: Dict[str, int] = {
+    "entry": 7 * 24 * 3600,  # Show details, rarely change once the season started
+    "stats": 3600,  # Score and member counts
+    "seasonal": 12 * 3600,  # Season listings
+    "producer": 30 * 24 * 3600,  # Jikan producers
+    "not_found": 24 * 3600,  # Negative entries for 404s
+}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status_code: int
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def to_response(self, url: str) -> requests.Response:
+        """Rebuilds a `requests.Response` so callers can't tell it was cached."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response._content = self.body
+        response.headers = CaseInsensitiveDict({"X-From-Cache": "1"})
+        if self.etag:
+            response.headers["ETag"] = self.etag
+        response.url = url
+        response.encoding = "utf-8"
+        return response
+
+
+class ResponseCache:
+    """SQLite-backed cache of HTTP GET responses.
+
+    Successful responses are kept for the TTL of their endpoint and then revalidated
+    with their ETag or Last-Modified, so an unchanged resource costs a 304. 404s are
+    kept as negative entries, so unknown IDs are not requested on every poll.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_schema()
+
+        # Metrics
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._revalidated = 0
+        self._misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted(params.items()))}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT status_code, body, etag, last_modified, expires_at
+                FROM responses WHERE key=?
+                """,
+                (key,),
+            ).fetchone()
+        if not row:
+            return None
+        return CachedResponse(
+            status_code=int(row["status_code"]),
+            body=bytes(row["body"]),
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            expires_at=float(row["expires_at"]),
+        )
+
+    def put(self, key: str, response: requests.Response, ttl: int) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, status_code, body, etag, last_modified, fetched_at, expires_at)
+                VALUES
+                    (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    response.status_code,
+                    response.content,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    now,
+                    now + ttl,
+                ),
+            )
+
+    def touch(self, key: str, ttl: int) -> None:
+        """Extends a revalidated entry for another TTL."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET expires_at=? WHERE key=?", (time.time() + ttl, key)
+            )
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            if outcome == "hit":
+                self._hits += 1
+            elif outcome == "revalidated":
+                self._revalidated += 1
+            else:
+                self._misses += 1
+
+    def metrics(self) -> Dict:
+        """Returns the hit, revalidation and miss counters."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "revalidated": self._revalidated,
+                "misses": self._misses,
+            }
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Returns the process-wide response cache for MAL and Jikan, created on first use.
+
+    The cache lives in MAL_CACHE_PATH and is disabled by setting MAL_CACHE_DISABLED.
+    """
+    global _response_cache
+    if os.getenv("MAL_CACHE_DISABLED", "false").lower() in ("1", "true", "yes"):
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            path = os.getenv("MAL_CACHE_PATH", "database/mal_cache.sqlite")
+            try:
+                _response_cache = ResponseCache(path)
+            except sqlite3.Error as e:
+                logger.error(f"Could not open the response cache at {path}: {e}")
+                return None
+        return _response_cache
@@ -1,18 +1,93 @@
 from pydantic import BaseModel, Field,model_validator, field_validator, ValidationError, PydanticSchemaGenerationError, PydanticUserError, ValidationInfo
-from typing import List, Dict, Optional, Any, Union, Annotated
+from typing import List, Dict, Callable, Iterable, Iterator, Optional, Any, Tuple, Union, Annotated
+import random
+import threading
+from concurrent import futures
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from util.logger_config import logger
-from pymongo import MongoClient
+from util.http_cache import CACHE_TTLS, get_response_cache
+from util.rate_limit import TokenBucket, mal_governor
+from exceptions import MalRateLimited
+from pymongo import UpdateOne
 from pymongo.collection import Collection
 from pymongo.errors import PyMongoError
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timezone
+from database.utils.client import get_collection
 load_dotenv()
 
-client = MongoClient(os.getenv("MONGO_URI"))
-collection = client.anime.seasonals
+# Concurrent requests made to MAL, e.g. by update_mal_numbers
+MAL_WORKERS = int(os.getenv("MAL_WORKERS", 4))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_mal_session() -> requests.Session:
+    """
+    Returns the process-wide HTTP session for MAL, created on first use.
+
+    The session keeps up to `MAL_WORKERS` connections alive, so concurrent requests reuse
+    them instead of opening a new TLS connection per request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAL_WORKERS)
+            _session.mount("https://", adapter)
+        return _session
+
+
+class RetryPolicy:
+    """
+    How `MalClient` retries requests answered with a 429.
+
+    Delays grow exponentially from `base_delay` up to `max_delay`, with full jitter, unless
+    MAL sends a `Retry-After`. After `max_attempts` requests `MalRateLimited` is raised.
+    A `deferred` policy never sleeps: the first 429 raises `MalRateLimited` with the delay,
+    so scheduler jobs can reschedule the work instead of holding their thread.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        deferred: bool = False,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deferred = deferred
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Returns the seconds to wait before the attempt following `attempt` (0-based)."""
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass  # An HTTP date, fall back to the backoff
+        backoff = min(self.max_delay, self.base_delay * 2**attempt)
+        return random.uniform(backoff / 2, backoff)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy(
+    max_attempts=int(os.getenv("MAL_MAX_ATTEMPTS", 4)),
+    base_delay=float(os.getenv("MAL_BACKOFF_BASE", 2)),
+    max_delay=float(os.getenv("MAL_BACKOFF_MAX", 60)),
+)
+
+# Used from scheduler jobs, which reschedule themselves instead of sleeping
+DEFERRED_RETRY_POLICY = RetryPolicy(
+    max_attempts=1,
+    base_delay=DEFAULT_RETRY_POLICY.base_delay * 15,
+    max_delay=DEFAULT_RETRY_POLICY.max_delay * 5,
+    deferred=True,
+)
 
 
 class MalImages(BaseModel):
@@ -117,6 +192,34 @@ class MalSeasonals(BaseModel):
     mal_entries: List[MalEntry] = Field(alias="data")
 
 
+# Fields of a seasonals document owned by the tracker, never overwritten by a MAL refresh
+SEASONAL_PRESERVED_FIELDS = ("reddit_karma", "streams")
+
+
+def _validates(model: Callable[..., Any]) -> Callable[[Dict], bool]:
+    """Returns a check that a JSON payload builds `model` without a validation error."""
+    def validate(data: Dict) -> bool:
+        try:
+            model(**data)
+        except (TypeError, ValidationError):
+            return False
+        return True
+    return validate
+
+
+def _is_valid_payload(
+    response: requests.Response, validate: Optional[Callable[[Dict], bool]]
+) -> bool:
+    """Tells whether a 200 holds a JSON object that passes `validate`."""
+    try:
+        data = response.json()
+    except ValueError:
+        return False
+    if not isinstance(data, dict):
+        return False
+    return validate is None or validate(data)
+
+
 class MalClient:
     BASE_URL = "https://api.myanimelist.net/v2/anime/season"
     ENTRY_URL = "https://api.myanimelist.net/v2/anime"
@@ -125,13 +228,104 @@ class MalClient:
         "X-MAL-CLIENT-ID": os.getenv('MAL_SECRET'),  # Use OAuth or a static token if allowed
     }
 
-    def __init__(self, year: int = datetime.now(timezone.utc).year, limit: int = 100):
+    def __init__(
+        self,
+        year: int = datetime.now(timezone.utc).year,
+        limit: int = 100,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
         self.year = year
         self.limit = limit
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+
+    def _get(
+        self,
+        url: str,
+        cache: Optional[str] = None,
+        validate: Optional[Callable[[Dict], bool]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Sends a GET to the MAL API through the shared session and `mal_governor`.
 
-    def fetch_seasonals(self, season: str, limit_by_members: Optional[int] = None) -> List[MalEntry]:
-        url = f"{self.BASE_URL}/{self.year}/{season}"
-        params = {
+        See `_send` for the retries and the response cache.
+        """
+        return self._send(url, self.HEADERS, mal_governor, cache, validate, **kwargs)
+
+    def _send(
+        self,
+        url: str,
+        headers: Dict,
+        governor: Optional[TokenBucket],
+        cache: Optional[str] = None,
+        validate: Optional[Callable[[Dict], bool]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Sends a GET through the shared session.
+
+        With a `cache` endpoint (a key of `CACHE_TTLS`), fresh responses and 404s are served
+        from the response cache, and stale ones are revalidated with a conditional request.
+        A 200 is only cached once its JSON payload parses and passes `validate`, so a
+        malformed answer is requested again on the next call instead of being replayed
+        for the whole TTL.
+        429 responses are retried according to `retry_policy`, and every other request
+        paced by the same `governor` is held for the same delay.
+
+        Raises:
+            MalRateLimited: If the API is still rate limiting once the policy gives up.
+        """
+        kwargs.setdefault("timeout", 30)
+        response_cache = get_response_cache() if cache else None
+        cached = None
+        if response_cache is not None:
+            key = response_cache.key(url, kwargs.get("params"))
+            cached = response_cache.get(key)
+            if cached is not None and cached.fresh:
+                response_cache.record("hit")
+                return cached.to_response(url)
+
+            headers = dict(headers)
+            if cached is not None and cached.status_code == 200:
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+        policy = self.retry_policy
+        for attempt in range(policy.max_attempts):
+            if governor is not None:
+                governor.acquire()
+            response = get_mal_session().get(url, headers=headers, **kwargs)
+            if response.status_code != 429:
+                break
+
+            delay = policy.delay(attempt, response.headers.get("Retry-After"))
+            if governor is not None:
+                governor.pause(delay)
+            if policy.deferred or attempt == policy.max_attempts - 1:
+                raise MalRateLimited(f"Rate limit hit for {url}", retry_after=delay)
+            logger.warning(f"Rate limit hit, retrying {url} in {delay:.1f}s")
+            time.sleep(delay)
+
+        if response_cache is not None:
+            if response.status_code == 304 and cached is not None:
+                response_cache.touch(key, CACHE_TTLS[cache])
+                response_cache.record("revalidated")
+                return cached.to_response(url)
+
+            response_cache.record("miss")
+            if response.status_code == 200:
+                if _is_valid_payload(response, validate):
+                    response_cache.put(key, response, CACHE_TTLS[cache])
+                else:
+                    logger.warning(f"Not caching the invalid response of {url}")
+            elif response.status_code == 404:
+                response_cache.put(key, response, CACHE_TTLS["not_found"])
+        return response
+
+    def _seasonal_params(self) -> Dict:
+        return {
             "limit": self.limit,
             "fields": ",".join([
                 "id", "title", "main_picture", "alternative_titles",
@@ -142,27 +336,96 @@ class MalClient:
             "sort": "num_list_users",
         }
 
+    def _fetch_seasonal_page(
+        self, url: str, params: Dict, limit_by_members: Optional[int]
+    ) -> Tuple[List[MalEntry], Optional[str]]:
+        """Fetches and validates one page of a season listing. Returns its entries and the next URL."""
+        response = self._get(
+            url, cache="seasonal", validate=_validates(MalSeasonals), params=params
+        )
+        response.raise_for_status()
+        data = response.json()
+
         entries = []
-        while url:
-            response = requests.get(url, headers=self.HEADERS, params=params)
-            response.raise_for_status()
-            data = response.json()
+        try:
+            seasonal = MalSeasonals(**data)
+            for entry in seasonal.mal_entries:
+                if limit_by_members is None or (entry.members and entry.members >= limit_by_members):
+                    entries.append(entry)
+        except ValidationError as e:
+            logger.error(f"Validation error on {url}: {e}")
 
-            try:
-                seasonal = MalSeasonals(**data)
-                for entry in seasonal.mal_entries:
-                    if limit_by_members is None or (entry.members and entry.members >= limit_by_members):
-                        entries.append(entry)
-            except ValidationError as e:
-                print("Validation error:", e)
-
-            # Pagination
-            url = data.get("paging", {}).get("next")
+        return entries, data.get("paging", {}).get("next")
+
+    def fetch_seasonals(
+        self, season: str, limit_by_members: Optional[int] = None, parallel: bool = False
+    ) -> List[MalEntry]:
+        """
+        Fetches every entry of a season listing.
+
+        Pages are followed one at a time through `paging.next`, or fetched concurrently with
+        `parallel` (see `iter_seasonals`).
+        """
+        if parallel:
+            return list(self.iter_seasonals(season, limit_by_members))
+
+        url = f"{self.BASE_URL}/{self.year}/{season}"
+        params = self._seasonal_params()
+
+        entries = []
+        while url:
+            page, url = self._fetch_seasonal_page(url, params, limit_by_members)
+            entries.extend(page)
             logger.debug(f"Next URL: {url}")
             params = {}  # MAL requires you to drop query params after the first call with `next` URL
 
         return entries
 
+    def iter_seasonals(
+        self,
+        season: str,
+        limit_by_members: Optional[int] = None,
+        workers: int = MAL_WORKERS,
+    ) -> Iterator[MalEntry]:
+        """
+        Yields the entries of a season listing while its pages are still being fetched.
+
+        Once the first page shows there are more, the following pages are requested by
+        offset in waves of `workers` pages on a bounded pool. Each page is validated in the
+        thread that fetched it, and its entries are yielded in listing order as soon as the
+        pages before it are done.
+
+        The listing ends at the first page without `paging.next`, and no wave is started
+        after it. The pages of its wave past the end are still awaited: MAL answers an
+        out-of-range offset with an empty page, so they cost one empty request each and
+        nothing needs cancelling.
+        """
+        url = f"{self.BASE_URL}/{self.year}/{season}"
+        params = self._seasonal_params()
+
+        entries, next_url = self._fetch_seasonal_page(url, params, limit_by_members)
+        yield from entries
+
+        offset = self.limit
+        with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            while next_url:
+                wave = [
+                    pool.submit(
+                        self._fetch_seasonal_page,
+                        url,
+                        {**params, "offset": offset + i * self.limit},
+                        limit_by_members,
+                    )
+                    for i in range(workers)
+                ]
+                offset += workers * self.limit
+
+                for future in wave:
+                    entries, next_url = future.result()
+                    yield from entries
+                    if not next_url:
+                        break  # The rest of the wave is past the end of the listing
+
     def fetch_entry_by_id(self, mal_id: int) -> Optional[MalEntry]:
         url = f"{self.ENTRY_URL}/{mal_id}"
         params = {
@@ -174,17 +437,19 @@ class MalClient:
             ])
         }
 
-        response = requests.get(url, headers=self.HEADERS, params=params, timeout=10)
+        response = self._get(
+            url,
+            cache="entry",
+            validate=_validates(lambda **data: MalEntry(node=data)),
+            params=params,
+            timeout=10,
+        )
         if response.status_code == 404:
             logger.error(f"Entry with ID {mal_id} not found.")
             return None
         elif response.status_code == 403:
             logger.error("Forbidden: Check your MAL API credentials.")
             return None
-        elif response.status_code == 429:
-            logger.error("Rate limit exceeded. Retrying after 60 seconds...")
-            time.sleep(60)
-            return self.fetch_entry_by_id(mal_id)
         response.raise_for_status()
 
         data = {"node": response.json()}
@@ -205,11 +470,11 @@ class MalClient:
             ])
         }
 
-        response = requests.get(url, headers=self.HEADERS, params=params,timeout=90)
+        response = self._get(url, cache="stats", params=params)
         if response.status_code == 200:
             data = response.json()
 
-            collection.update_one(
+            get_collection("seasonals").update_one(
                 {"id": mal_id},
                 {"$set": {"score": data.get("mean"), "members": data.get("num_list_users")}},
             )
@@ -217,22 +482,42 @@ class MalClient:
         else:
             logger.error(f"Error with ID {mal_id}: {response.status_code}")
 
+    def fetch_stats(self, mal_id: int) -> Dict:
+        """
+        Fetches the score, member counts and list statistics of an entry.
+
+        Raises:
+            requests.HTTPError: If MAL doesn't answer with a 200.
+        """
+        url = f"{self.ENTRY_URL}/{mal_id}"
+        params = {
+            "fields": ",".join([
+                "id", "mean", "rank", "popularity", "num_list_users",
+                "num_scoring_users", "statistics",
+            ])
+        }
+
+        response = self._get(url, cache="stats", params=params)
+        response.raise_for_status()
+        return response.json()
+
     def push_to_db(self, mal_entry: MalEntry) -> None:
         """
-        Pushes a list of MAL entries to a MongoDB collection.
+        Pushes a MAL entry to the `seasonals` collection, in a single upsert that leaves an
+        existing entry untouched. Use `push_many_to_db` to import several entries.
 
         Args:
-            mal_entries: List of MAL entries to push
-            collection: MongoDB collection to push to
+            mal_entry: MAL entry to push
         """
 
         try:
             entry_dict: Dict = mal_entry.model_dump()
-            if collection.find_one({'id': entry_dict['id']}):
+            result = get_collection("seasonals").update_one(
+                {"id": entry_dict["id"]}, {"$setOnInsert": entry_dict}, upsert=True
+            )
+            if result.upserted_id is None:
                 logger.warning(f"Entry with ID {entry_dict['id']} already exists in the database.")
-                return
             else:
-                collection.insert_one(entry_dict)
                 logger.success(f"Pushed {entry_dict['title']} to MongoDB")
         except PydanticSchemaGenerationError as e:
             logger.error(f"Error generating the schema for {mal_entry}: {e}")
@@ -244,9 +529,104 @@ class MalClient:
             logger.error(f"Error pushing {mal_entry} to MongoDB: {e}")
             return
 
+    def push_many_to_db(
+        self,
+        mal_entries: Iterable[MalEntry],
+        refresh: bool = False,
+        batch_size: int = 500,
+        collection: Optional[Collection] = None,
+    ) -> Dict[str, int]:
+        """
+        Upserts MAL entries into the `seasonals` collection in unordered bulk writes.
+
+        New entries are inserted whole. Existing entries are skipped, or with `refresh`
+        their metadata is updated. `reddit_karma`, `streams` and fields the entry doesn't
+        carry (e.g. `score` from a season listing) are never overwritten.
+
+        Args:
+            mal_entries: Entries to import, e.g. from `iter_seasonals`
+            refresh: Whether to update the metadata of entries that already exist
+            batch_size: Number of upserts per `bulk_write`
+            collection: Collection to import into. Defaults to `seasonals`.
+
+        Returns:
+            dict: The number of entries "inserted", "updated" and "skipped".
+        """
+        if collection is None:
+            collection = get_collection("seasonals")
+
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+        operations = []
+
+        def flush():
+            if not operations:
+                return
+            try:
+                result = collection.bulk_write(operations, ordered=False)
+            except PyMongoError as e:
+                logger.error(f"Error importing {len(operations)} entries to MongoDB: {e}")
+                operations.clear()
+                return
+            counts["inserted"] += result.upserted_count
+            counts["updated"] += result.modified_count
+            counts["skipped"] += result.matched_count - result.modified_count
+            operations.clear()
+
+        for mal_entry in mal_entries:
+            entry_dict: Dict = mal_entry.model_dump()
+            mal_id = entry_dict.pop("id")
+            if refresh:
+                metadata = {
+                    k: v
+                    for k, v in entry_dict.items()
+                    if v is not None and k not in SEASONAL_PRESERVED_FIELDS
+                }
+                update = {"$set": metadata}
+                on_insert = {k: v for k, v in entry_dict.items() if k not in metadata}
+                if on_insert:
+                    update["$setOnInsert"] = on_insert
+            else:
+                update = {"$setOnInsert": entry_dict}
+
+            operations.append(UpdateOne({"id": mal_id}, update, upsert=True))
+            if len(operations) >= batch_size:
+                flush()
+        flush()
+
+        logger.success(
+            f"Imported {counts['inserted']} new, {counts['updated']} updated and "
+            f"{counts['skipped']} unchanged entries"
+        )
+        return counts
+
+    def import_seasonals(
+        self,
+        season: str,
+        limit_by_members: Optional[int] = None,
+        refresh: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Imports a season listing into the `seasonals` collection.
+
+        The entries of `iter_seasonals` are written by `push_many_to_db` while the later
+        pages are still being fetched.
+
+        Returns:
+            dict: The number of entries "inserted", "updated" and "skipped".
+        """
+        return self.push_many_to_db(
+            self.iter_seasonals(season, limit_by_members), refresh=refresh
+        )
+
     def fetch_producer_from_jikan(self, mal_id: int):
         url = f"{self.JIKAN_BASE_URL}/producers/{mal_id}"
-        response = requests.get(url)
+        response = self._send(
+            url,
+            {},
+            None,
+            cache="producer",
+            validate=_validates(lambda **data: MalProducer(**data.get("data") or {})),
+        )
         if response.status_code == 200:
             data = response.json()
             data = data.get('data')
@@ -258,7 +638,7 @@ class MalClient:
 
     def fetch_unique_ids(self, season: str) -> List[int]:
         try:
-            unique_ids = collection.distinct(
+            unique_ids = get_collection("seasonals").distinct(
                 "id", filter={"year": self.year, "season": season}
             )
             return unique_ids
@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from prawcore import Requestor
+
+from util.logger_config import logger
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every caller of an API.
+
+    Tokens are refilled continuously at `rate` per second up to `capacity`, and each
+    request takes one token, blocking the calling thread until one is available. The
+    bucket also tracks how many threads are waiting and how long they waited.
+    """
+
+    def __init__(self, rate: float, capacity: float, name: str = "api"):
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+        # Metrics
+        self._requests = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take a token, blocking until one is available. Returns the seconds waited."""
+        started = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            self._max_waiting = max(self._max_waiting, self._waiting)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now < self._paused_until:
+                        delay = self._paused_until - now
+                    elif self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    else:
+                        delay = (1 - self._tokens) / self.rate
+                    self._cond.wait(delay)
+            finally:
+                self._waiting -= 1
+
+            waited = time.monotonic() - started
+            self._requests += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        if waited >= 1:
+            logger.debug(f"{self.name} request waited {waited:.2f}s for a token")
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for the given number of seconds."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def metrics(self) -> Dict:
+        """Returns the request count, queue depth and wait time statistics."""
+        with self._cond:
+            return {
+                "name": self.name,
+                "requests": self._requests,
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_waiting,
+                "total_wait": round(self._total_wait, 3),
+                "average_wait": round(self._total_wait / self._requests, 3)
+                if self._requests
+                else 0.0,
+                "max_wait": round(self._max_wait, 3),
+                "tokens": round(self._tokens, 2),
+            }
+
+
+class RedditRateGovernor(TokenBucket):
+    """
+    Process-wide budget for the Reddit API.
+
+    On top of the local token bucket, the governor follows the quota Reddit reports on
+    each response: the bucket never holds more tokens than `X-Ratelimit-Remaining`, and
+    once the quota is used up every request waits for `X-Ratelimit-Reset` seconds.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: float):
+        super().__init__(rate=requests_per_minute / 60, capacity=burst, name="reddit")
+        self.remaining: Optional[float] = None
+        self.reset_seconds: Optional[float] = None
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Aligns the budget with the rate limit headers of a Reddit response."""
+        try:
+            remaining = float(headers["x-ratelimit-remaining"])
+            reset_seconds = float(headers["x-ratelimit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._cond:
+            self.remaining = remaining
+            self.reset_seconds = reset_seconds
+            self._tokens = min(self._tokens, remaining)
+            if remaining < 1:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + reset_seconds
+                )
+            self._cond.notify_all()
+
+        if remaining < 1:
+            logger.warning(
+                f"Reddit quota used up, holding requests for {reset_seconds:.0f}s"
+            )
+
+    def metrics(self) -> Dict:
+        metrics = super().metrics()
+        metrics["remaining"] = self.remaining
+        metrics["reset_seconds"] = self.reset_seconds
+        return metrics
+
+
+reddit_governor = RedditRateGovernor(
+    requests_per_minute=float(os.getenv("REDDIT_REQUESTS_PER_MINUTE", 100)),
+    burst=float(os.getenv("REDDIT_REQUEST_BURST", 10)),
+)
+
+
+# MAL doesn't document its limits; a couple of requests per second stays clear of 429s
+mal_governor = TokenBucket(
+    rate=float(os.getenv("MAL_REQUESTS_PER_SECOND", 2)),
+    capacity=float(os.getenv("MAL_REQUEST_BURST", 4)),
+    name="mal",
+)
+
+
+class GovernedRequestor(Requestor):
+    """prawcore requestor that sends every Reddit request through `reddit_governor`."""
+
+    def request(self, *args, **kwargs):
+        reddit_governor.acquire()
+        response = super().request(*args, **kwargs)
+        reddit_governor.update(response.headers)
+        return response
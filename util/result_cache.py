@@ -0,0 +1,196 @@
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from database.utils.client import get_db
+from util.logger_config import logger
+
+_MISSING = object()
+
+
+def data_version(year: int, season: str) -> int:
+    """Returns the data version of a season, bumped by every write to its posts or stats."""
+    document = get_db().data_versions.find_one({"_id": f"{year}.{season}"})
+    return document["version"] if document else 0
+
+
+def bump_data_versions(seasons: Iterable[Tuple[int, str]]) -> None:
+    """
+    Bumps the data version of each (year, season), so cached results of those seasons
+    are recomputed on their next read. Call it once the writes are done.
+    """
+    collection = get_db().data_versions
+    for year, season in set(seasons):
+        try:
+            document = collection.find_one_and_update(
+                {"_id": f"{year}.{season}"},
+                {"$inc": {"version": 1}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            logger.debug(f"Data version of {year} {season} is now {document['version']}")
+        except PyMongoError as e:
+            logger.error(f"Failed to bump the data version of {year} {season}: {e}")
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of query results with a time to live.
+
+    Keys are expected to embed the data version of what they were computed from, so a
+    bumped version is a guaranteed miss and stale entries simply age out. With `mongo`
+    enabled, misses also look in the `result_cache` collection, which lets processes
+    (e.g. the Flask app and the freezer) share results.
+
+    Cached results are shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: float = 3600,
+        mongo: bool = False,
+        name: str = "results",
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.mongo = mongo
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._mongo_hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value of `key`, or `_MISSING`."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.mongo:
+            value = self._mongo_get(key)
+            if value is not _MISSING:
+                with self._lock:
+                    self._mongo_hits += 1
+                self._store(key, value)
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return _MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._store(key, value)
+        if self.mongo:
+            self._mongo_set(key, value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is _MISSING:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict:
+        """Returns the hit and miss counters and the number of cached entries."""
+        with self._lock:
+            lookups = self._hits + self._mongo_hits + self._misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "mongo_hits": self._mongo_hits,
+                "misses": self._misses,
+                "hit_ratio": round((self._hits + self._mongo_hits) / lookups, 3)
+                if lookups
+                else 0.0,
+            }
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _mongo_get(self, key: Hashable) -> Any:
+        try:
+            document = get_db().result_cache.find_one(
+                {"_id": repr(key), "expires_at": {"$gt": datetime.now(timezone.utc)}}
+            )
+        except PyMongoError as e:
+            logger.error(f"Failed to read {key} from the result cache: {e}")
+            return _MISSING
+        return document["value"] if document else _MISSING
+
+    def _mongo_set(self, key: Hashable, value: Any) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        try:
+            get_db().result_cache.replace_one(
+                {"_id": repr(key)},
+                {"value": value, "expires_at": expires_at},
+                upsert=True,
+            )
+        except PyMongoError as e:
+            logger.error(f"Failed to write {key} to the result cache: {e}")
+
+
+ranking_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", 128)),
+    ttl=float(os.getenv("RESULT_CACHE_TTL", 3600)),
+    mongo=os.getenv("RESULT_CACHE_MONGO", "false").lower() in ("1", "true", "yes"),
+    name="rankings",
+)
+
+
+def cached_by_schedule(
+    name: str, per_week: bool = True, cache: Optional[ResultCache] = None
+) -> Callable:
+    """
+    Caches a function of a `SeasonScheduler` by the schedule's season (and week) and the
+    season's data version.
+
+    Args:
+        name (str): Name of the cached query, part of the key
+        per_week (bool): Whether the result depends on the schedule's week
+        cache (ResultCache, optional): Cache to use. Defaults to `ranking_cache`.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(schedule, *args, **kwargs):
+            year, season = schedule.year, schedule.season_name
+            if year is None or season is None or args or kwargs:
+                return func(schedule, *args, **kwargs)
+
+            week_id = schedule.week_id if per_week else None
+            key = (name, year, season, week_id, data_version(year, season))
+            return (cache or ranking_cache).get_or_compute(
+                key, lambda: func(schedule)
+            )
+
+        return wrapper
+
+    return decorator
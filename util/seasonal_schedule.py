@@ -2,16 +2,23 @@ from __future__ import annotations
 
 import calendar
 import sqlite3
+import threading
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Literal, Optional, Union
+from typing import Dict, Iterable, Iterator, Literal, NamedTuple, Optional, Union
 from zoneinfo import ZoneInfo
 
+import numpy as np
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 from util.logger_config import logger
 
+SEASON_NAMES = ("winter", "spring", "summer", "fall")
+WEEKS_PER_SEASON = 13
+
 
 class ScheduleDetails(BaseModel):
     """Pydantic model for schedule details."""
@@ -37,6 +44,7 @@ def _last_weekday_of_month(year: int, month: int, weekday: int) -> date:
     return d
 
 
+@lru_cache(maxsize=None)
 def _episodes_season_start(schedule_year: int, season: int) -> datetime:
     """Season start for episode windows (Friday 00:00 UTC) for a season-year."""
     if season == 1:  # winter starts in Dec of previous calendar year
@@ -66,7 +74,7 @@ def _generate_episodes_schedule(schedule_year: int) -> list[dict]:
     rows: list[dict] = []
     for season in (1, 2, 3, 4):
         base = _episodes_season_start(schedule_year, season)
-        for week_id in range(1, 14):
+        for week_id in range(1, WEEKS_PER_SEASON + 1):
             start = base + timedelta(days=7 * (week_id - 1))
             end = start + timedelta(days=6, hours=23, minutes=59, seconds=59)
             rows.append(
@@ -93,7 +101,7 @@ def _generate_post_schedule(schedule_year: int) -> list[dict]:
     for season in (1, 2, 3, 4):
         episode_start = _episodes_season_start(schedule_year, season)
         first_sunday = (episode_start + timedelta(days=2)).date()  # Fri -> Sun
-        for week_id in range(1, 14):
+        for week_id in range(1, WEEKS_PER_SEASON + 1):
             sunday = first_sunday + timedelta(days=7 * (week_id - 1))
             local_start = datetime.combine(sunday, time(3, 0), tzinfo=tz)
             start = local_start.astimezone(timezone.utc)
@@ -228,6 +236,31 @@ class ScheduleCache:
                 end_ts=int(row["end_ts"]),
             )
 
+    def get_year(
+        self, schedule_year: int, schedule_type: Literal["episodes", "post"]
+    ) -> list[_ScheduleRow]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT schedule_year, schedule_type, season, week_id, start_ts, end_ts
+                FROM schedules
+                WHERE schedule_year=? AND schedule_type=?
+                ORDER BY start_ts, season, week_id
+                """,
+                (schedule_year, schedule_type),
+            ).fetchall()
+        return [
+            _ScheduleRow(
+                schedule_year=int(row["schedule_year"]),
+                schedule_type=str(row["schedule_type"]),
+                season=int(row["season"]),
+                week_id=int(row["week_id"]),
+                start_ts=int(row["start_ts"]),
+                end_ts=int(row["end_ts"]),
+            )
+            for row in rows
+        ]
+
     def get_for_week(
         self,
         schedule_year: int,
@@ -257,6 +290,259 @@ class ScheduleCache:
             )
 
 
+DEFAULT_CACHE_DB_PATH = "database/schedules.sqlite"
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleWeek:
+    """
+    One week of a schedule, as a lightweight immutable value.
+
+    Instances come from `ScheduleIndex`, which keeps a single one per
+    (schedule_type, year, season, week), so they are cheap to pass around and compare.
+    It has the `year`, `season_number`, `season_name` and `week_id` of a
+    `SeasonScheduler`, which stays the model for the API boundary (see `details`).
+    """
+
+    schedule_type: str
+    year: int
+    season: int
+    week_id: int
+    start_ts: int
+    end_ts: int
+
+    @property
+    def season_number(self) -> int:
+        return self.season
+
+    @property
+    def season_name(self) -> str:
+        return SEASON_NAMES[self.season - 1]
+
+    @property
+    def start_date(self) -> datetime:
+        return datetime.fromtimestamp(self.start_ts, tz=timezone.utc)
+
+    @property
+    def end_date(self) -> datetime:
+        return datetime.fromtimestamp(self.end_ts, tz=timezone.utc)
+
+    @property
+    def post_time(self) -> datetime:
+        """A time that resolves to this week, its midpoint (windows overlap at DST changes)."""
+        return datetime.fromtimestamp(
+            (self.start_ts + self.end_ts) // 2, tz=timezone.utc
+        )
+
+    def details(self) -> ScheduleDetails:
+        return ScheduleDetails(
+            week_id=self.week_id,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            season=self.season,
+        )
+
+
+@dataclass(frozen=True)
+class _YearIndex:
+    """Schedule rows of one (schedule_type, year), sorted by start for `bisect`."""
+
+    rows: tuple
+    starts: tuple
+    ends: tuple
+    by_week: Dict[tuple, ScheduleWeek]
+    position: Dict[tuple, int]
+    # The same columns as arrays, for `resolve_many`
+    start_array: np.ndarray
+    end_array: np.ndarray
+    season_array: np.ndarray
+    week_array: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: list) -> "_YearIndex":
+        rows = tuple(
+            ScheduleWeek(
+                schedule_type=r.schedule_type,
+                year=r.schedule_year,
+                season=r.season,
+                week_id=r.week_id,
+                start_ts=r.start_ts,
+                end_ts=r.end_ts,
+            )
+            for r in sorted(rows, key=lambda r: (r.start_ts, r.season, r.week_id))
+        )
+        return cls(
+            rows=rows,
+            starts=tuple(r.start_ts for r in rows),
+            ends=tuple(r.end_ts for r in rows),
+            by_week={(r.season, r.week_id): r for r in rows},
+            position={(r.season, r.week_id): i for i, r in enumerate(rows)},
+            start_array=np.array([r.start_ts for r in rows], dtype=np.int64),
+            end_array=np.array([r.end_ts for r in rows], dtype=np.int64),
+            season_array=np.array([r.season for r in rows], dtype=np.int64),
+            week_array=np.array([r.week_id for r in rows], dtype=np.int64),
+        )
+
+    def positions(self, ts: np.ndarray) -> np.ndarray:
+        """Vectorized `for_timestamp`, returns the row position of each timestamp or -1."""
+        i = np.searchsorted(self.start_array, ts, side="right") - 1
+        found = (i >= 0) & (self.end_array[np.maximum(i, 0)] >= ts)
+        # Step back over overlapping windows, like `for_timestamp`
+        while True:
+            back = found & (i > 0) & (self.end_array[np.maximum(i - 1, 0)] >= ts)
+            if not back.any():
+                break
+            i = np.where(back, i - 1, i)
+        return np.where(found, i, -1)
+
+    def for_timestamp(self, ts: int) -> Optional[ScheduleWeek]:
+        # Post windows overlap by an hour when DST starts, the earlier week wins
+        i = bisect_right(self.starts, ts) - 1
+        row = None
+        while i >= 0 and self.ends[i] >= ts:
+            row = self.rows[i]
+            i -= 1
+        return row
+
+
+class ScheduleIndex:
+    """Process-wide, in-memory index of the schedules in a `ScheduleCache`.
+
+    Each (schedule_type, year) is read from SQLite once, on first use, and then
+    resolved with `bisect` over its sorted start timestamps. Loaded years are never
+    modified, so lookups don't take a lock.
+    """
+
+    _instances: Dict[str, "ScheduleIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.cache = ScheduleCache(db_path)
+        self._years: Dict[tuple, _YearIndex] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, db_path: Union[str, Path]) -> "ScheduleIndex":
+        index = cls._instances.get(str(db_path))
+        if index is None:
+            # Resolving the path is slow, only do it for paths not seen yet
+            key = str(Path(db_path).resolve())
+            with cls._instances_lock:
+                index = cls._instances.get(key)
+                if index is None:
+                    index = cls(db_path)
+                cls._instances = {**cls._instances, key: index, str(db_path): index}
+        return index
+
+    def year(
+        self, schedule_year: int, schedule_type: Literal["episodes", "post"]
+    ) -> _YearIndex:
+        key = (schedule_type, schedule_year)
+        year_index = self._years.get(key)
+        if year_index is None:
+            with self._lock:
+                year_index = self._years.get(key)
+                if year_index is None:
+                    self.cache.ensure_year(schedule_year, schedule_type)
+                    year_index = _YearIndex.from_rows(
+                        self.cache.get_year(schedule_year, schedule_type)
+                    )
+                    # Copy on write, so readers never see a dict being resized
+                    self._years = {**self._years, key: year_index}
+        return year_index
+
+    def get_for_timestamp(
+        self,
+        schedule_year: int,
+        schedule_type: Literal["episodes", "post"],
+        ts: int,
+    ) -> Optional[ScheduleWeek]:
+        return self.year(schedule_year, schedule_type).for_timestamp(ts)
+
+    def get_for_week(
+        self,
+        schedule_year: int,
+        schedule_type: Literal["episodes", "post"],
+        season: int,
+        week_id: int,
+    ) -> Optional[ScheduleWeek]:
+        return self.year(schedule_year, schedule_type).by_week.get((season, week_id))
+
+    def _step(self, week: ScheduleWeek, offset: int) -> ScheduleWeek:
+        year_index = self.year(week.year, week.schedule_type)
+        i = year_index.position[(week.season, week.week_id)] + offset
+        if i < 0:
+            return self.year(week.year - 1, week.schedule_type).rows[-1]
+        if i >= len(year_index.rows):
+            return self.year(week.year + 1, week.schedule_type).rows[0]
+        return year_index.rows[i]
+
+    def previous_week(self, week: ScheduleWeek) -> ScheduleWeek:
+        """
+        Returns the week before `week` in its schedule.
+
+        Week 1 goes back to week 13 of the previous season, and winter to the fall of
+        the previous year. Only the first step into a year loads it.
+        """
+        return self._step(week, -1)
+
+    def next_week(self, week: ScheduleWeek) -> ScheduleWeek:
+        """Returns the week after `week` in its schedule, see `previous_week`."""
+        return self._step(week, 1)
+
+    def matching_week(
+        self, week: ScheduleWeek, schedule_type: Literal["episodes", "post"]
+    ) -> Optional[ScheduleWeek]:
+        """
+        Returns the week of `schedule_type` with the same year, season and week_id.
+
+        The post window of a week ranks the episodes aired in its episode window.
+        """
+        if week.schedule_type == schedule_type:
+            return week
+        return self.get_for_week(week.year, schedule_type, week.season, week.week_id)
+
+    def iter_weeks(self, first: ScheduleWeek, last: ScheduleWeek) -> Iterator[ScheduleWeek]:
+        """Yields the weeks from `first` to `last` included, in the schedule of `first`."""
+        last = self.matching_week(last, first.schedule_type)
+        if last is None:
+            return
+        week = first
+        while (week.year, week.season, week.week_id) <= (
+            last.year,
+            last.season,
+            last.week_id,
+        ):
+            yield week
+            week = self.next_week(week)
+
+
+class ResolvedWeeks(NamedTuple):
+    """
+    Schedule year, season number and week of each timestamp, as parallel arrays.
+
+    Timestamps outside of any schedule window get a season and week_id of 0.
+    """
+
+    year: np.ndarray
+    season: np.ndarray
+    week_id: np.ndarray
+
+
+def _epoch_seconds(timestamps) -> np.ndarray:
+    """Converts datetimes, datetime64 or epoch seconds to int64 epoch seconds (UTC)."""
+    if isinstance(timestamps, np.ndarray) and np.issubdtype(
+        timestamps.dtype, np.datetime64
+    ):
+        return timestamps.astype("datetime64[s]").astype(np.int64)
+    values = [
+        int(_ensure_utc(t).timestamp()) if isinstance(t, datetime) else t
+        for t in timestamps
+    ]
+    # Truncated like `int(post_time.timestamp())` in the scalar path
+    return np.asarray(values, dtype=np.float64).astype(np.int64)
+
+
 class SeasonScheduler(BaseModel):
     """Pydantic model for managing anime season schedules."""
 
@@ -269,7 +555,7 @@ class SeasonScheduler(BaseModel):
         description="Reference time for calculations",
     )
     cache_db_path: str = Field(
-        default="database/schedules.sqlite",
+        default=DEFAULT_CACHE_DB_PATH,
         description="SQLite cache path for schedules",
     )
 
@@ -318,25 +604,8 @@ class SeasonScheduler(BaseModel):
             self.year = self._infer_schedule_year(utc_time)
             self.month = utc_time.month
 
-            cache = ScheduleCache(self.cache_db_path)
-            cache.ensure_year(self.year, self.schedule_type)
-
-            ts = int(utc_time.timestamp())
-            schedule_row = cache.get_for_timestamp(
-                self.year, self.schedule_type, ts
-            )
-            if schedule_row is None:
-                # Defensive fallback: try adjacent years.
-                for candidate in (self.year - 1, self.year + 1):
-                    cache.ensure_year(candidate, self.schedule_type)
-                    schedule_row = cache.get_for_timestamp(
-                        candidate, self.schedule_type, ts
-                    )
-                    if schedule_row is not None:
-                        self.year = candidate
-                        break
-
-            if schedule_row is None:
+            week = resolve_week(utc_time, self.schedule_type, self.cache_db_path)
+            if week is None:
                 logger.error(
                     f"No schedule match for type={self.schedule_type} time={utc_time.isoformat()}"
                 )
@@ -347,16 +616,8 @@ class SeasonScheduler(BaseModel):
                 self.airing_period = None
                 return self
 
-            self.schedule_detals = ScheduleDetails(
-                week_id=schedule_row.week_id,
-                start_date=datetime.fromtimestamp(
-                    schedule_row.start_ts, tz=timezone.utc
-                ),
-                end_date=datetime.fromtimestamp(
-                    schedule_row.end_ts, tz=timezone.utc
-                ),
-                season=schedule_row.season,
-            )
+            self.year = week.year
+            self.schedule_detals = week.details()
 
             self.season_number = self.schedule_detals.season
             self.season_name = self._get_season_name(self.season_number)
@@ -381,6 +642,63 @@ class SeasonScheduler(BaseModel):
             return y + 1
         return y
 
+    @classmethod
+    def _infer_schedule_years(cls, ts: np.ndarray) -> np.ndarray:
+        """Vectorized `_infer_schedule_year` over epoch seconds."""
+        calendar_years = (
+            ts.astype("datetime64[s]").astype("datetime64[Y]").astype(np.int64) + 1970
+        )
+        unique_years, inverse = np.unique(calendar_years, return_inverse=True)
+        winter_next_starts = np.array(
+            [int(_episodes_season_start(int(y) + 1, 1).timestamp()) for y in unique_years],
+            dtype=np.int64,
+        )
+        return calendar_years + (ts >= winter_next_starts[inverse])
+
+    def resolve_many(
+        self, timestamps: Union[Iterable[Union[datetime, int, float]], np.ndarray]
+    ) -> ResolvedWeeks:
+        """
+        Resolves many timestamps to their schedule week at once, with this scheduler's
+        schedule_type.
+
+        Gives the same year, season and week as constructing a `SeasonScheduler` per
+        timestamp, including the adjacent-year fallback.
+
+        Args:
+            timestamps: Datetimes (naive ones are UTC), a datetime64 array or epoch seconds
+
+        Returns:
+            ResolvedWeeks: The year, season number and week_id arrays, in input order.
+        """
+        ts = _epoch_seconds(timestamps)
+        inferred = self._infer_schedule_years(ts)
+        years = inferred.copy()
+        seasons = np.zeros(len(ts), dtype=np.int64)
+        week_ids = np.zeros(len(ts), dtype=np.int64)
+
+        index = ScheduleIndex.for_path(self.cache_db_path)
+        pending = np.ones(len(ts), dtype=bool)
+        for offset in (0, -1, 1):
+            for year in np.unique(inferred[pending]):
+                candidate = int(year) + offset
+                selected = np.flatnonzero(pending & (inferred == year))
+                year_index = index.year(candidate, self.schedule_type)
+                positions = year_index.positions(ts[selected])
+                hit = positions >= 0
+                matched, positions = selected[hit], positions[hit]
+
+                years[matched] = candidate
+                seasons[matched] = year_index.season_array[positions]
+                week_ids[matched] = year_index.week_array[positions]
+                pending[matched] = False
+
+        if pending.any():
+            logger.error(
+                f"No schedule match for {int(pending.sum())} of {len(ts)} timestamps, type={self.schedule_type}"
+            )
+        return ResolvedWeeks(year=years, season=seasons, week_id=week_ids)
+
     @classmethod
     def _get_season_name(cls, season_id: Optional[int]) -> str:
         """Get season name from month number."""
@@ -404,20 +722,15 @@ class SeasonScheduler(BaseModel):
         self, year: int, season: int, week_id: int
     ) -> Optional[ScheduleDetails]:
         """Get schedule details for a specific date."""
-        cache = ScheduleCache(self.cache_db_path)
-        cache.ensure_year(year, self.schedule_type)
         logger.debug(
             f"Trying to find the schedule for year={year} season={season} week={week_id} type={self.schedule_type}"
         )
-        row = cache.get_for_week(year, self.schedule_type, season, week_id)
-        if row is None:
-            return None
-        return ScheduleDetails(
-            week_id=row.week_id,
-            start_date=datetime.fromtimestamp(row.start_ts, tz=timezone.utc),
-            end_date=datetime.fromtimestamp(row.end_ts, tz=timezone.utc),
-            season=row.season,
+        week = ScheduleIndex.for_path(self.cache_db_path).get_for_week(
+            year, self.schedule_type, season, week_id
         )
+        if week is None:
+            return None
+        return week.details()
 
     def check_and_create_schedule(self) -> bool:
         """Legacy hook kept for compatibility.
@@ -437,6 +750,15 @@ class SeasonScheduler(BaseModel):
         cache.ensure_year(self.year, self.schedule_type)
         return not bool(already)
 
+    @property
+    def week(self) -> Optional[ScheduleWeek]:
+        """The `ScheduleWeek` of post_time, to navigate the schedule from."""
+        if self.week_id is None:
+            return None
+        return ScheduleIndex.for_path(self.cache_db_path).get_for_week(
+            self.year, self.schedule_type, self.season_number, self.week_id
+        )
+
     def get_week_id(self) -> Optional[int]:
         """Get the week ID for the current post_time."""
         return self.week_id
@@ -472,3 +794,39 @@ class SeasonScheduler(BaseModel):
             "season": self.season_name,
             "week_id": schedule_details.week_id,
         }
+
+
+def resolve_week(
+    post_time: datetime,
+    schedule_type: Literal["episodes", "post"] = "episodes",
+    cache_db_path: str = DEFAULT_CACHE_DB_PATH,
+) -> Optional[ScheduleWeek]:
+    """
+    Resolves a time to its schedule week, without building a `SeasonScheduler`.
+
+    Naive times are taken as UTC. Returns None (and logs nothing) when no window of the
+    inferred schedule year, or of the adjacent ones, contains the time.
+    """
+    utc_time = _ensure_utc(post_time)
+    year = SeasonScheduler._infer_schedule_year(utc_time)
+    ts = int(utc_time.timestamp())
+
+    index = ScheduleIndex.for_path(cache_db_path)
+    for candidate in (year, year - 1, year + 1):
+        week = index.get_for_timestamp(candidate, schedule_type, ts)
+        if week is not None:
+            return week
+    return None
+
+
+def schedule_week(
+    year: int,
+    season: int,
+    week_id: int,
+    schedule_type: Literal["episodes", "post"] = "episodes",
+    cache_db_path: str = DEFAULT_CACHE_DB_PATH,
+) -> Optional[ScheduleWeek]:
+    """Returns the week `week_id` of a season (1-4) of a schedule year, or None."""
+    return ScheduleIndex.for_path(cache_db_path).get_for_week(
+        year, schedule_type, season, week_id
+    )